@@ -26,6 +26,9 @@ class AdminPharmacySerializer(serializers.ModelSerializer):
             "country",
             "city",
 
+            # Réseau (transferts de stock)
+            "parent",
+
             # SaaS / Activation
             "is_active",
             "suspended_reason",
@@ -62,6 +65,18 @@ class AdminPharmacySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Pharmacy code already exists.")
         return value
 
+    def validate_parent(self, value):
+        if value is None:
+            return value
+
+        if self.instance and value.pk == self.instance.pk:
+            raise serializers.ValidationError("A pharmacy cannot be its own parent.")
+        if value.parent_id:
+            raise serializers.ValidationError("Parent must be a head pharmacy (one level only).")
+        if self.instance and self.instance.branches.exists():
+            raise serializers.ValidationError("This pharmacy already has branches.")
+        return value
+
     def validate_country(self, value):
         # optionnel : normalisation simple
         if value is None:
@@ -81,4 +96,70 @@ class AdminPharmacySerializer(serializers.ModelSerializer):
             validated_data["code"] = validated_data["code"].upper().strip()
         if "country" in validated_data:
             validated_data["country"] = (validated_data["country"] or "").strip() or None
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+class AdminSubscriptionSerializer(serializers.ModelSerializer):
+    """
+    Ligne abonnement (SaaS Admin) — monthly_amount annoté en SQL
+    """
+
+    status = serializers.CharField(source="subscription_status")
+    monthly_amount = serializers.DecimalField(
+        source="monthly_price",
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False
+    )
+
+    class Meta:
+        model = Pharmacy
+        fields = [
+            "id",
+            "name",
+            "plan",
+            "status",
+            "is_active",
+            "current_period_end",
+            "monthly_amount",
+            "stripe_customer_id",
+        ]
+
+
+class AdminPharmacyListSerializer(AdminPharmacySerializer):
+    """
+    Liste SaaS Admin : user_count / revenue_30d annotés en SQL
+    """
+
+    user_count = serializers.IntegerField(read_only=True)
+    revenue_30d = serializers.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        read_only=True
+    )
+
+    class Meta(AdminPharmacySerializer.Meta):
+        fields = AdminPharmacySerializer.Meta.fields + [
+            "user_count",
+            "revenue_30d",
+        ]
+
+
+class AdminScheduledJobSerializer(serializers.Serializer):
+    """
+    Tâche planifiée + dernière exécution (annotées en SQL)
+    """
+
+    name = serializers.CharField()
+    command = serializers.CharField()
+    schedule = serializers.CharField()
+    per_tenant = serializers.BooleanField()
+    is_enabled = serializers.BooleanField()
+    next_run_at = serializers.DateTimeField(allow_null=True)
+    locked_by = serializers.CharField()
+    last_status = serializers.CharField(allow_null=True)
+    last_started_at = serializers.DateTimeField(allow_null=True)
+    last_duration_ms = serializers.IntegerField(allow_null=True)
+    last_tenants_total = serializers.IntegerField(allow_null=True)
+    last_tenants_failed = serializers.IntegerField(allow_null=True)
+    failures_7d = serializers.IntegerField()
@@ -6,6 +6,8 @@ from .views import (
     AdminPharmacyActivateView,
     AdminPharmacySuspendView,
     AdminSubscriptionsListView,
+    AdminRequestMetricsView,
+    AdminScheduledJobsView,
 )
 
 urlpatterns = [
@@ -17,4 +19,8 @@ urlpatterns = [
     path("pharmacies/<uuid:pk>/activate/", AdminPharmacyActivateView.as_view(), name="admin-pharmacy-activate"),
     path("pharmacies/<uuid:pk>/suspend/", AdminPharmacySuspendView.as_view(), name="admin-pharmacy-suspend"),
     path("subscriptions/", AdminSubscriptionsListView.as_view(), name="admin-subscriptions"),
+
+    # Monitoring
+    path("metrics/", AdminRequestMetricsView.as_view(), name="admin-request-metrics"),
+    path("jobs/", AdminScheduledJobsView.as_view(), name="admin-jobs"),
 ]
\ No newline at end of file
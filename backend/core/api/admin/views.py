@@ -1,8 +1,15 @@
 # backend/core/api/admin/views.py
 
+from collections import Counter
 from datetime import timedelta
+from decimal import Decimal
 
-from django.db.models import Sum, Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Sum, Count, Q, OuterRef, Subquery, Value, DecimalField
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
@@ -22,12 +29,20 @@ from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
 )
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from core.models import Pharmacy, Sale, CustomUser
+from core.models import Pharmacy, Sale, CustomUser, PlatformDailySales, SaaSPlan, JobRun, ScheduledJob
 from core.permissions import IsSaaSAdmin
-from .serializers import AdminPharmacySerializer
+from core.instrumentation import registry as metrics_registry
+from core.api.mixins import StatementTimeoutMixin, ReplicaReadMixin
+from .serializers import (
+    AdminPharmacySerializer,
+    AdminPharmacyListSerializer,
+    AdminSubscriptionSerializer,
+    AdminScheduledJobSerializer,
+)
 
 
 # =========================================================
@@ -40,7 +55,10 @@ class AdminPharmacySuspendSerializer(serializers.Serializer):
 # =========================================================
 # 📊 ADMIN OVERVIEW (GLOBAL DASHBOARD ENTERPRISE)
 # =========================================================
-class AdminOverviewView(GenericAPIView):
+OVERVIEW_CACHE_KEY = "saas_admin:overview"
+
+
+class AdminOverviewView(StatementTimeoutMixin, ReplicaReadMixin, GenericAPIView):
 
     permission_classes = [permissions.IsAuthenticated, IsSaaSAdmin]
     serializer_class = AdminPharmacySerializer  # schema clean
@@ -48,67 +66,87 @@ class AdminOverviewView(GenericAPIView):
     @extend_schema(summary="SaaS Admin Global Overview Dashboard")
     def get(self, request):
 
+        payload = cache.get(OVERVIEW_CACHE_KEY)
+
+        if payload is None:
+            payload = self.build_overview()
+            cache.set(
+                OVERVIEW_CACHE_KEY,
+                payload,
+                settings.ADMIN_OVERVIEW_CACHE_TTL
+            )
+
+        return Response(payload)
+
+    def build_overview(self):
+
         now = timezone.now()
+        today = timezone.localdate(now)
         thirty_days_ago = now - timedelta(days=30)
 
         # ---------------------------
-        # PHARMACIES
+        # PHARMACIES (1 requête : GROUP BY sur toutes les dimensions)
         # ---------------------------
-        total_pharmacies = Pharmacy.objects.count()
-        new_pharmacies = Pharmacy.objects.filter(
-            created_at__gte=thirty_days_ago
-        ).count()
-
-        pharmacies_by_type = (
-            Pharmacy.objects.values("type")
-            .annotate(count=Count("id"))
+        segments = (
+            Pharmacy.objects
+            .values("type", "country", "plan", "subscription_status", "is_active")
+            .annotate(
+                count=Count("id"),
+                new=Count("id", filter=Q(created_at__gte=thirty_days_ago)),
+            )
+            .order_by()
         )
 
-        pharmacies_by_country = (
-            Pharmacy.objects.values("country")
-            .annotate(count=Count("id"))
-        )
+        total_pharmacies = 0
+        new_pharmacies = 0
+        breakdowns = {
+            "type": Counter(),
+            "country": Counter(),
+            "plan": Counter(),
+            "subscription_status": Counter(),
+        }
+        active_subscriptions = 0
 
-        pharmacies_by_plan = (
-            Pharmacy.objects.values("plan")
-            .annotate(count=Count("id"))
-        )
+        for seg in segments:
+            total_pharmacies += seg["count"]
+            new_pharmacies += seg["new"]
 
-        pharmacies_by_subscription_status = (
-            Pharmacy.objects.values("subscription_status")
-            .annotate(count=Count("id"))
-        )
+            for field, counter in breakdowns.items():
+                counter[seg[field]] += seg["count"]
 
-        # ---------------------------
-        # REVENUE
-        # ---------------------------
-        start_of_month = now.replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
+            if seg["subscription_status"] == "active" and seg["is_active"]:
+                active_subscriptions += seg["count"]
 
-        monthly_revenue = (
-            Sale.objects.filter(created_at__gte=start_of_month)
-            .aggregate(total=Sum("total_price"))
-            .get("total") or 0
-        )
+        def as_rows(field):
+            return [
+                {field: value, "count": count}
+                for value, count in breakdowns[field].items()
+            ]
 
-        revenue_30_days = (
-            Sale.objects.filter(created_at__gte=thirty_days_ago)
-            .aggregate(total=Sum("total_price"))
-            .get("total") or 0
-        )
+        by_status = breakdowns["subscription_status"]
 
-        sixty_days_ago = now - timedelta(days=60)
-
-        previous_30_days_revenue = (
-            Sale.objects.filter(
-                created_at__gte=sixty_days_ago,
-                created_at__lt=thirty_days_ago,
-            )
-            .aggregate(total=Sum("total_price"))
-            .get("total") or 0
+        # ---------------------------
+        # REVENUE (rollup plateforme journalier)
+        # ---------------------------
+        start_of_month = today.replace(day=1)
+        last_30_start = today - timedelta(days=29)
+        prev_30_start = today - timedelta(days=59)
+
+        revenue = PlatformDailySales.objects.filter(
+            date__gte=min(start_of_month, prev_30_start)
+        ).aggregate(
+            current_month=Sum("revenue", filter=Q(date__gte=start_of_month)),
+            last_30_days=Sum("revenue", filter=Q(date__gte=last_30_start)),
+            previous_30_days=Sum(
+                "revenue",
+                filter=Q(date__gte=prev_30_start, date__lt=last_30_start)
+            ),
         )
 
+        monthly_revenue = revenue["current_month"] or 0
+        revenue_30_days = revenue["last_30_days"] or 0
+        previous_30_days_revenue = revenue["previous_30_days"] or 0
+
         if previous_30_days_revenue > 0:
             revenue_growth_pct = (
                 (revenue_30_days - previous_30_days_revenue)
@@ -120,39 +158,21 @@ class AdminOverviewView(GenericAPIView):
         # ---------------------------
         # USERS
         # ---------------------------
-        total_users = CustomUser.objects.count()
-        total_admins = CustomUser.objects.filter(role="admin").count()
-        total_gerants = CustomUser.objects.filter(role="gerant").count()
-
-        # ---------------------------
-        # SUBSCRIPTIONS SNAPSHOT
-        # ---------------------------
-        active_subscriptions = Pharmacy.objects.filter(
-            subscription_status="active",
-            is_active=True
-        ).count()
-
-        trialing_subscriptions = Pharmacy.objects.filter(
-            subscription_status="trialing"
-        ).count()
-
-        past_due_subscriptions = Pharmacy.objects.filter(
-            subscription_status="past_due"
-        ).count()
-
-        canceled_subscriptions = Pharmacy.objects.filter(
-            subscription_status="canceled"
-        ).count()
+        users = CustomUser.objects.aggregate(
+            total=Count("id"),
+            admins=Count("id", filter=Q(role="admin")),
+            gerants=Count("id", filter=Q(role="gerant")),
+        )
 
-        return Response({
+        return {
 
             "pharmacies": {
                 "total": total_pharmacies,
                 "new_last_30_days": new_pharmacies,
-                "by_type": list(pharmacies_by_type),
-                "by_country": list(pharmacies_by_country),
-                "by_plan": list(pharmacies_by_plan),
-                "by_subscription_status": list(pharmacies_by_subscription_status),
+                "by_type": as_rows("type"),
+                "by_country": as_rows("country"),
+                "by_plan": as_rows("plan"),
+                "by_subscription_status": as_rows("subscription_status"),
             },
 
             "revenue": {
@@ -162,29 +182,127 @@ class AdminOverviewView(GenericAPIView):
                 "growth_percent": round(revenue_growth_pct, 2),
             },
 
-            "users": {
-                "total": total_users,
-                "admins": total_admins,
-                "gerants": total_gerants,
-            },
+            "users": users,
 
             "subscriptions": {
                 "active": active_subscriptions,
-                "trialing": trialing_subscriptions,
-                "past_due": past_due_subscriptions,
-                "canceled": canceled_subscriptions,
+                "trialing": by_status["trialing"],
+                "past_due": by_status["past_due"],
+                "canceled": by_status["canceled"],
             }
-        })
+        }
 
 
 # =========================================================
 # 🏢 ADMIN PHARMACY LIST + CREATE
 # =========================================================
-class AdminPharmacyListCreateView(ListCreateAPIView):
+PHARMACY_FILTER_PARAMETERS = [
+    OpenApiParameter(name="status", type=str, required=False),
+    OpenApiParameter(name="plan", type=str, required=False),
+    OpenApiParameter(name="type", type=str, required=False),
+    OpenApiParameter(name="is_active", type=bool, required=False),
+    OpenApiParameter(name="country", type=str, required=False),
+    OpenApiParameter(
+        name="search",
+        type=str,
+        required=False,
+        description="name / code / city (index trigram PostgreSQL)",
+    ),
+]
+
+
+def filter_pharmacies(queryset, params):
+    """
+    Filtres SaaS Admin communs (pharmacies + abonnements)
+    """
+    status_ = params.get("status")
+    if status_:
+        queryset = queryset.filter(subscription_status=status_)
+
+    plan = params.get("plan")
+    if plan:
+        queryset = queryset.filter(plan=plan)
+
+    type_ = params.get("type")
+    if type_:
+        queryset = queryset.filter(type=type_)
+
+    is_active = params.get("is_active")
+    if is_active in ("true", "false"):
+        queryset = queryset.filter(is_active=is_active == "true")
+
+    country = params.get("country")
+    if country:
+        queryset = queryset.filter(country=country)
+
+    search = (params.get("search") or "").strip()
+    if search:
+        queryset = queryset.filter(
+            Q(name__icontains=search)
+            | Q(code__icontains=search)
+            | Q(city__icontains=search)
+        )
+
+    return queryset
+
+
+class AdminPharmacyCursorPagination(CursorPagination):
+    """
+    Pagination keyset sur created_at : coût constant quelle que soit la page
+    """
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class AdminPharmacyListCreateView(ReplicaReadMixin, ListCreateAPIView):
 
     permission_classes = [permissions.IsAuthenticated, IsSaaSAdmin]
-    queryset = Pharmacy.objects.all().order_by("-created_at")
-    serializer_class = AdminPharmacySerializer
+    queryset = Pharmacy.objects.all()
+    pagination_class = AdminPharmacyCursorPagination
+
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return AdminPharmacyListSerializer
+        return AdminPharmacySerializer
+
+    def get_queryset(self):
+        since = timezone.now() - timedelta(days=30)
+
+        user_count = (
+            CustomUser.objects
+            .filter(pharmacy=OuterRef("pk"))
+            .order_by()
+            .values("pharmacy")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+
+        revenue_30d = (
+            Sale.objects
+            .filter(pharmacy=OuterRef("pk"), created_at__gte=since)
+            .order_by()
+            .values("pharmacy")
+            .annotate(total=Sum("total_price"))
+            .values("total")
+        )
+
+        queryset = filter_pharmacies(super().get_queryset(), self.request.query_params)
+
+        # Sous-requêtes corrélées : évaluées uniquement pour les lignes de la page
+        return queryset.annotate(
+            user_count=Coalesce(Subquery(user_count), 0),
+            revenue_30d=Coalesce(
+                Subquery(revenue_30d),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+
+    @extend_schema(parameters=PHARMACY_FILTER_PARAMETERS)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
 
 # =========================================================
@@ -262,47 +380,147 @@ class AdminPharmacySuspendView(GenericAPIView):
 # =====================================================
 # SAAS ADMIN - SUBSCRIPTIONS LIST
 # =====================================================
-class AdminSubscriptionsListView(APIView):
+PAID_STATUSES = ("active", "trialing")
+
+
+def annotate_monthly_price(queryset):
+    """
+    Prix mensuel (SaaSPlan) calculé en SQL :
+    prix Stripe facturé en priorité, sinon tarif du plan.
+    """
+    plans = SaaSPlan.objects.filter(active=True)
+
+    by_price_id = plans.filter(
+        stripe_price_id=OuterRef("stripe_price_id")
+    ).values("price")[:1]
+
+    by_code = plans.filter(
+        code=OuterRef("plan")
+    ).order_by("id").values("price")[:1]
+
+    return queryset.annotate(
+        monthly_price=Coalesce(
+            Subquery(by_price_id),
+            Subquery(by_code),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+    )
+
+
+class AdminSubscriptionPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AdminSubscriptionsListView(StatementTimeoutMixin, ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated, IsSaaSAdmin]
+    pagination_class = AdminSubscriptionPagination
 
+    @extend_schema(
+        summary="SaaS Admin subscriptions (MRR + stats)",
+        parameters=[
+            *PHARMACY_FILTER_PARAMETERS,
+        ],
+        responses=AdminSubscriptionSerializer(many=True),
+    )
     def get(self, request):
-        pharmacies = Pharmacy.objects.all().order_by("-created_at")
-
-        data = []
-        total_revenue = 0
-
-        for p in pharmacies:
-            monthly_price = 0
-
-            if p.plan == "basic":
-                monthly_price = 15000
-            elif p.plan == "pro":
-                monthly_price = 25000
-            elif p.plan == "enterprise":
-                monthly_price = 50000
-
-            if p.subscription_status in ["active", "trialing"]:
-                total_revenue += monthly_price
-
-            data.append({
-                "id": str(p.id),
-                "name": p.name,
-                "plan": p.plan,
-                "status": p.subscription_status,
-                "is_active": p.is_active,
-                "current_period_end": p.current_period_end,
-                "monthly_amount": monthly_price,
-                "stripe_customer_id": p.stripe_customer_id,
-            })
+        pharmacies = filter_pharmacies(Pharmacy.objects.all(), request.query_params)
+
+        # ---------------------------
+        # STATS (1 requête)
+        # ---------------------------
+        stats = annotate_monthly_price(pharmacies).aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(subscription_status="active")),
+            trialing=Count("id", filter=Q(subscription_status="trialing")),
+            past_due=Count("id", filter=Q(subscription_status="past_due")),
+            canceled=Count("id", filter=Q(subscription_status="canceled")),
+            mrr=Sum(
+                "monthly_price",
+                filter=Q(subscription_status__in=PAID_STATUSES)
+            ),
+        )
+        stats["mrr"] = float(stats["mrr"] or 0)
+
+        # ---------------------------
+        # PAGE
+        # ---------------------------
+        rows = annotate_monthly_price(
+            pharmacies.only(
+                "id",
+                "name",
+                "plan",
+                "subscription_status",
+                "is_active",
+                "current_period_end",
+                "stripe_customer_id",
+            )
+        ).order_by("-created_at", "-id")
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(rows, request, view=self)
 
         return Response({
-            "stats": {
-                "total": pharmacies.count(),
-                "active": pharmacies.filter(subscription_status="active").count(),
-                "trialing": pharmacies.filter(subscription_status="trialing").count(),
-                "past_due": pharmacies.filter(subscription_status="past_due").count(),
-                "canceled": pharmacies.filter(subscription_status="canceled").count(),
-                "mrr": total_revenue,
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "stats": stats,
+            "subscriptions": AdminSubscriptionSerializer(page, many=True).data,
+        })
+
+
+# =====================================================
+# SAAS ADMIN - REQUEST METRICS (core.instrumentation)
+# =====================================================
+class AdminRequestMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsSaaSAdmin]
+
+    @extend_schema(
+        summary="Per-route query count / latency (all workers)",
+        description=(
+            "Aggregated across workers through the shared cache (REDIS_URL); "
+            "scope=process when the cache is local to each worker"
+        ),
+        parameters=[
+            OpenApiParameter(name="pharmacy", type=str, required=False),
+        ],
+    )
+    def get(self, request):
+        return Response(
+            metrics_registry.summary(request.query_params.get("pharmacy"))
+        )
+
+    @extend_schema(summary="Reset request metrics (all workers)")
+    def delete(self, request):
+        metrics_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# =====================================================
+# SAAS ADMIN - TÂCHES PLANIFIÉES (run_scheduler)
+# =====================================================
+class AdminScheduledJobsView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated, IsSaaSAdmin]
+
+    @extend_schema(
+        summary="Scheduled jobs with their last run and 7-day failures",
+        responses=AdminScheduledJobSerializer(many=True),
+    )
+    def get(self, request):
+        last_run = JobRun.objects.filter(job=OuterRef("pk")).order_by("-started_at")
+        since = timezone.now() - timedelta(days=7)
+
+        jobs = ScheduledJob.objects.annotate(
+            **{
+                f"last_{field}": Subquery(last_run.values(field)[:1])
+                for field in ("status", "started_at", "duration_ms", "tenants_total", "tenants_failed")
             },
-            "subscriptions": data
-        })
\ No newline at end of file
+            failures_7d=Count(
+                "runs",
+                filter=Q(runs__status__in=["failed", "partial"], runs__started_at__gte=since),
+            ),
+        ).order_by("name")
+
+        return Response(AdminScheduledJobSerializer(jobs, many=True).data)
@@ -0,0 +1,158 @@
+# backend/core/api/async_views.py
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.api.conditional import apply_validators, data_validators, not_modified_response
+from core.db.replica import activate_replica_reads, deactivate_replica_reads
+from core.db.timeouts import is_statement_timeout
+from core.models import activate_tenant, deactivate_tenant
+
+from .mixins import StatementTimeout, require_pharmacy
+
+
+# =====================================================
+# ASYNC REPORTING VIEW (lecture seule)
+# =====================================================
+
+class AsyncReportView(View):
+    """
+    Pendant async des APIView de reporting, servie sous ASGI sans bloquer
+    de thread pendant les agrégats (core.api.concurrency.gather_queries).
+
+    Même contrat que TenantScopedMixin + StatementTimeoutMixin +
+    ReplicaReadMixin + ConditionalGetMixin : authentification / permissions
+    DRF (dans un thread), tenant et réplica actifs pendant `get`, 304 si
+    les données n'ont pas changé, timeout SQL -> 503, erreurs au format DRF.
+    `get` est async et renvoie self.render(data).
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    # Rendu JSON configuré (REST_FRAMEWORK, orjson par défaut)
+    renderer_class = api_settings.DEFAULT_RENDERER_CLASSES[0]
+
+    # ms ; None -> settings.REPORTING_STATEMENT_TIMEOUT_MS, 0 -> pas de plafond
+    statement_timeout = None
+
+    http_method_names = ["get", "head", "options"]
+
+    # ETag / Last-Modified (core.api.conditional)
+    conditional_get = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request = await sync_to_async(self.initial)(request)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+        tenant_token = activate_tenant(getattr(request.user, "pharmacy", None))
+        replica_token = activate_replica_reads(request)
+
+        try:
+            validators = (
+                await sync_to_async(data_validators)(request)
+                if self.conditional_get else None
+            )
+
+            if validators is not None:
+                not_modified = not_modified_response(request, validators)
+
+                if not_modified is not None:
+                    return not_modified
+
+            response = await super().dispatch(request, *args, **kwargs)
+
+            if validators is not None:
+                apply_validators(response, validators)
+
+            return response
+        except Exception as exc:
+            return self.handle_exception(exc)
+        finally:
+            deactivate_replica_reads(replica_token)
+            deactivate_tenant(tenant_token)
+
+    # -------------------------
+    # AUTH / PERMISSIONS (sync : requêtes ORM)
+    # -------------------------
+
+    def initial(self, request):
+        request = Request(
+            request,
+            authenticators=[auth() for auth in self.authentication_classes],
+        )
+
+        for permission in [perm() for perm in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                self.permission_denied(request, permission)
+
+        # Charge la pharmacie ici : le tenant est activé côté async
+        require_pharmacy(request)
+
+        return request
+
+    def permission_denied(self, request, permission):
+        if request.authenticators and not request.successful_authenticator:
+            raise exceptions.NotAuthenticated()
+
+        raise exceptions.PermissionDenied(
+            detail=getattr(permission, "message", None),
+            code=getattr(permission, "code", None),
+        )
+
+    @property
+    def statement_timeout_ms(self):
+        return (
+            self.statement_timeout if self.statement_timeout is not None
+            else settings.REPORTING_STATEMENT_TIMEOUT_MS
+        )
+
+    # -------------------------
+    # RÉPONSES
+    # -------------------------
+
+    def render(self, data, status_code=status.HTTP_200_OK, headers=None):
+        renderer = self.renderer_class()
+        content_type = renderer.media_type
+
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        response = HttpResponse(
+            renderer.render(data),
+            status=status_code,
+            content_type=content_type,
+        )
+
+        for name, value in (headers or {}).items():
+            response[name] = value
+
+        return response
+
+    def handle_exception(self, exc):
+        if is_statement_timeout(exc):
+            exc = StatementTimeout()
+
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+
+        headers = {}
+
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticator = self.authentication_classes[0]() if self.authentication_classes else None
+            header = authenticator and authenticator.authenticate_header(self.request)
+
+            if header:
+                headers["WWW-Authenticate"] = header
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+
+        return self.render(data, exc.status_code, headers)
@@ -6,7 +6,7 @@ from .views import (
 )
 
 urlpatterns = [
-    path("checkout/", CreateCheckoutSessionView.as_view()),
-    path("portal/", CreateBillingPortalView.as_view()),
-    path("me/", MeSubscriptionView.as_view()),
+    path("checkout/", CreateCheckoutSessionView.as_view(), name="billing-checkout"),
+    path("portal/", CreateBillingPortalView.as_view(), name="billing-portal"),
+    path("me/", MeSubscriptionView.as_view(), name="billing-me"),
 ]
\ No newline at end of file
@@ -0,0 +1,90 @@
+# backend/core/api/concurrency.py
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+
+from core.db.replica import get_read_alias
+from core.db.timeouts import reset_statement_timeout, set_statement_timeout
+
+
+# =====================================================
+# REQUÊTES INDÉPENDANTES ({nom: callable})
+# =====================================================
+# Les services de reporting décrivent leurs agrégats comme des callables
+# sans dépendance entre eux : la vue sync les enchaîne, la vue async les
+# lance en parallèle, chacun sur sa propre connexion.
+
+def run_queries(queries):
+    return {name: query() for name, query in queries.items()}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def db_executor():
+    """
+    Pool borné (settings.ASYNC_DB_THREADS) partagé par le process : au plus
+    N connexions ouvertes par les vues async, quel que soit le nombre de
+    clients servis par la boucle d'événements.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_DB_THREADS,
+                thread_name_prefix="async-db",
+            )
+
+    return _executor
+
+
+def _run_on_connection(queries, timeout, pooled):
+    """
+    Exécute `queries` sur la connexion du thread courant, sous le
+    statement_timeout de reporting. Les threads du pool vivent longtemps :
+    leurs connexions suivent CONN_MAX_AGE comme celles d'une requête.
+    """
+    if pooled:
+        close_old_connections()
+
+    # Tenant et alias de lecture suivent via les contextvars (sync_to_async)
+    alias = get_read_alias() or DEFAULT_DB_ALIAS
+    timeout_set = set_statement_timeout(timeout, using=alias)
+
+    try:
+        return run_queries(queries)
+    finally:
+        if timeout_set:
+            reset_statement_timeout(using=alias)
+
+        if pooled:
+            close_old_connections()
+
+
+async def gather_queries(queries, timeout=None):
+    """
+    Version async de run_queries : une tâche par requête sur db_executor().
+    ASYNC_DB_THREADS = 0 -> exécution en série dans le thread de la requête
+    (tests : la transaction de TestCase n'est visible que de ce thread).
+    """
+    if not settings.ASYNC_DB_THREADS:
+        return await sync_to_async(_run_on_connection)(queries, timeout, False)
+
+    executor = db_executor()
+    names = list(queries)
+
+    results = await asyncio.gather(*(
+        sync_to_async(_run_on_connection, thread_sensitive=False, executor=executor)(
+            {name: queries[name]}, timeout, True
+        )
+        for name in names
+    ))
+
+    return {name: result[name] for name, result in zip(names, results)}
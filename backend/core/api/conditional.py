@@ -0,0 +1,88 @@
+# backend/core/api/conditional.py
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from core.models import PharmacyDataVersion
+
+
+# =====================================================
+# GET CONDITIONNEL (ETag / Last-Modified)
+# =====================================================
+# Validateurs dérivés de la version des données de la pharmacie
+# (PharmacyDataVersion, incrémentée à chaque vente / entrée de stock /
+# modification produit) : si rien n'a changé, 304 sans lancer les agrégats.
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: int   # timestamp (secondes)
+
+
+def data_validators(request):
+    """
+    Validateurs de la réponse à `request` (méthodes sûres, utilisateur de
+    pharmacie) ou None. Lus sur la base qui sert les lectures : sur un
+    réplica en retard, version et données restent cohérentes.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    pharmacy_id = getattr(request.user, "pharmacy_id", None)
+
+    if pharmacy_id is None:
+        return None
+
+    version, updated_at = PharmacyDataVersion.current(pharmacy_id)
+
+    # Périodes glissantes (30 j, péremptions...) : la réponse change aussi
+    # à minuit sans aucune écriture
+    today = timezone.localdate()
+    midnight = timezone.make_aware(datetime.combine(today, time.min))
+    last_modified = max(updated_at, midnight) if updated_at else midnight
+
+    key = "|".join([
+        str(pharmacy_id),
+        str(version),
+        today.isoformat(),
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+    ])
+
+    return Validators(
+        etag=quote_etag(hashlib.sha1(key.encode()).hexdigest()),
+        last_modified=int(last_modified.timestamp()),
+    )
+
+
+def not_modified_response(request, validators):
+    """HttpResponse 304 si le client a déjà cette version, sinon None."""
+    response = get_conditional_response(
+        request,
+        etag=validators.etag,
+        last_modified=validators.last_modified,
+    )
+
+    if response is not None:
+        apply_validators(response, validators)
+
+    return response
+
+
+def apply_validators(response, validators):
+    if response.status_code not in (200, 304):
+        return response
+
+    response["ETag"] = validators.etag
+    response["Last-Modified"] = http_date(validators.last_modified)
+
+    # Revalidation systématique ; réponses propres à l'utilisateur (JWT)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+
+    return response
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+
+# =====================================================
+# DASHBOARD COMPOSITE RESPONSE
+# =====================================================
+
+class CompositeDashboardResponseSerializer(serializers.Serializer):
+    widgets = serializers.DictField(
+        help_text="Données par widget demandé (mêmes formats que les endpoints unitaires)."
+    )
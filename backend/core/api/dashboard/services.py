@@ -0,0 +1,122 @@
+# backend/core/api/dashboard/services.py
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from core.api.finance.services import (
+    DashboardPeriod,
+    build_dashboard,
+    dashboard_period,
+    dashboard_queries,
+    top_products_data,
+)
+from core.api.intelligence.services import (
+    OverviewPeriod,
+    build_overview,
+    overview_period,
+    overview_queries,
+)
+from core.api.products.services import expiry_alert_data, low_stock_data
+
+
+# =====================================================
+# DASHBOARD COMPOSITE
+# =====================================================
+# Chaque widget déclare ses requêtes ({clé: callable}) et son assemblage.
+# Les requêtes des widgets demandés sont fusionnées par clé : un agrégat
+# commun (ex. ventes 30 j courantes / précédentes, finance + intelligence)
+# n'est exécuté qu'une fois pour toute la réponse.
+
+@dataclass(frozen=True)
+class Widget:
+    queries: Callable   # (DashboardContext) -> {clé: callable}
+    build: Callable     # (DashboardContext, résultats) -> données du widget
+
+
+@dataclass
+class DashboardContext:
+    today: date
+    finance: DashboardPeriod
+    intelligence: OverviewPeriod
+
+
+def dashboard_context(today=None):
+    today = today or now().date()
+
+    return DashboardContext(
+        today=today,
+        finance=dashboard_period(today),
+        intelligence=overview_period(today),
+    )
+
+
+WIDGETS = {
+    # /finance/dashboard/
+    "finance": Widget(
+        queries=lambda ctx: dashboard_queries(ctx.finance),
+        build=lambda ctx, results: build_dashboard(ctx.finance, results),
+    ),
+    # /finance/top-products/
+    "top_products": Widget(
+        queries=lambda ctx: {"top_products": top_products_data},
+        build=lambda ctx, results: results["top_products"],
+    ),
+    # /products/low-stock/
+    "low_stock": Widget(
+        queries=lambda ctx: {"low_stock": low_stock_data},
+        build=lambda ctx, results: results["low_stock"],
+    ),
+    # /products/expiry-alerts/
+    "expiry_alerts": Widget(
+        queries=lambda ctx: {"expiry_alerts": lambda: expiry_alert_data(ctx.today)},
+        build=lambda ctx, results: results["expiry_alerts"],
+    ),
+    # /intelligence/overview/
+    "intelligence": Widget(
+        queries=lambda ctx: overview_queries(ctx.intelligence),
+        build=lambda ctx, results: build_overview(ctx.intelligence, results),
+    ),
+}
+
+
+def parse_widgets(raw):
+    """
+    "finance,low_stock" -> ["finance", "low_stock"] (ordre conservé,
+    doublons ignorés) ; vide -> tous les widgets.
+    """
+    if not raw:
+        return list(WIDGETS)
+
+    names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name not in WIDGETS]
+
+    if unknown:
+        raise ValidationError({
+            "widgets": [
+                f"Widget inconnu : {name}. Disponibles : {', '.join(WIDGETS)}."
+                for name in unknown
+            ]
+        })
+
+    return names
+
+
+def widget_queries(names, context):
+    queries = {}
+
+    for name in names:
+        for key, query in WIDGETS[name].queries(context).items():
+            queries.setdefault(key, query)
+
+    return queries
+
+
+def build_widgets(names, context, results):
+    return {
+        name: WIDGETS[name].build(context, results)
+        for name in names
+    }
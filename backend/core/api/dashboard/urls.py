@@ -0,0 +1,10 @@
+# backend/core/api/dashboard/urls.py
+
+from django.urls import path
+
+from .views import CompositeDashboardView, CompositeDashboardAsyncView
+
+urlpatterns = [
+    path("", CompositeDashboardView.as_view(), name="dashboard"),
+    path("async/", CompositeDashboardAsyncView.as_view(), name="dashboard-async"),
+]
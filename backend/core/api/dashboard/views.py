@@ -0,0 +1,79 @@
+# backend/core/api/dashboard/views.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.async_views import AsyncReportView
+from core.api.concurrency import gather_queries, run_queries
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
+
+from .serializers import CompositeDashboardResponseSerializer
+from .services import (
+    WIDGETS,
+    build_widgets,
+    dashboard_context,
+    parse_widgets,
+    widget_queries,
+)
+
+
+WIDGETS_PARAMETER = OpenApiParameter(
+    name="widgets",
+    type=str,
+    required=False,
+    description=(
+        "Widgets séparés par des virgules (défaut : tous) : "
+        + ", ".join(WIDGETS)
+    ),
+)
+
+
+# =====================================================
+# DASHBOARD COMPOSITE (un aller-retour pour la page d'accueil)
+# =====================================================
+
+class CompositeDashboardView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
+    """
+    Regroupe finance, top produits, stock bas, alertes péremption et
+    intelligence : une seule authentification / vérification d'abonnement,
+    agrégats communs calculés une fois.
+    """
+
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant,
+    ]
+
+    @extend_schema(
+        summary="Dashboard composite (widgets au choix, une requête)",
+        parameters=[WIDGETS_PARAMETER],
+        responses=CompositeDashboardResponseSerializer,
+    )
+    def get(self, request):
+        names = parse_widgets(request.query_params.get("widgets"))
+        context = dashboard_context()
+        results = run_queries(widget_queries(names, context))
+
+        return Response({"widgets": build_widgets(names, context, results)})
+
+
+class CompositeDashboardAsyncView(AsyncReportView):
+    """Même réponse que CompositeDashboardView ; requêtes en parallèle (ASGI)."""
+
+    permission_classes = CompositeDashboardView.permission_classes
+
+    async def get(self, request):
+        names = parse_widgets(request.query_params.get("widgets"))
+        context = dashboard_context()
+        results = await gather_queries(widget_queries(names, context), self.statement_timeout_ms)
+
+        return self.render({"widgets": build_widgets(names, context, results)})
@@ -26,6 +26,24 @@ class MonthlyFinanceSerializer(serializers.Serializer):
     cogs = serializers.FloatField()
     gross_margin = serializers.FloatField()
     average_ticket = serializers.FloatField()
+    closing_stock_value = serializers.FloatField(allow_null=True)
+
+
+# =====================================================
+# VALORISATION DU STOCK
+# =====================================================
+
+class ValuationQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    interval = serializers.ChoiceField(choices=["day", "month"], default="day")
+
+
+class ValuationPointSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    products = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    value = serializers.FloatField()
 
 
 # =====================================================
@@ -37,6 +55,10 @@ class StockRotationSerializer(serializers.Serializer):
     sold_quantity = serializers.FloatField()
     current_stock = serializers.FloatField()
     rotation_ratio = serializers.FloatField()
+    abc_class = serializers.CharField()
+    xyz_class = serializers.CharField()
+    sell_through = serializers.FloatField(allow_null=True)
+    days_of_cover = serializers.FloatField(allow_null=True)
 
 
 # =====================================================
@@ -0,0 +1,265 @@
+# backend/core/api/finance/services.py
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db.models import Sum, F, ExpressionWrapper, DecimalField, Count
+from django.db.models.functions import TruncMonth
+from django.utils.timezone import localtime, now
+
+from core.models import InventoryValuation, Sale, ProductBatch
+from core.services.ledger import day_start
+
+
+# =====================================================
+# FINANCIAL DASHBOARD
+# =====================================================
+# Requêtes indépendantes (une requête SQL chacune) + assemblage pur :
+# exécutées en série par la vue sync, en parallèle par la vue async.
+
+@dataclass
+class DashboardPeriod:
+    start: date
+    end: date
+    prev_start: date
+    prev_end: date
+
+
+def dashboard_period(today=None):
+    today = today or now().date()
+    start = today - timedelta(days=29)
+    prev_end = start - timedelta(days=1)
+
+    return DashboardPeriod(
+        start=start,
+        end=today,
+        prev_start=prev_end - timedelta(days=29),
+        prev_end=prev_end,
+    )
+
+
+def sales_period_queries(period):
+    """
+    Agrégats ventes période courante / précédente, partagés avec
+    l'intelligence (mêmes fenêtres de 30 jours) : dans le dashboard
+    composite, mêmes clés -> une seule exécution.
+    """
+    current_sales = Sale.scoped.filter(
+        created_at__date__gte=period.start,
+        created_at__date__lt=period.end + timedelta(days=1),
+    )
+
+    previous_sales = Sale.scoped.filter(
+        created_at__date__gte=period.prev_start,
+        created_at__date__lt=period.prev_end + timedelta(days=1),
+    )
+
+    return {
+        "sales_current": lambda: current_sales.aggregate(
+            revenue=Sum("total_price"),
+            cogs=Sum("cost_total"),
+            sales_count=Count("id"),
+        ),
+        "sales_previous": lambda: previous_sales.aggregate(
+            revenue=Sum("total_price"),
+            cogs=Sum("cost_total"),
+        ),
+    }
+
+
+def dashboard_queries(period):
+    """
+    {nom: callable} — querysets liés au tenant actif (Model.scoped)
+    dès la construction : les callables peuvent tourner dans un autre thread.
+    """
+    current_sales = Sale.scoped.filter(
+        created_at__date__gte=period.start,
+        created_at__date__lt=period.end + timedelta(days=1),
+    )
+
+    # Lots vivants : un lot expiré non encore mis au rebut n'a plus de valeur
+    stock = ProductBatch.scoped.filter(quantity__gt=0, expiry_date__gte=period.end)
+
+    return {
+        **sales_period_queries(period),
+        "sales_chart": lambda: list(
+            current_sales
+            .annotate(month=TruncMonth("created_at"))
+            .values("month")
+            .annotate(
+                revenue=Sum("total_price"),
+                cogs=Sum("cost_total"),
+            )
+            .order_by("month")
+        ),
+        "stock_value": lambda: stock.aggregate(
+            total=Sum(
+                ExpressionWrapper(
+                    F("quantity") * F("purchase_price"),
+                    output_field=DecimalField(max_digits=12, decimal_places=2)
+                )
+            )
+        )["total"] or 0,
+    }
+
+
+def percent_change(current, previous):
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return ((current - previous) / previous) * 100
+
+
+def trend_label(value):
+    if value > 5:
+        return "strong_up"
+    elif value > 0:
+        return "up"
+    elif value < -5:
+        return "strong_down"
+    elif value < 0:
+        return "down"
+    return "stable"
+
+
+def build_dashboard(period, results):
+    current = results["sales_current"]
+    previous = results["sales_previous"]
+
+    current_revenue = current["revenue"] or 0
+    current_cogs = current["cogs"] or 0
+    current_sales_count = current["sales_count"] or 0
+    current_margin = current_revenue - current_cogs
+    current_avg_ticket = (
+        current_revenue / current_sales_count
+        if current_sales_count else 0
+    )
+
+    prev_revenue = previous["revenue"] or 0
+    prev_cogs = previous["cogs"] or 0
+    prev_margin = prev_revenue - prev_cogs
+
+    revenue_evolution = percent_change(current_revenue, prev_revenue)
+    margin_evolution = percent_change(current_margin, prev_margin)
+
+    anomaly = {
+        "is_anomaly": revenue_evolution < -30,
+        "revenue_drop_percent": round(abs(revenue_evolution), 2)
+        if revenue_evolution < 0 else 0,
+        "message": "Revenue dropped significantly"
+        if revenue_evolution < -30 else None
+    }
+
+    labels = []
+    revenue_series = []
+    margin_series = []
+
+    for item in results["sales_chart"]:
+        labels.append(str(item["month"].date()))
+        rev = item["revenue"] or 0
+        cg = item["cogs"] or 0
+        revenue_series.append(float(rev))
+        margin_series.append(float(rev - cg))
+
+    return {
+        "period": {"start": period.start, "end": period.end},
+        "current": {
+            "revenue": current_revenue,
+            "cogs": current_cogs,
+            "gross_margin": current_margin,
+            "sales_count": current_sales_count,
+            "average_ticket": round(current_avg_ticket, 2),
+        },
+        "previous": {
+            "revenue": prev_revenue,
+            "cogs": prev_cogs,
+            "gross_margin": prev_margin,
+        },
+        "evolution_percent": {
+            "revenue": round(revenue_evolution, 2),
+            "gross_margin": round(margin_evolution, 2),
+        },
+        "trend": {
+            "revenue": trend_label(revenue_evolution),
+            "gross_margin": trend_label(margin_evolution),
+        },
+        "anomaly": anomaly,
+        "chart": {
+            "labels": labels,
+            "revenue_series": revenue_series,
+            "margin_series": margin_series,
+        },
+        "stock_value": results["stock_value"],
+    }
+
+
+# =====================================================
+# TOP PRODUCTS
+# =====================================================
+
+def top_products_data(limit=10):
+    data = (
+        Sale.scoped
+        .values("product__name")
+        .annotate(
+            revenue=Sum("total_price"),
+            cogs=Sum("cost_total"),
+            quantity=Sum("quantity")
+        )
+        .order_by("-revenue")[:limit]
+    )
+
+    results = []
+
+    for item in data:
+        revenue = item["revenue"] or 0
+        cogs = item["cogs"] or 0
+
+        results.append({
+            "product": item["product__name"],
+            "quantity_sold": item["quantity"] or 0,
+            "revenue": revenue,
+            "gross_margin": revenue - cogs,
+        })
+
+    return results
+
+
+# =====================================================
+# VALORISATION DU STOCK (snapshots nocturnes)
+# =====================================================
+# Snapshot à minuit ouvrant J+1 = stock en fin de journée J ; celui du 1er
+# du mois = clôture du mois précédent.
+
+def valuation_series(date_from, date_to, interval="day"):
+    valuations = InventoryValuation.scoped.filter(
+        taken_at__gte=day_start(date_from + timedelta(days=1)),
+        taken_at__lte=day_start(date_to + timedelta(days=1)),
+    )
+    if interval == "month":
+        valuations = valuations.filter(taken_at__day=1)
+
+    return [
+        {
+            "date": localtime(taken_at).date() - timedelta(days=1),
+            "products": products,
+            "quantity": quantity,
+            "value": value,
+        }
+        for taken_at, products, quantity, value in (
+            valuations
+            .order_by("taken_at")
+            .values_list("taken_at", "products", "quantity", "value")
+        )
+    ]
+
+
+def month_closing_values():
+    """{1er jour du mois: valeur du stock à sa clôture} — lignes du 1er à minuit."""
+    return {
+        (localtime(taken_at).date() - timedelta(days=1)).replace(day=1): value
+        for taken_at, value in (
+            InventoryValuation.scoped
+            .filter(taken_at__day=1)
+            .values_list("taken_at", "value")
+        )
+    }
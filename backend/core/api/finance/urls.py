@@ -3,14 +3,18 @@
 from django.urls import path
 from .views import (
     FinanceDashboardView,
+    FinanceDashboardAsyncView,
     FinanceMonthlyView,
     FinanceTopProductsView,
     StockRotationView,
+    StockValuationView,
 )
 
 urlpatterns = [
     path("dashboard/", FinanceDashboardView.as_view(), name="finance-dashboard"),
+    path("dashboard/async/", FinanceDashboardAsyncView.as_view(), name="finance-dashboard-async"),
     path("monthly/", FinanceMonthlyView.as_view(), name="finance-monthly"),
     path("top-products/", FinanceTopProductsView.as_view(), name="finance-top-products"),
     path("stock-rotation/", StockRotationView.as_view(), name="finance-stock-rotation"),
+    path("valuation/", StockValuationView.as_view(), name="finance-valuation"),
 ]
\ No newline at end of file
@@ -3,33 +3,49 @@
 from datetime import timedelta
 from decimal import Decimal
 
-from django.db.models import (
-    Sum, F, ExpressionWrapper,
-    DecimalField, Count
-)
+from django.db.models import Sum, Count
 from django.db.models.functions import TruncMonth
-from django.utils.timezone import now
+from django.utils.timezone import localdate, localtime
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
 from drf_spectacular.utils import extend_schema
 
-from core.models import Sale, ProductBatch, Product
+from core.models import Sale, ProductAnalytics
 from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
 
+from core.api.async_views import AsyncReportView
+from core.api.concurrency import gather_queries, run_queries
+
+from .services import (
+    build_dashboard,
+    dashboard_period,
+    dashboard_queries,
+    month_closing_values,
+    top_products_data,
+    valuation_series,
+)
 from .serializers import (
     FinanceDashboardResponseSerializer,
     MonthlyFinanceSerializer,
     StockRotationSerializer,
     TopProductSerializer,
+    ValuationPointSerializer,
+    ValuationQuerySerializer,
 )
 
 # =====================================================
 # FINANCIAL DASHBOARD PRO (SaaS Protected)
 # =====================================================
 
-class FinanceDashboardView(APIView):
+class FinanceDashboardView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
 
     permission_classes = [
         permissions.IsAuthenticated,
@@ -42,156 +58,29 @@ class FinanceDashboardView(APIView):
         responses=FinanceDashboardResponseSerializer
     )
     def get(self, request):
+        period = dashboard_period()
+        results = run_queries(dashboard_queries(period))
 
-        pharmacy = request.user.pharmacy
-        today = now().date()
+        return Response(build_dashboard(period, results))
 
-        start = today - timedelta(days=29)
-        end = today
-        end_exclusive = end + timedelta(days=1)
 
-        # ---------------- CURRENT PERIOD ----------------
-        current_sales = Sale.objects.filter(
-            pharmacy=pharmacy,
-            created_at__date__gte=start,
-            created_at__date__lt=end_exclusive
-        )
-
-        current_agg = current_sales.aggregate(
-            revenue=Sum("total_price"),
-            cogs=Sum("cost_total"),
-            sales_count=Count("id")
-        )
+class FinanceDashboardAsyncView(AsyncReportView):
+    """Même réponse que FinanceDashboardView ; les 4 agrégats en parallèle (ASGI)."""
 
-        current_revenue = current_agg["revenue"] or 0
-        current_cogs = current_agg["cogs"] or 0
-        current_sales_count = current_agg["sales_count"] or 0
-        current_margin = current_revenue - current_cogs
-        current_avg_ticket = (
-            current_revenue / current_sales_count
-            if current_sales_count else 0
-        )
+    permission_classes = FinanceDashboardView.permission_classes
 
-        # ---------------- PREVIOUS PERIOD ----------------
-        prev_end = start - timedelta(days=1)
-        prev_start = prev_end - timedelta(days=29)
-        prev_end_exclusive = prev_end + timedelta(days=1)
+    async def get(self, request):
+        period = dashboard_period()
+        results = await gather_queries(dashboard_queries(period), self.statement_timeout_ms)
 
-        previous_sales = Sale.objects.filter(
-            pharmacy=pharmacy,
-            created_at__date__gte=prev_start,
-            created_at__date__lt=prev_end_exclusive
-        )
-
-        prev_agg = previous_sales.aggregate(
-            revenue=Sum("total_price"),
-            cogs=Sum("cost_total")
-        )
-
-        prev_revenue = prev_agg["revenue"] or 0
-        prev_cogs = prev_agg["cogs"] or 0
-        prev_margin = prev_revenue - prev_cogs
-
-        def percent_change(current, previous):
-            if previous == 0:
-                return 100 if current > 0 else 0
-            return ((current - previous) / previous) * 100
-
-        revenue_evolution = percent_change(current_revenue, prev_revenue)
-        margin_evolution = percent_change(current_margin, prev_margin)
-
-        def trend_label(value):
-            if value > 5:
-                return "strong_up"
-            elif value > 0:
-                return "up"
-            elif value < -5:
-                return "strong_down"
-            elif value < 0:
-                return "down"
-            return "stable"
-
-        anomaly = {
-            "is_anomaly": revenue_evolution < -30,
-            "revenue_drop_percent": round(abs(revenue_evolution), 2)
-            if revenue_evolution < 0 else 0,
-            "message": "Revenue dropped significantly"
-            if revenue_evolution < -30 else None
-        }
-
-        # ---------------- CHART ----------------
-        chart_data = (
-            current_sales
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(
-                revenue=Sum("total_price"),
-                cogs=Sum("cost_total")
-            )
-            .order_by("month")
-        )
-
-        labels = []
-        revenue_series = []
-        margin_series = []
-
-        for item in chart_data:
-            labels.append(str(item["month"].date()))
-            rev = item["revenue"] or 0
-            cg = item["cogs"] or 0
-            revenue_series.append(float(rev))
-            margin_series.append(float(rev - cg))
-
-        # ---------------- STOCK VALUE ----------------
-        stock_value = ProductBatch.objects.filter(
-            product__pharmacy=pharmacy,
-            quantity__gt=0
-        ).aggregate(
-            total=Sum(
-                ExpressionWrapper(
-                    F("quantity") * F("purchase_price"),
-                    output_field=DecimalField(max_digits=12, decimal_places=2)
-                )
-            )
-        )["total"] or 0
-
-        return Response({
-            "period": {"start": start, "end": end},
-            "current": {
-                "revenue": current_revenue,
-                "cogs": current_cogs,
-                "gross_margin": current_margin,
-                "sales_count": current_sales_count,
-                "average_ticket": round(current_avg_ticket, 2),
-            },
-            "previous": {
-                "revenue": prev_revenue,
-                "cogs": prev_cogs,
-                "gross_margin": prev_margin,
-            },
-            "evolution_percent": {
-                "revenue": round(revenue_evolution, 2),
-                "gross_margin": round(margin_evolution, 2),
-            },
-            "trend": {
-                "revenue": trend_label(revenue_evolution),
-                "gross_margin": trend_label(margin_evolution),
-            },
-            "anomaly": anomaly,
-            "chart": {
-                "labels": labels,
-                "revenue_series": revenue_series,
-                "margin_series": margin_series,
-            },
-            "stock_value": stock_value,
-        })
+        return self.render(build_dashboard(period, results))
 
 
 # =====================================================
 # MONTHLY FINANCE
 # =====================================================
 
-class FinanceMonthlyView(APIView):
+class FinanceMonthlyView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
 
     permission_classes = [
         permissions.IsAuthenticated,
@@ -202,11 +91,8 @@ class FinanceMonthlyView(APIView):
     @extend_schema(responses=MonthlyFinanceSerializer(many=True))
     def get(self, request):
 
-        pharmacy = request.user.pharmacy
-
         data = (
-            Sale.objects
-            .filter(pharmacy=pharmacy)
+            Sale.scoped
             .annotate(month=TruncMonth("created_at"))
             .values("month")
             .annotate(
@@ -217,6 +103,9 @@ class FinanceMonthlyView(APIView):
             .order_by("month")
         )
 
+        # Clôtures mensuelles lues dans les snapshots (mois en cours : None)
+        closing_values = month_closing_values()
+
         results = []
 
         for item in data:
@@ -230,7 +119,8 @@ class FinanceMonthlyView(APIView):
                 "cogs": cogs,
                 "gross_margin": revenue - cogs,
                 "average_ticket": (revenue / sales_count)
-                if sales_count else 0
+                if sales_count else 0,
+                "closing_stock_value": closing_values.get(localtime(item["month"]).date()),
             })
 
         return Response(results)
@@ -240,7 +130,7 @@ class FinanceMonthlyView(APIView):
 # TOP PRODUCTS
 # =====================================================
 
-class FinanceTopProductsView(APIView):
+class FinanceTopProductsView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
 
     permission_classes = [
         permissions.IsAuthenticated,
@@ -250,42 +140,45 @@ class FinanceTopProductsView(APIView):
 
     @extend_schema(responses=TopProductSerializer(many=True))
     def get(self, request):
+        return Response(top_products_data())
 
-        pharmacy = request.user.pharmacy
 
-        data = (
-            Sale.objects
-            .filter(pharmacy=pharmacy)
-            .values("product__name")
-            .annotate(
-                revenue=Sum("total_price"),
-                cogs=Sum("cost_total"),
-                quantity=Sum("quantity")
-            )
-            .order_by("-revenue")[:10]
-        )
+# =====================================================
+# VALORISATION DU STOCK (snapshot_stock)
+# =====================================================
 
-        results = []
+class StockValuationView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
 
-        for item in data:
-            revenue = item["revenue"] or 0
-            cogs = item["cogs"] or 0
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
 
-            results.append({
-                "product": item["product__name"],
-                "quantity_sold": item["quantity"] or 0,
-                "revenue": revenue,
-                "gross_margin": revenue - cogs,
-            })
+    @extend_schema(
+        summary="Stock value over time",
+        description=(
+            "Stock quantity and cost value at the end of each day (interval=day) "
+            "or month (interval=month), from the nightly snapshots; last 12 months by default"
+        ),
+        parameters=[ValuationQuerySerializer],
+        responses=ValuationPointSerializer(many=True),
+    )
+    def get(self, request):
+        params = ValuationQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
 
-        return Response(results)
+        date_to = params.validated_data.get("date_to") or localdate()
+        date_from = params.validated_data.get("date_from") or date_to - timedelta(days=364)
+
+        return Response(valuation_series(date_from, date_to, params.validated_data["interval"]))
 
 
 # =====================================================
 # STOCK ROTATION
 # =====================================================
 
-class StockRotationView(APIView):
+class StockRotationView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
 
     permission_classes = [
         permissions.IsAuthenticated,
@@ -296,30 +189,32 @@ class StockRotationView(APIView):
     @extend_schema(responses=StockRotationSerializer(many=True))
     def get(self, request):
 
-        pharmacy = request.user.pharmacy
-        products = Product.objects.filter(pharmacy=pharmacy)
+        # Précalculé par le job nocturne (compute_product_analytics) : ventes
+        # de la fenêtre d'analyse, stock non expiré, bandes ABC / XYZ
+        analytics = (
+            ProductAnalytics.scoped
+            .order_by("product__name")
+            .values_list(
+                "product__name", "units_sold", "stock", "abc_class", "xyz_class",
+                "sell_through", "days_of_cover",
+            )
+        )
 
         results = []
 
-        for product in products:
-
-            sold_qty = Sale.objects.filter(
-                pharmacy=pharmacy,
-                product=product
-            ).aggregate(total=Sum("quantity"))["total"] or 0
-
-            current_stock = ProductBatch.objects.filter(
-                product=product,
-                quantity__gt=0
-            ).aggregate(total=Sum("quantity"))["total"] or 0
+        for name, sold_qty, current_stock, abc, xyz, sell_through, days_of_cover in analytics:
 
             rotation_ratio = sold_qty / current_stock if current_stock else 0
 
             results.append({
-                "product": product.name,
+                "product": name,
                 "sold_quantity": sold_qty,
                 "current_stock": current_stock,
                 "rotation_ratio": round(rotation_ratio, 2),
+                "abc_class": abc,
+                "xyz_class": xyz,
+                "sell_through": sell_through,
+                "days_of_cover": days_of_cover,
             })
 
-        return Response(results)
\ No newline at end of file
+        return Response(results)
@@ -0,0 +1,192 @@
+# backend/core/api/intelligence/services.py
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db.models import Sum, F
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from core.models import Sale, Product, ProductBatch, get_current_pharmacy
+from core.api.finance.services import DashboardPeriod, dashboard_period, sales_period_queries
+from core.services.forecast import get_forecast
+from core.services.product_analytics import underperforming_products
+
+
+# =====================================================
+# INTELLIGENCE OVERVIEW
+# =====================================================
+# Même découpage que finance/services.py : requêtes indépendantes
+# (série en sync, parallèle en async) puis calculs purs.
+
+@dataclass
+class OverviewPeriod:
+    today: date
+    # 30 jours courants / 30 précédents : fenêtres du dashboard financier
+    sales: DashboardPeriod
+    expiry_limit: date
+    last14_start: date
+
+
+def overview_period(today=None):
+    today = today or now().date()
+
+    return OverviewPeriod(
+        today=today,
+        sales=dashboard_period(today),
+        expiry_limit=today + timedelta(days=30),
+        last14_start=today - timedelta(days=13),
+    )
+
+
+def overview_queries(period):
+    """{nom: callable} liés au tenant actif dès la construction."""
+    today = period.today
+
+    last14_sales = Sale.scoped.filter(
+        created_at__date__gte=period.last14_start,
+        created_at__date__lte=today,
+    )
+
+    batches = ProductBatch.scoped.filter(quantity__gt=0)
+    pharmacy = get_current_pharmacy()
+
+    low_stock = (
+        Product.scoped
+        .filter(is_active=True)
+        .annotate(stock=Coalesce(Sum("batches__quantity"), 0))
+        .filter(stock__lte=F("min_stock_level"))
+    )
+
+    return {
+        **sales_period_queries(period.sales),
+        "expired_batches": lambda: batches.filter(expiry_date__lt=today).count(),
+        "expiring_soon_batches": lambda: batches.filter(
+            expiry_date__range=(today, period.expiry_limit)
+        ).count(),
+        "low_stock_count": lambda: low_stock.count(),
+        "last14_revenue": lambda: last14_sales.aggregate(
+            revenue=Sum("total_price")
+        )["revenue"] or 0,
+        # En cache pour la journée (core.services.forecast)
+        "forecast": lambda: get_forecast(pharmacy, today),
+        # Précalculé par le job nocturne (compute_product_analytics)
+        "underperforming": lambda: underperforming_products(pharmacy),
+    }
+
+
+def pct_change(current, previous):
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return ((current - previous) / previous) * 100
+
+
+def financial_health_score(revenue_change_pct, cur_margin_pct, anomaly, cur_cnt):
+    score = 0
+
+    if revenue_change_pct >= 10:
+        score += 30
+    elif revenue_change_pct >= 0:
+        score += 20
+    elif revenue_change_pct >= -10:
+        score += 10
+
+    if cur_margin_pct >= 30:
+        score += 30
+    elif cur_margin_pct >= 20:
+        score += 20
+    elif cur_margin_pct >= 10:
+        score += 10
+
+    score += 20 if not anomaly else 5
+
+    if cur_cnt >= 50:
+        score += 20
+    elif cur_cnt >= 20:
+        score += 15
+    elif cur_cnt >= 5:
+        score += 10
+
+    return {
+        "score": int(score),
+        "label": (
+            "excellent" if score >= 85 else
+            "good" if score >= 70 else
+            "warning" if score >= 50 else
+            "critical"
+        ),
+    }
+
+
+def stock_health_index(expired_batches, expiring_soon_batches, low_stock_count):
+    stock_index = 100
+    stock_index -= expired_batches * 2
+    stock_index -= expiring_soon_batches * 1
+    stock_index -= low_stock_count * 3
+    stock_index = max(0, min(100, stock_index))
+
+    return {
+        "index": int(stock_index),
+        "label": (
+            "healthy" if stock_index >= 75 else
+            "warning" if stock_index >= 50 else
+            "critical"
+        ),
+    }
+
+
+def build_overview(period, results):
+    cur = results["sales_current"]
+    prv = results["sales_previous"]
+
+    cur_revenue = cur["revenue"] or 0
+    cur_cogs = cur["cogs"] or 0
+    cur_cnt = cur["sales_count"] or 0
+    cur_margin = cur_revenue - cur_cogs
+    cur_margin_pct = (cur_margin / cur_revenue * 100) if cur_revenue else 0
+
+    revenue_change_pct = pct_change(cur_revenue, prv["revenue"] or 0)
+
+    anomaly = revenue_change_pct < -30
+    expired_batches = results["expired_batches"]
+
+    # -------------------------
+    # FORECAST
+    # -------------------------
+    # avg_daily : réalisé des 14 derniers jours ; next_7_days : modèle
+    # (saison hebdomadaire) à partir d'aujourd'hui
+    avg_daily = float(results["last14_revenue"]) / 14.0
+    forecast = results["forecast"]
+
+    # -------------------------
+    # ALERTS
+    # -------------------------
+    alerts = []
+
+    if anomaly:
+        alerts.append({"type": "revenue_anomaly", "severity": "high"})
+
+    if expired_batches > 0:
+        alerts.append({"type": "expired_stock", "severity": "high"})
+
+    return {
+        "period": {
+            "current_start": period.sales.start,
+            "current_end": period.today,
+        },
+        "financial_health_score": financial_health_score(
+            revenue_change_pct, cur_margin_pct, anomaly, cur_cnt
+        ),
+        "stock_health_index": stock_health_index(
+            expired_batches,
+            results["expiring_soon_batches"],
+            results["low_stock_count"],
+        ),
+        "underperforming_products": results["underperforming"],
+        "sales_forecast_7d": {
+            "avg_daily": round(avg_daily, 2),
+            "next_7_days": forecast.revenue[:7],
+            "method": forecast.method,
+        },
+        "alert_intelligence": alerts,
+    }
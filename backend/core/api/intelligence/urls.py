@@ -1,8 +1,9 @@
 # backend/core/api/intelligence/urls.py
 
 from django.urls import path
-from .views import IntelligenceView
+from .views import IntelligenceView, IntelligenceAsyncView
 
 urlpatterns = [
     path("overview/", IntelligenceView.as_view(), name="intelligence-overview"),
+    path("overview/async/", IntelligenceAsyncView.as_view(), name="intelligence-overview-async"),
 ]
\ No newline at end of file
@@ -0,0 +1,205 @@
+# backend/core/api/mixins.py
+
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.settings import api_settings
+
+from core.api.conditional import apply_validators, data_validators, not_modified_response
+from core.api.renderers import ColumnarJSONRenderer
+from core.db.replica import (
+    activate_replica_reads,
+    deactivate_replica_reads,
+    get_read_alias,
+)
+from core.db.timeouts import (
+    is_statement_timeout,
+    reset_statement_timeout,
+    set_statement_timeout,
+)
+from core.models import activate_tenant, deactivate_tenant
+
+
+# =====================================================
+# TENANT SCOPE (Model.scoped)
+# =====================================================
+
+def require_pharmacy(request):
+    pharmacy = getattr(request.user, "pharmacy", None)
+
+    if pharmacy is None:
+        raise PermissionDenied("Aucune pharmacie associée à ce compte.")
+
+    return pharmacy
+
+
+class TenantScopedMixin:
+    """
+    Active la pharmacie de l'utilisateur comme tenant courant
+    pour toute la requête : `Model.scoped` filtre alors automatiquement.
+    Le scope est posé après authentification + permissions ; un compte
+    sans pharmacie (SaaS Admin) reçoit 403 : aucune vue tenant n'atteint
+    `.scoped` sans tenant.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._tenant_token = activate_tenant(require_pharmacy(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_tenant_token", None)
+
+        if token is not None:
+            deactivate_tenant(token)
+            self._tenant_token = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# =====================================================
+# STATEMENT TIMEOUT (vues de reporting)
+# =====================================================
+
+class StatementTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Calcul trop long, réessayez dans quelques instants."
+    default_code = "statement_timeout"
+
+
+class StatementTimeoutMixin:
+    """
+    Plafonne chaque requête SQL de la vue (statement_timeout PostgreSQL) :
+    un rapport trop lourd renvoie 503 au lieu de bloquer un worker et
+    une connexion. Le plafond est retiré en fin de requête (connexions
+    persistantes / pool).
+    """
+
+    # ms ; None -> settings.REPORTING_STATEMENT_TIMEOUT_MS, 0 -> pas de plafond
+    statement_timeout = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        timeout = (
+            self.statement_timeout if self.statement_timeout is not None
+            else settings.REPORTING_STATEMENT_TIMEOUT_MS
+        )
+        # Sur la base qui sert les lectures (réplica si ReplicaReadMixin est après dans le MRO)
+        self._statement_timeout_alias = get_read_alias() or DEFAULT_DB_ALIAS
+        self._statement_timeout_set = set_statement_timeout(timeout, using=self._statement_timeout_alias)
+
+    def handle_exception(self, exc):
+        if is_statement_timeout(exc):
+            exc = StatementTimeout()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(self, "_statement_timeout_set", False):
+            reset_statement_timeout(using=self._statement_timeout_alias)
+            self._statement_timeout_set = False
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# =====================================================
+# READ REPLICA (vues de reporting en lecture seule)
+# =====================================================
+
+class ReplicaReadMixin:
+    """
+    Lectures ORM de la vue servies par le réplica (settings.REPLICA_DATABASE_ALIAS).
+    Uniquement pour les méthodes sûres ; un utilisateur qui vient d'écrire
+    reste sur le primaire (read-your-writes, ReadYourWritesMiddleware).
+    L'authentification est faite avant, sur le primaire.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = activate_replica_reads(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        deactivate_replica_reads(getattr(self, "_replica_token", None))
+        self._replica_token = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def replica_reads(view_func):
+    """
+    Équivalent de ReplicaReadMixin pour une vue fonction / une méthode
+    (`request` = premier argument après self éventuel).
+    """
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        request = next(a for a in args if hasattr(a, "method"))
+        token = activate_replica_reads(request)
+        try:
+            return view_func(*args, **kwargs)
+        finally:
+            deactivate_replica_reads(token)
+
+    return wrapper
+
+
+# =====================================================
+# GET CONDITIONNEL (ETag / Last-Modified)
+# =====================================================
+
+class NotModified(Exception):
+    """Interne à ConditionalGetMixin : court-circuite la vue (304)."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified dérivés de PharmacyDataVersion : un client qui
+    renvoie If-None-Match / If-Modified-Since à jour reçoit 304 sans
+    qu'aucun agrégat ne soit calculé.
+    À placer avant ReplicaReadMixin dans le MRO (version lue sur la même
+    base que les données).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self._validators = data_validators(request)
+
+        if self._validators is not None:
+            response = not_modified_response(request, self._validators)
+
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "_validators", None)
+
+        if validators is not None:
+            apply_validators(response, validators)
+
+        return response
+
+
+# =====================================================
+# FORMAT COLONNAIRE (grandes listes)
+# =====================================================
+
+class ColumnarListMixin:
+    """
+    Ajoute ?format=columnar (ColumnarJSONRenderer) aux rendus par défaut :
+    pour les listes longues consultées sur des liaisons lentes.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
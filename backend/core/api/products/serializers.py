@@ -55,3 +55,16 @@ class ExpiringBatchSerializer(serializers.ModelSerializer):
             "quantity",
             "expiry_date",
         ]
+
+
+class ExpiryRiskSerializer(serializers.Serializer):
+    batch_id = serializers.UUIDField()
+    product_id = serializers.UUIDField()
+    product_name = serializers.CharField()
+    expiry_date = serializers.DateField()
+    days_to_expiry = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    projected_sales = serializers.IntegerField()
+    quantity_at_risk = serializers.IntegerField()
+    value_at_risk = serializers.DecimalField(max_digits=14, decimal_places=2)
+    computed_at = serializers.DateTimeField()
@@ -0,0 +1,118 @@
+# backend/core/api/products/services.py
+
+from datetime import timedelta
+
+from django.db.models import Sum, Min, Q, F, Value
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from core.models import BatchExpiryRisk, Product
+
+from .serializers import ExpiryRiskSerializer, LowStockProductSerializer, ProductStockSerializer
+
+
+# ======================================================
+# STOCK GLOBAL PAR PRODUIT
+# ======================================================
+
+def product_stock_data():
+    """Stock + péremption la plus proche par produit actif (tenant courant), sérialisé."""
+    products = (
+        Product.scoped
+        .filter(is_active=True)
+        .annotate(
+            stock=Sum("batches__quantity", filter=Q(batches__quantity__gt=0)),
+            nearest_expiry=Min("batches__expiry_date")
+        )
+    )
+
+    for product in products:
+        product.stock = product.stock or 0
+        product.low_stock = product.stock <= product.min_stock_level
+
+    return ProductStockSerializer(products, many=True).data
+
+
+# ======================================================
+# LOW STOCK PRODUCTS
+# ======================================================
+
+def low_stock_data():
+    low_stock_products = (
+        Product.scoped
+        .filter(is_active=True)
+        .annotate(
+            stock=Coalesce(
+                Sum("batches__quantity", filter=Q(batches__quantity__gt=0)),
+                0
+            ),
+            nearest_expiry=Min(
+                "batches__expiry_date",
+                filter=Q(batches__quantity__gt=0)
+            ),
+            low_stock=Value(True),
+        )
+        .filter(stock__lte=F("min_stock_level"))
+    )
+
+    return LowStockProductSerializer(low_stock_products, many=True).data
+
+
+# ======================================================
+# PRODUITS EXPIRÉS OU PROCHES EXPIRATION
+# ======================================================
+
+def expiry_alert_data(today=None):
+    today = today or now().date()
+    limit_date = today + timedelta(days=30)
+
+    products = (
+        Product.scoped
+        .filter(is_active=True)
+        .annotate(
+            stock=Sum(
+                "batches__quantity",
+                filter=Q(batches__quantity__gt=0)
+            ),
+            nearest_expiry=Min(
+                "batches__expiry_date",
+                filter=Q(
+                    batches__quantity__gt=0,
+                    batches__expiry_date__lte=limit_date
+                )
+            ),
+        )
+        .filter(nearest_expiry__isnull=False)
+        .order_by("nearest_expiry")
+    )
+
+    for p in products:
+        p.stock = p.stock or 0
+        p.is_expired = p.nearest_expiry < today
+        p.is_expiring_soon = today <= p.nearest_expiry <= limit_date
+
+    return ProductStockSerializer(products, many=True).data
+
+
+# ======================================================
+# RISQUE DE PÉREMPTION (précalculé : core.services.expiry_risk)
+# ======================================================
+
+def expiry_risk_data(today=None):
+    """Lots projetés pour expirer avec du stock, par échéance (tenant courant)."""
+    today = today or now().date()
+
+    risks = (
+        BatchExpiryRisk.scoped
+        .order_by("expiry_date", "-value_at_risk")
+        .values(
+            "batch_id", "product_id", "expiry_date", "quantity", "projected_sales",
+            "quantity_at_risk", "value_at_risk", "computed_at",
+            product_name=F("product__name"),
+        )
+    )
+
+    for risk in risks:
+        risk["days_to_expiry"] = (risk["expiry_date"] - today).days
+
+    return ExpiryRiskSerializer(risks, many=True).data
@@ -4,12 +4,16 @@ from django.urls import path
 
 from .views import (
     ProductStockListView,
+    ProductStockAsyncView,
     LowStockProductListView,
     ProductExpiryAlertView,
+    ProductExpiryRiskView,
 )
 
 urlpatterns = [
     path("stock/", ProductStockListView.as_view(), name="product-stock"),
+    path("stock/async/", ProductStockAsyncView.as_view(), name="product-stock-async"),
     path("low-stock/", LowStockProductListView.as_view(), name="low-stock"),
     path("expiry-alerts/", ProductExpiryAlertView.as_view(), name="expiry-alerts"),
+    path("expiry-risk/", ProductExpiryRiskView.as_view(), name="expiry-risk"),
 ]
\ No newline at end of file
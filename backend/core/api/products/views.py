@@ -1,7 +1,3 @@
-from datetime import timedelta
-from django.db.models import Sum, Min, Q
-from django.utils.timezone import now
-
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
@@ -9,20 +5,25 @@ from rest_framework.permissions import IsAuthenticated
 
 from drf_spectacular.utils import extend_schema
 
-from core.models import Product
 from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.async_views import AsyncReportView
+from core.api.concurrency import gather_queries
+from core.api.mixins import TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin
+
+from .services import expiry_alert_data, expiry_risk_data, low_stock_data, product_stock_data
 
 from .serializers import (
     ProductStockSerializer,
     LowStockProductSerializer,
     ExpiringBatchSerializer,
+    ExpiryRiskSerializer,
 )
 
 
 # ======================================================
 # STOCK GLOBAL PAR PRODUIT
 # ======================================================
-class ProductStockListView(APIView):
+class ProductStockListView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
     permission_classes = [
         IsAuthenticated,
         IsSubscriptionActive,
@@ -34,28 +35,24 @@ class ProductStockListView(APIView):
         responses=ProductStockSerializer(many=True),
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
+        return Response(product_stock_data())
+
 
-        products = (
-            Product.objects
-            .filter(pharmacy=pharmacy, is_active=True)
-            .annotate(
-                stock=Sum("batches__quantity", filter=Q(batches__quantity__gt=0)),
-                nearest_expiry=Min("batches__expiry_date")
-            )
-        )
+class ProductStockAsyncView(AsyncReportView):
+    """Même réponse que ProductStockListView, sans bloquer de thread sous ASGI."""
 
-        for product in products:
-            product.stock = product.stock or 0
-            product.low_stock = product.stock <= product.min_stock_level
+    permission_classes = ProductStockListView.permission_classes
 
-        return Response(ProductStockSerializer(products, many=True).data)
+    async def get(self, request):
+        results = await gather_queries({"stock": product_stock_data}, self.statement_timeout_ms)
+
+        return self.render(results["stock"])
 
 
 # ======================================================
 # LOW STOCK PRODUCTS
 # ======================================================
-class LowStockProductListView(APIView):
+class LowStockProductListView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
     permission_classes = [
         IsAuthenticated,
         IsSubscriptionActive,
@@ -68,33 +65,13 @@ class LowStockProductListView(APIView):
         responses=LowStockProductSerializer(many=True),
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
-
-        products = (
-            Product.objects
-            .filter(pharmacy=pharmacy, is_active=True)
-            .annotate(
-                stock=Sum(
-                    "batches__quantity",
-                    filter=Q(batches__quantity__gt=0)
-                )
-            )
-        )
-
-        low_stock_products = []
-
-        for product in products:
-            product.stock = product.stock or 0
-            if product.stock <= product.min_stock_level:
-                low_stock_products.append(product)
-
-        return Response(LowStockProductSerializer(low_stock_products, many=True).data)
+        return Response(low_stock_data())
 
 
 # ======================================================
 # PRODUITS EXPIRÉS OU PROCHES EXPIRATION
 # ======================================================
-class ProductExpiryAlertView(APIView):
+class ProductExpiryAlertView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
     permission_classes = [
         IsAuthenticated,
         IsSubscriptionActive,
@@ -106,33 +83,26 @@ class ProductExpiryAlertView(APIView):
         responses=ProductStockSerializer(many=True),
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
-        today = now().date()
-        limit_date = today + timedelta(days=30)
-
-        products = (
-            Product.objects
-            .filter(pharmacy=pharmacy, is_active=True)
-            .annotate(
-                stock=Sum(
-                    "batches__quantity",
-                    filter=Q(batches__quantity__gt=0)
-                ),
-                nearest_expiry=Min(
-                    "batches__expiry_date",
-                    filter=Q(
-                        batches__quantity__gt=0,
-                        batches__expiry_date__lte=limit_date
-                    )
-                ),
-            )
-            .filter(nearest_expiry__isnull=False)
-            .order_by("nearest_expiry")
-        )
-
-        for p in products:
-            p.stock = p.stock or 0
-            p.is_expired = p.nearest_expiry < today
-            p.is_expiring_soon = today <= p.nearest_expiry <= limit_date
-
-        return Response(ProductStockSerializer(products, many=True).data)
\ No newline at end of file
+        return Response(expiry_alert_data())
+
+
+# ======================================================
+# LOTS À RISQUE DE PÉREMPTION (PRÉVISION)
+# ======================================================
+class ProductExpiryRiskView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
+    permission_classes = [
+        IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        summary="Lots qui expireront avant d'être vendus",
+        description=(
+            "Écoulement FIFO des lots contre la prévision de ventes : quantité "
+            "et valeur d'achat à risque par lot (recalculé à chaque vente)"
+        ),
+        responses=ExpiryRiskSerializer(many=True),
+    )
+    def get(self, request):
+        return Response(expiry_risk_data())
@@ -0,0 +1,93 @@
+# backend/core/api/renderers.py
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : rendu DRF standard
+    orjson = None
+
+
+# =====================================================
+# JSON (orjson)
+# =====================================================
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Même sortie que JSONRenderer (compact, UTF-8, dates ISO avec "Z",
+    Decimal non coercés -> float) sérialisée par orjson, plusieurs fois
+    plus rapide sur les grandes listes. Sans orjson installé : JSONRenderer.
+    Choisi via REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] (API_JSON_RENDERER).
+    """
+
+    # Types inconnus d'orjson (Decimal, lazy str, QuerySet...) : encodeur DRF
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+        # orjson n'indente que sur 2 espaces (API navigable, Accept: ...; indent=4)
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        content = orjson.dumps(data, default=self.default, option=options)
+
+        # Comme JSONRenderer : JSON embarquable tel quel dans du JavaScript
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+        return content
+
+
+# =====================================================
+# FORMAT COLONNAIRE (grandes listes)
+# =====================================================
+
+def to_columns(rows):
+    """
+    [{"a": 1, "b": 2}, ...] -> {"columns": ["a", "b"], "rows": [[1, 2], ...]}
+    Colonnes dans l'ordre d'apparition (sérialiseur), valeur absente -> null.
+    """
+    columns = {}
+
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+
+    columns = list(columns)
+
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+    }
+
+
+def is_row_list(data):
+    return isinstance(data, list) and all(isinstance(row, dict) for row in data)
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Listes d'objets envoyées en colonnes : les clés ne sont plus répétées
+    sur chaque ligne (historique des ventes, stock, bons d'entrée).
+    Opt-in par `?format=columnar` ou Accept: application/vnd.ngrpharma.columnar+json.
+    Réponses paginées : seul "results" est converti ; erreurs et objets
+    inchangés.
+    """
+
+    media_type = "application/vnd.ngrpharma.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if is_row_list(data):
+            data = to_columns(data)
+        elif isinstance(data, dict) and is_row_list(data.get("results")):
+            data = {**data, "results": to_columns(data["results"])}
+
+        return super().render(data, accepted_media_type, renderer_context)
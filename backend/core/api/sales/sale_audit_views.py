@@ -6,10 +6,11 @@ from drf_spectacular.utils import extend_schema
 
 from core.models import SaleAuditLog
 from core.permissions import IsSubscriptionActive
+from core.api.mixins import TenantScopedMixin, ColumnarListMixin
 from .serializers import SaleAuditLogSerializer
 
 
-class SaleAuditLogListView(ListAPIView):
+class SaleAuditLogListView(TenantScopedMixin, ColumnarListMixin, ListAPIView):
     """
     Journal d’audit des ventes pour la pharmacie connectée
     """
@@ -23,8 +24,7 @@ class SaleAuditLogListView(ListAPIView):
     )
     def get_queryset(self):
         return (
-            SaleAuditLog.objects
-            .filter(pharmacy=self.request.user.pharmacy)
+            SaleAuditLog.scoped
             .select_related("product", "user")
             .order_by("-created_at")
         )
\ No newline at end of file
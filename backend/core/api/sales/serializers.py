@@ -6,6 +6,7 @@ from django.utils.timezone import now
 from drf_spectacular.utils import extend_schema_field
 
 from core.models import (
+    PharmacyDataVersion,
     Product,
     Sale,
     ProductBatch,
@@ -13,12 +14,10 @@ from core.models import (
     SaleBatchConsumption,
 )
 
-from core.services.notifications import (
-    notify_blocked_sale,
-    notify_expired_products,
-    notify_expiring_soon_products,
-    notify_low_stock,
-)
+from core.services.notifications import notify_blocked_sale
+from core.services.expiry_risk import refresh_after_commit
+from core.services.ledger import record_movements
+from core.services.rollups import record_sale_in_rollups
 
 
 # =====================================================
@@ -46,9 +45,8 @@ class SaleCreateSerializer(serializers.Serializer):
         quantity = data["quantity"]
 
         try:
-            product = Product.objects.get(
+            product = Product.objects.for_pharmacy(pharmacy).get(
                 id=data["product_id"],
-                pharmacy=pharmacy,
             )
         except Product.DoesNotExist:
             self._log_blocked_sale(
@@ -108,14 +106,17 @@ class SaleCreateSerializer(serializers.Serializer):
 
         with transaction.atomic():
 
+            # Lots verrouillés (SELECT ... FOR UPDATE) : quantités relues à jour,
+            # deux caisses ne consomment pas le même stock
             batches = ProductBatch.objects.filter(
                 product=product,
                 quantity__gt=0,
                 expiry_date__gte=today
-            ).order_by("expiry_date", "created_at")
+            ).order_by("expiry_date", "created_at").select_for_update()
 
             remaining = qty_to_sell
             total_cost = 0
+            movements = []
 
             sale = Sale.objects.create(
                 pharmacy=pharmacy,
@@ -140,17 +141,35 @@ class SaleCreateSerializer(serializers.Serializer):
 
                 SaleBatchConsumption.objects.create(
                     sale=sale,
+                    pharmacy=pharmacy,
                     batch=batch,
                     quantity=take,
                     unit_cost=batch.purchase_price,
                     total_cost=cost_line,
                 )
+                movements.append((product.id, batch.id, -take, batch.purchase_price))
 
                 remaining -= take
 
+            # Stock vendu entre la validation et le verrou : rien n'est enregistré
+            if remaining:
+                raise serializers.ValidationError("Stock insuffisant")
+
             sale.cost_total = total_cost
             sale.save(update_fields=["cost_total"])
 
+            record_movements(
+                pharmacy.id, "sale", movements,
+                reference=sale.id, user=request.user, created_at=sale.created_at,
+            )
+
+            # Rollup plateforme (ligne unique du jour) : hors transaction de vente
+            transaction.on_commit(lambda: record_sale_in_rollups(sale))
+            # Lots du produit re-projetés contre la prévision (stock entamé),
+            # après COMMIT : ni verrous ni calcul de prévision dans la vente
+            transaction.on_commit(lambda: refresh_after_commit(pharmacy.id, [product.id]))
+            PharmacyDataVersion.bump(pharmacy.id)
+
             SaleAuditLog.objects.create(
                 pharmacy=pharmacy,
                 user=request.user,
@@ -161,10 +180,7 @@ class SaleCreateSerializer(serializers.Serializer):
                 message="Vente effectuée avec succès",
             )
 
-        notify_low_stock(pharmacy)
-        notify_expired_products(pharmacy)
-        notify_expiring_soon_products(pharmacy)
-
+        # Alertes stock : digest planifié (send_stock_alerts), hors requête
         return sale
 
 
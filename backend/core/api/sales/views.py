@@ -6,6 +6,7 @@ from rest_framework import permissions, status
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import TenantScopedMixin, ColumnarListMixin
 from core.models import Sale, SaleAuditLog
 
 from .serializers import (
@@ -18,7 +19,7 @@ from .serializers import (
 # ======================================================
 # CREATE SALE
 # ======================================================
-class CreateSaleView(APIView):
+class CreateSaleView(TenantScopedMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive
@@ -48,7 +49,7 @@ class CreateSaleView(APIView):
 # ======================================================
 # SALE HISTORY
 # ======================================================
-class SaleHistoryView(APIView):
+class SaleHistoryView(TenantScopedMixin, ColumnarListMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive,
@@ -61,11 +62,8 @@ class SaleHistoryView(APIView):
         description="Retourne toutes les ventes de la pharmacie connectée",
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
-
         sales = (
-            Sale.objects
-            .filter(pharmacy=pharmacy)
+            Sale.scoped
             .select_related("product")
             .order_by("-created_at")
         )
@@ -77,7 +75,7 @@ class SaleHistoryView(APIView):
 # ======================================================
 # SALE AUDIT LOG (WITH FILTERS)
 # ======================================================
-class SaleAuditLogView(APIView):
+class SaleAuditLogView(TenantScopedMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive
@@ -95,8 +93,7 @@ class SaleAuditLogView(APIView):
         responses={200: SaleAuditLogSerializer(many=True)},
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
-        qs = SaleAuditLog.objects.filter(pharmacy=pharmacy)
+        qs = SaleAuditLog.scoped.select_related("product", "user")
 
         reason = request.query_params.get("reason")
         if reason:
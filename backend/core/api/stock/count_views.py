@@ -0,0 +1,193 @@
+# backend/core/api/stock/count_views.py
+
+from django.db.models import Count
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from drf_spectacular.utils import extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
+from core.api.concurrency import run_queries
+from core.models import StockCount
+from core.services.stock_count import (
+    build_variance_report,
+    cancel_count,
+    count_variance_queries,
+    open_count,
+    post_count,
+    record_counts,
+)
+
+from .serializers import (
+    StockCountCreateSerializer,
+    StockCountLinesResultSerializer,
+    StockCountLinesSerializer,
+    StockCountListSerializer,
+    StockCountPostResultSerializer,
+    StockCountReportSerializer,
+)
+
+
+def closed_response():
+    return Response({"detail": "Inventaire déjà clôturé ou annulé"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+# =========================================================
+# OUVRIR UNE SESSION D'INVENTAIRE
+# =========================================================
+class StockCountCreateView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=StockCountCreateSerializer,
+        responses={201: StockCountListSerializer},
+        summary="Ouvrir un inventaire",
+        description=(
+            "Une session ouverte par pharmacie ; full=true : les lots en stock "
+            "non comptés passeront à 0 à la clôture"
+        ),
+    )
+    def post(self, request):
+        serializer = StockCountCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        count = open_count(request.user.pharmacy, user=request.user, **serializer.validated_data)
+        count.line_count = 0
+
+        return Response(StockCountListSerializer(count).data, status=status.HTTP_201_CREATED)
+
+
+# =========================================================
+# LISTE DES INVENTAIRES
+# =========================================================
+class StockCountListView(TenantScopedMixin, ConditionalGetMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        responses={200: StockCountListSerializer(many=True)},
+        summary="Liste des inventaires",
+    )
+    def get(self, request):
+        counts = StockCount.scoped.annotate(line_count=Count("lines")).order_by("-created_at")
+
+        return Response(StockCountListSerializer(counts, many=True).data)
+
+
+# =========================================================
+# ENVOI DES COMPTAGES (scanners, par lots)
+# =========================================================
+class StockCountLinesView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=StockCountLinesSerializer,
+        responses={200: StockCountLinesResultSerializer},
+        summary="Envoyer des quantités comptées",
+        description=(
+            "Quantités comptées par lot, envoyées par paquets (STOCK_COUNT_CHUNK_SIZE "
+            "lignes max) ; un lot recompté remplace sa ligne. Lots inconnus renvoyés dans `unknown`"
+        ),
+    )
+    def post(self, request, pk):
+        count = get_object_or_404(StockCount.scoped, id=pk)
+        if count.status != "open":
+            return closed_response()
+
+        serializer = StockCountLinesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = record_counts(
+            count,
+            [(line["batch_id"], line["quantity"]) for line in serializer.validated_data["lines"]],
+        )
+
+        return Response(StockCountLinesResultSerializer(result).data)
+
+
+# =========================================================
+# ÉCARTS D'UNE SESSION
+# =========================================================
+class StockCountDetailView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        responses={200: StockCountReportSerializer},
+        summary="Écarts d'inventaire",
+        description="Totaux, lots en écart (valorisés au coût du lot) et lots en stock non comptés",
+    )
+    def get(self, request, pk):
+        count = get_object_or_404(StockCount.scoped, id=pk)
+
+        results = run_queries(count_variance_queries(count))
+        return Response(build_variance_report(count, results))
+
+
+# =========================================================
+# CLÔTURE / ABANDON
+# =========================================================
+class StockCountPostView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=None,
+        responses={200: StockCountPostResultSerializer},
+        summary="Clôturer un inventaire",
+        description="Passe les écarts en ajustements de stock (motif count), en une transaction",
+    )
+    def post(self, request, pk):
+        count = get_object_or_404(StockCount.scoped, id=pk)
+        if count.status != "open":
+            return closed_response()
+
+        result = post_count(count, user=request.user)
+
+        return Response(StockCountPostResultSerializer(result).data)
+
+
+class StockCountCancelView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=None,
+        responses={204: None},
+        summary="Abandonner un inventaire",
+    )
+    def post(self, request, pk):
+        count = get_object_or_404(StockCount.scoped, id=pk)
+        if count.status != "open":
+            return closed_response()
+
+        cancel_count(count)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
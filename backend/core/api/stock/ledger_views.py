@@ -0,0 +1,99 @@
+# backend/core/api/stock/ledger_views.py
+
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    ColumnarListMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
+from core.models import StockMovement
+from core.services.ledger import stock_on_date
+
+from .serializers import (
+    StockMovementFilterSerializer,
+    StockMovementSerializer,
+    StockOnDateQuerySerializer,
+    StockOnDateSerializer,
+)
+
+
+# =========================================================
+# JOURNAL DES MOUVEMENTS DE STOCK
+# =========================================================
+class StockMovementListView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        summary="Journal des mouvements de stock",
+        description="Réceptions, ventes, ajustements, rebuts, transferts (30 derniers jours par défaut)",
+        parameters=[
+            OpenApiParameter(name="product_id", type=str, required=False),
+            OpenApiParameter(name="kind", type=str, required=False),
+            OpenApiParameter(name="date_from", type=str, required=False),
+            OpenApiParameter(name="date_to", type=str, required=False),
+        ],
+        responses={200: StockMovementSerializer(many=True)},
+    )
+    def get(self, request):
+        params = StockMovementFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        date_to = filters.get("date_to") or timezone.localdate()
+        date_from = filters.get("date_from") or date_to - timedelta(days=29)
+
+        qs = StockMovement.scoped.select_related("product").filter(
+            created_at__date__gte=date_from,
+            created_at__date__lt=date_to + timedelta(days=1),
+        )
+
+        if "product_id" in filters:
+            qs = qs.filter(product_id=filters["product_id"])
+        if "kind" in filters:
+            qs = qs.filter(kind=filters["kind"])
+
+        serializer = StockMovementSerializer(qs.order_by("-created_at"), many=True)
+        return Response(serializer.data)
+
+
+# =========================================================
+# STOCK À UNE DATE (snapshot + journal)
+# =========================================================
+class StockOnDateView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, ColumnarListMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        summary="Stock à une date",
+        description=(
+            "Quantités en stock par produit à la fin de la journée demandée (aujourd'hui "
+            "par défaut), valorisées au coût d'achat des lots"
+        ),
+        parameters=[OpenApiParameter(name="date", type=str, required=False)],
+        responses={200: StockOnDateSerializer(many=True)},
+    )
+    def get(self, request):
+        params = StockOnDateQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        day = params.validated_data.get("date") or timezone.localdate()
+        rows = stock_on_date(request.user.pharmacy, day)
+
+        return Response(StockOnDateSerializer(rows, many=True).data)
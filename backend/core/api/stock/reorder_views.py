@@ -0,0 +1,70 @@
+# backend/core/api/stock/reorder_views.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from drf_spectacular.utils import extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    ColumnarListMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
+from core.services.reorder import create_reorder_drafts, reorder_suggestions
+
+from .serializers import ReorderDraftSerializer, ReorderSuggestionSerializer
+
+
+# =========================================================
+# SUGGESTIONS DE RÉAPPROVISIONNEMENT
+# =========================================================
+class ReorderSuggestionListView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, ColumnarListMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        responses={200: ReorderSuggestionSerializer(many=True)},
+        summary="Suggestions de réapprovisionnement",
+        description=(
+            "Quantités à commander par produit : demande prévue sur le délai "
+            "fournisseur + couverture, stock vendable avant expiration, "
+            "commandes en cours"
+        ),
+    )
+    def get(self, request):
+        suggestions = reorder_suggestions(request.user.pharmacy)
+
+        serializer = ReorderSuggestionSerializer([s.as_dict() for s in suggestions], many=True)
+        return Response(serializer.data)
+
+
+# =========================================================
+# BONS DE COMMANDE BROUILLONS (à la demande ; la nuit : generate_reorder_drafts)
+# =========================================================
+class ReorderDraftCreateView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=None,
+        responses={201: ReorderDraftSerializer(many=True)},
+        summary="Générer les bons de commande brouillons",
+        description="Un bon brouillon par fournisseur ; remplace les brouillons automatiques non validés",
+    )
+    def post(self, request):
+        pharmacy = request.user.pharmacy
+        entries = create_reorder_drafts(pharmacy, reorder_suggestions(pharmacy))
+
+        return Response(
+            ReorderDraftSerializer(entries, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
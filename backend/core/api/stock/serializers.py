@@ -1,5 +1,20 @@
 from rest_framework import serializers
-from core.models import StockEntry, StockEntryItem
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    PharmacyDataVersion,
+    ProductBatch,
+    StockCount,
+    StockEntry,
+    StockEntryItem,
+    StockMovement,
+    StockTransfer,
+    StockTransferLine,
+)
+from core.services.expiry_risk import refresh_after_commit
+from core.services.ledger import record_movements
 
 
 # =====================================================
@@ -20,11 +35,15 @@ class StockEntryCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context["request"]
 
-        return StockEntry.objects.create(
-            pharmacy=request.user.pharmacy,
-            status="draft",
-            **validated_data
-        )
+        with transaction.atomic():
+            entry = StockEntry.objects.create(
+                pharmacy=request.user.pharmacy,
+                status="draft",
+                **validated_data
+            )
+            PharmacyDataVersion.bump(entry.pharmacy_id)
+
+        return entry
 
 
 # =====================================================
@@ -64,13 +83,286 @@ class StockEntryDetailSerializer(serializers.ModelSerializer):
 # =====================================================
 # VALIDATION SERIALIZER
 # =====================================================
+class ReceivedItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    expiry_date = serializers.DateField()
+
+
 class StockEntryValidationSerializer(serializers.ModelSerializer):
+    # Péremptions inconnues à la commande, lues sur les boîtes à la réception
+    items = ReceivedItemSerializer(many=True, required=False)
 
     class Meta:
         model = StockEntry
-        fields = ["status"]
+        fields = ["status", "items"]
 
     def update(self, instance, validated_data):
-        instance.status = "validated"
-        instance.save(update_fields=["status"])
-        return instance
\ No newline at end of file
+        request = self.context["request"]
+        items = [item for item in instance.items.all() if item.quantity]
+
+        received = {line["id"]: line["expiry_date"] for line in validated_data.get("items", [])}
+        dated = [item for item in items if item.id in received]
+        for item in dated:
+            item.expiry_date = received[item.id]
+
+        if any(item.expiry_date is None for item in items):
+            raise serializers.ValidationError(
+                {"items": "Date de péremption à renseigner sur chaque ligne avant réception"}
+            )
+
+        received_at = timezone.now()
+
+        with transaction.atomic():
+            # Bascule conditionnelle : une validation concurrente ne recrée ni lots ni mouvements
+            flipped = StockEntry.objects.filter(pk=instance.pk, status="draft").update(status="validated")
+            if not flipped:
+                raise serializers.ValidationError({"detail": "Bon déjà validé"})
+            instance.status = "validated"
+
+            if dated:
+                StockEntryItem.objects.bulk_update(dated, ["expiry_date"])
+
+            # Réception : un lot par ligne (coût et péremption de la ligne) + journal
+            batches = ProductBatch.objects.bulk_create([
+                ProductBatch(
+                    pharmacy_id=instance.pharmacy_id,
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    purchase_price=item.purchase_price,
+                    expiry_date=item.expiry_date,
+                    created_at=received_at,
+                )
+                for item in items
+            ])
+            record_movements(
+                instance.pharmacy_id, "receipt",
+                [(batch.product_id, batch.id, batch.quantity, batch.purchase_price) for batch in batches],
+                reference=instance.id, user=request.user, created_at=received_at,
+            )
+
+            # Nouveaux lots re-projetés contre la prévision, après COMMIT (prévision en cache seulement)
+            product_ids = list({item.product_id for item in items})
+            transaction.on_commit(lambda: refresh_after_commit(instance.pharmacy_id, product_ids))
+            PharmacyDataVersion.bump(instance.pharmacy_id)
+
+        return instance
+
+# =====================================================
+# RÉAPPROVISIONNEMENT (core.services.reorder)
+# =====================================================
+class ReorderSuggestionSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    product_name = serializers.CharField()
+    supplier_id = serializers.UUIDField(allow_null=True)
+    lead_time_days = serializers.IntegerField()
+    stock = serializers.IntegerField()
+    usable_stock = serializers.IntegerField()
+    at_risk = serializers.IntegerField()
+    on_order = serializers.IntegerField()
+    demand = serializers.FloatField()
+    target = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    unit_cost = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class ReorderDraftSerializer(serializers.ModelSerializer):
+    lines = serializers.IntegerField()
+
+    class Meta:
+        model = StockEntry
+        fields = [
+            "id",
+            "supplier",
+            "invoice_number",
+            "total_amount",
+            "status",
+            "lines",
+        ]
+
+
+# =====================================================
+# MISE AU REBUT DES PÉRIMÉS (core.services.write_off)
+# =====================================================
+class WriteOffExpiredSerializer(serializers.Serializer):
+    # Absent : tous les lots expirés encore en stock
+    batch_ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+
+
+class WriteOffResultSerializer(serializers.Serializer):
+    batches = serializers.IntegerField()
+    units = serializers.IntegerField()
+    value = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class WriteOffPeriodSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+
+class WriteOffReportSerializer(serializers.Serializer):
+    period = serializers.DictField()
+    total = serializers.DictField()
+    by_reason = serializers.ListField(child=serializers.DictField())
+    monthly = serializers.ListField(child=serializers.DictField())
+    products = serializers.ListField(child=serializers.DictField())
+
+
+# =====================================================
+# JOURNAL DES MOUVEMENTS (core.services.ledger)
+# =====================================================
+class StockMovementSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source="product.name", read_only=True)
+
+    class Meta:
+        model = StockMovement
+        fields = [
+            "id",
+            "product",
+            "product_name",
+            "batch",
+            "kind",
+            "quantity",
+            "unit_cost",
+            "reference",
+            "created_at",
+        ]
+
+
+class StockMovementFilterSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField(required=False)
+    kind = serializers.ChoiceField(choices=StockMovement.KIND_CHOICES, required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+
+class StockOnDateQuerySerializer(serializers.Serializer):
+    date = serializers.DateField(required=False)
+
+
+class StockOnDateSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    product_name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    value = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+# =====================================================
+# INVENTAIRE PHYSIQUE (core.services.stock_count)
+# =====================================================
+class StockCountCreateSerializer(serializers.Serializer):
+    full = serializers.BooleanField(default=False)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+
+
+class StockCountListSerializer(serializers.ModelSerializer):
+    lines = serializers.IntegerField(source="line_count", read_only=True)
+
+    class Meta:
+        model = StockCount
+        fields = [
+            "id",
+            "status",
+            "full",
+            "note",
+            "lines",
+            "created_at",
+            "posted_at",
+        ]
+
+
+class CountedLineSerializer(serializers.Serializer):
+    batch_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=0)
+
+
+class StockCountLinesSerializer(serializers.Serializer):
+    lines = CountedLineSerializer(many=True, allow_empty=False, max_length=settings.STOCK_COUNT_CHUNK_SIZE)
+
+
+class StockCountLinesResultSerializer(serializers.Serializer):
+    received = serializers.IntegerField()
+    unknown = serializers.ListField(child=serializers.UUIDField())
+
+
+class StockCountReportSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.CharField()
+    full = serializers.BooleanField()
+    note = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    posted_at = serializers.DateTimeField(allow_null=True)
+    totals = serializers.DictField()
+    uncounted = serializers.DictField()
+    variances = serializers.ListField(child=serializers.DictField())
+
+
+class StockCountPostResultSerializer(serializers.Serializer):
+    batches = serializers.IntegerField()
+    units_gained = serializers.IntegerField()
+    units_lost = serializers.IntegerField()
+    value = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+# =====================================================
+# TRANSFERTS INTER-PHARMACIES (core.services.transfer)
+# =====================================================
+class TransferLineInputSerializer(serializers.Serializer):
+    batch_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class StockTransferCreateSerializer(serializers.Serializer):
+    destination = serializers.UUIDField()
+    lines = TransferLineInputSerializer(many=True, allow_empty=False, max_length=settings.TRANSFER_MAX_LINES)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+
+
+class StockTransferReplenishSerializer(serializers.Serializer):
+    destination = serializers.UUIDField()
+
+
+class StockTransferLineSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source="product.name", read_only=True)
+
+    class Meta:
+        model = StockTransferLine
+        fields = [
+            "id",
+            "product",
+            "product_name",
+            "source_batch",
+            "destination_product",
+            "destination_batch",
+            "quantity",
+            "unit_cost",
+            "expiry_date",
+        ]
+
+
+class StockTransferListSerializer(serializers.ModelSerializer):
+    source = serializers.UUIDField(source="pharmacy_id", read_only=True)
+    source_name = serializers.CharField(source="pharmacy.name", read_only=True)
+    destination_name = serializers.CharField(source="destination.name", read_only=True, default=None)
+
+    class Meta:
+        model = StockTransfer
+        fields = [
+            "id",
+            "source",
+            "source_name",
+            "destination",
+            "destination_name",
+            "mode",
+            "lines_count",
+            "quantity",
+            "value",
+            "note",
+            "created_at",
+        ]
+
+
+class StockTransferDetailSerializer(StockTransferListSerializer):
+    lines = StockTransferLineSerializer(many=True, read_only=True)
+
+    class Meta(StockTransferListSerializer.Meta):
+        fields = StockTransferListSerializer.Meta.fields + ["lines"]
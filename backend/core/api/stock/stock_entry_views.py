@@ -7,6 +7,7 @@ from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 
 from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin
 from core.models import StockEntry
 
 from .serializers import (
@@ -20,7 +21,7 @@ from .serializers import (
 # =========================================================
 # CREATE STOCK ENTRY (Draft)
 # =========================================================
-class StockEntryCreateView(APIView):
+class StockEntryCreateView(TenantScopedMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive,
@@ -50,7 +51,7 @@ class StockEntryCreateView(APIView):
 # =========================================================
 # LIST STOCK ENTRIES
 # =========================================================
-class StockEntryListView(APIView):
+class StockEntryListView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive,
@@ -63,11 +64,8 @@ class StockEntryListView(APIView):
         description="Retourne tous les bons d’entrée de la pharmacie"
     )
     def get(self, request):
-        pharmacy = request.user.pharmacy
-
         entries = (
-            StockEntry.objects
-            .filter(pharmacy=pharmacy)
+            StockEntry.scoped
             .select_related("supplier")
             .order_by("-created_at")
         )
@@ -79,7 +77,7 @@ class StockEntryListView(APIView):
 # =========================================================
 # DETAIL STOCK ENTRY
 # =========================================================
-class StockEntryDetailView(APIView):
+class StockEntryDetailView(TenantScopedMixin, ConditionalGetMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive,
@@ -91,13 +89,7 @@ class StockEntryDetailView(APIView):
         summary="Détail d’un bon d’entrée",
     )
     def get(self, request, pk):
-        pharmacy = request.user.pharmacy
-
-        entry = get_object_or_404(
-            StockEntry,
-            id=pk,
-            pharmacy=pharmacy
-        )
+        entry = get_object_or_404(StockEntry.scoped, id=pk)
 
         serializer = StockEntryDetailSerializer(entry)
         return Response(serializer.data)
@@ -106,7 +98,7 @@ class StockEntryDetailView(APIView):
 # =========================================================
 # VALIDATE STOCK ENTRY (STEP 2 WORKFLOW)
 # =========================================================
-class StockEntryValidateView(APIView):
+class StockEntryValidateView(TenantScopedMixin, APIView):
     permission_classes = [
         permissions.IsAuthenticated,
         IsSubscriptionActive,
@@ -117,16 +109,13 @@ class StockEntryValidateView(APIView):
         request=StockEntryValidationSerializer,
         responses={200: StockEntryDetailSerializer},
         summary="Valider un bon d’entrée",
-        description="Validation officielle → création des lots ProductBatch"
+        description=(
+            "Validation officielle → création des lots ProductBatch (coût et péremption "
+            "des lignes) et mouvements de réception ; péremptions manquantes à fournir"
+        )
     )
     def post(self, request, pk):
-        pharmacy = request.user.pharmacy
-
-        entry = get_object_or_404(
-            StockEntry,
-            id=pk,
-            pharmacy=pharmacy
-        )
+        entry = get_object_or_404(StockEntry.scoped, id=pk)
 
         if entry.status == "validated":
             return Response(
@@ -0,0 +1,151 @@
+# backend/core/api/stock/transfer_views.py
+
+from django.db.models import Prefetch, Q
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from drf_spectacular.utils import extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin
+from core.models import StockTransfer, StockTransferLine
+from core.services.transfer import network_destination, replenish_branch, transfer_stock
+
+from .serializers import (
+    StockTransferCreateSerializer,
+    StockTransferDetailSerializer,
+    StockTransferListSerializer,
+    StockTransferReplenishSerializer,
+)
+
+
+def visible_transfers(pharmacy):
+    # Envoyés (tenant source) et reçus : les reçus appartiennent à la source
+    return StockTransfer.objects.filter(Q(pharmacy=pharmacy) | Q(destination=pharmacy))
+
+
+def with_lines(transfers):
+    return (
+        transfers
+        .select_related("pharmacy", "destination")
+        .prefetch_related(Prefetch("lines", StockTransferLine.objects.select_related("product")))
+    )
+
+
+# =========================================================
+# TRANSFERT MANUEL (lots choisis)
+# =========================================================
+class StockTransferCreateView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=StockTransferCreateSerializer,
+        responses={201: StockTransferDetailSerializer},
+        summary="Transférer du stock vers une pharmacie du réseau",
+        description=(
+            "Lots source -> nouveaux lots destination (coût et péremption conservés), "
+            "en une transaction ; produits absents créés dans la destination"
+        ),
+    )
+    def post(self, request):
+        serializer = StockTransferCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        source = request.user.pharmacy
+        destination = network_destination(source, data["destination"])
+
+        transfer = transfer_stock(
+            source,
+            destination,
+            [(line["batch_id"], line["quantity"]) for line in data["lines"]],
+            user=request.user,
+            note=data["note"],
+        )
+
+        return Response(
+            StockTransferDetailSerializer(with_lines(StockTransfer.objects).get(pk=transfer.pk)).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+# =========================================================
+# RÉAPPROVISIONNEMENT DÉPÔT -> SUCCURSALE (stock bas)
+# =========================================================
+class StockTransferReplenishView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=StockTransferReplenishSerializer,
+        responses={201: StockTransferDetailSerializer, 204: None},
+        summary="Réapprovisionner une succursale",
+        description=(
+            "Produits en stock bas de la succursale remontés à TRANSFER_REPLENISH_TARGET_FACTOR "
+            "× seuil minimum depuis les lots du siège / dépôt (FEFO) ; 204 si rien à envoyer"
+        ),
+    )
+    def post(self, request):
+        serializer = StockTransferReplenishSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        source = request.user.pharmacy
+        destination = network_destination(source, serializer.validated_data["destination"])
+
+        transfer = replenish_branch(source, destination, user=request.user)
+        if transfer is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        return Response(
+            StockTransferDetailSerializer(with_lines(StockTransfer.objects).get(pk=transfer.pk)).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+# =========================================================
+# LISTE / DÉTAIL
+# =========================================================
+class StockTransferListView(TenantScopedMixin, ConditionalGetMixin, ColumnarListMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        responses={200: StockTransferListSerializer(many=True)},
+        summary="Transferts envoyés et reçus",
+    )
+    def get(self, request):
+        transfers = (
+            visible_transfers(request.user.pharmacy)
+            .select_related("pharmacy", "destination")
+            .order_by("-created_at")
+        )
+
+        return Response(StockTransferListSerializer(transfers, many=True).data)
+
+
+class StockTransferDetailView(TenantScopedMixin, ConditionalGetMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        responses={200: StockTransferDetailSerializer},
+        summary="Détail d'un transfert",
+    )
+    def get(self, request, pk):
+        transfer = get_object_or_404(with_lines(visible_transfers(request.user.pharmacy)), id=pk)
+
+        return Response(StockTransferDetailSerializer(transfer).data)
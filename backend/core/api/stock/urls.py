@@ -8,10 +8,43 @@ from .stock_entry_views import (
     StockEntryDetailView,
     StockEntryValidateView,
 )
+from .reorder_views import ReorderDraftCreateView, ReorderSuggestionListView
+from .write_off_views import WriteOffExpiredView, WriteOffReportView
+from .ledger_views import StockMovementListView, StockOnDateView
+from .count_views import (
+    StockCountCancelView,
+    StockCountCreateView,
+    StockCountDetailView,
+    StockCountLinesView,
+    StockCountListView,
+    StockCountPostView,
+)
+from .transfer_views import (
+    StockTransferCreateView,
+    StockTransferDetailView,
+    StockTransferListView,
+    StockTransferReplenishView,
+)
 
 urlpatterns = [
     path("create/", StockEntryCreateView.as_view(), name="stock-entry-create"),
     path("", StockEntryListView.as_view(), name="stock-entry-list"),
     path("<uuid:pk>/", StockEntryDetailView.as_view(), name="stock-entry-detail"),
     path("<uuid:pk>/validate/", StockEntryValidateView.as_view(), name="stock-entry-validate"),
+    path("reorder/", ReorderSuggestionListView.as_view(), name="stock-reorder"),
+    path("reorder/drafts/", ReorderDraftCreateView.as_view(), name="stock-reorder-drafts"),
+    path("write-offs/", WriteOffReportView.as_view(), name="stock-write-offs"),
+    path("write-offs/expired/", WriteOffExpiredView.as_view(), name="stock-write-off-expired"),
+    path("movements/", StockMovementListView.as_view(), name="stock-movements"),
+    path("on-date/", StockOnDateView.as_view(), name="stock-on-date"),
+    path("counts/", StockCountListView.as_view(), name="stock-count-list"),
+    path("counts/create/", StockCountCreateView.as_view(), name="stock-count-create"),
+    path("counts/<uuid:pk>/", StockCountDetailView.as_view(), name="stock-count-detail"),
+    path("counts/<uuid:pk>/lines/", StockCountLinesView.as_view(), name="stock-count-lines"),
+    path("counts/<uuid:pk>/post/", StockCountPostView.as_view(), name="stock-count-post"),
+    path("counts/<uuid:pk>/cancel/", StockCountCancelView.as_view(), name="stock-count-cancel"),
+    path("transfers/", StockTransferListView.as_view(), name="stock-transfer-list"),
+    path("transfers/create/", StockTransferCreateView.as_view(), name="stock-transfer-create"),
+    path("transfers/replenish/", StockTransferReplenishView.as_view(), name="stock-transfer-replenish"),
+    path("transfers/<uuid:pk>/", StockTransferDetailView.as_view(), name="stock-transfer-detail"),
 ]
\ No newline at end of file
@@ -0,0 +1,85 @@
+# backend/core/api/stock/write_off_views.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from core.permissions import IsAdminOrGerant, IsSubscriptionActive
+from core.api.mixins import (
+    TenantScopedMixin,
+    ConditionalGetMixin,
+    StatementTimeoutMixin,
+    ReplicaReadMixin,
+)
+from core.api.concurrency import run_queries
+from core.services.write_off import (
+    build_write_off_report,
+    write_off_expired,
+    write_off_period,
+    write_off_queries,
+)
+
+from .serializers import (
+    WriteOffExpiredSerializer,
+    WriteOffPeriodSerializer,
+    WriteOffReportSerializer,
+    WriteOffResultSerializer,
+)
+
+
+# =========================================================
+# MISE AU REBUT DES PÉRIMÉS (à la demande ; la nuit : write_off_expired)
+# =========================================================
+class WriteOffExpiredView(TenantScopedMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        request=WriteOffExpiredSerializer,
+        responses={200: WriteOffResultSerializer},
+        summary="Mettre au rebut les lots périmés",
+        description="Solde les lots expirés encore en stock (tous ou ceux listés) et trace chaque perte",
+    )
+    def post(self, request):
+        serializer = WriteOffExpiredSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = write_off_expired(
+            request.user.pharmacy,
+            user=request.user,
+            batch_ids=serializer.validated_data.get("batch_ids"),
+        )
+
+        return Response(WriteOffResultSerializer(result).data, status=status.HTTP_200_OK)
+
+
+# =========================================================
+# RAPPORT DES PERTES (rebut, casse, inventaire)
+# =========================================================
+class WriteOffReportView(TenantScopedMixin, ConditionalGetMixin, StatementTimeoutMixin, ReplicaReadMixin, APIView):
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsSubscriptionActive,
+        IsAdminOrGerant
+    ]
+
+    @extend_schema(
+        summary="Pertes de stock valorisées",
+        description="Sorties de stock par motif, par mois et par produit (90 derniers jours par défaut)",
+        parameters=[
+            OpenApiParameter(name="date_from", type=str, required=False),
+            OpenApiParameter(name="date_to", type=str, required=False),
+        ],
+        responses={200: WriteOffReportSerializer},
+    )
+    def get(self, request):
+        params = WriteOffPeriodSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        date_from, date_to = write_off_period(**params.validated_data)
+
+        results = run_queries(write_off_queries(date_from, date_to))
+        return Response(build_write_off_report(date_from, date_to, results))
@@ -19,6 +19,9 @@ urlpatterns = [
     # ================= FINANCE =================
     path("finance/", include("core.api.finance.urls")),
 
+    # ================= DASHBOARD (COMPOSITE) =================
+    path("dashboard/", include("core.api.dashboard.urls")),
+
     # ================= INTELLIGENCE =================
     path("intelligence/", include("core.api.intelligence.urls")),
 
@@ -0,0 +1,153 @@
+import gzip
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : gzip seul
+    brotli = None
+
+
+# Types compressés : données de l'API uniquement. Les pages HTML (admin,
+# API navigable) portent un jeton CSRF et restent en clair (BREACH).
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/vnd.ngrpharma.columnar+json",
+    "text/csv",
+    "application/vnd.oai.openapi",
+)
+
+_accept_encoding_re = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+# ======================================================
+# NÉGOCIATION
+# ======================================================
+
+def accepted_encodings(header):
+    """Accept-Encoding -> {codage: q} (q=0 : refusé explicitement)."""
+    encodings = {}
+
+    for part in header.split(","):
+        match = _accept_encoding_re.fullmatch(part)
+        if not match:
+            continue
+
+        try:
+            q = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+
+        encodings[match.group(1).lower()] = q
+
+    return encodings
+
+
+def choose_encoding(header):
+    """
+    Meilleur codage disponible pour ce client : br (si le module brotli
+    est installé) puis gzip, à q égal. None -> réponse en clair.
+    """
+    encodings = accepted_encodings(header or "")
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    candidates = [
+        (encodings.get(name, encodings.get("*", 0)), -rank, name)
+        for rank, name in enumerate(available)
+    ]
+    q, _, name = max(candidates)
+
+    return name if q > 0 else None
+
+
+def compress(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    # mtime=0 : même contenu -> mêmes octets
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class CompressionMiddleware:
+    """
+    Compresse les réponses JSON / CSV (brotli ou gzip selon Accept-Encoding) :
+    sur les liaisons satellite / mobile des pharmacies le transfert domine
+    le temps de réponse des grandes listes.
+    À placer juste après RequestMetricsMiddleware (octets mesurés = octets
+    envoyés). Réponses streaming, déjà codées ou sous COMPRESSION_MIN_BYTES
+    inchangées. Sous ASGI la compression tourne hors de la boucle d'événements.
+    Désactivable (RESPONSE_COMPRESSION=false) quand le reverse proxy compresse.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.RESPONSE_COMPRESSION:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        encoding = self.negotiate(request, response)
+
+        if encoding:
+            self.compress_response(response, encoding)
+
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        encoding = self.negotiate(request, response)
+
+        if encoding:
+            await sync_to_async(self.compress_response, thread_sensitive=False)(response, encoding)
+
+        return response
+
+    def negotiate(self, request, response):
+        """Codage à appliquer à cette réponse, ou None."""
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION_MIN_BYTES
+            or not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+            or "no-transform" in response.get("Cache-Control", "")
+        ):
+            return None
+
+        # Caches partagés : la représentation dépend de Accept-Encoding
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        return choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+
+    def compress_response(self, response, encoding):
+        compressed = compress(response.content, encoding)
+
+        if len(compressed) >= len(response.content):
+            return
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # Comme GZipMiddleware : les octets changent, l'ETag devient faible
+        # (If-None-Match compare en faible : les 304 restent valables)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
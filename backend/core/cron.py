@@ -0,0 +1,115 @@
+"""
+Expressions cron à 5 champs (minute heure jour mois jour-de-semaine) pour
+le planificateur (core.services.scheduler) : `*`, `*/n`, `a`, `a-b`,
+`a-b/n`, listes `a,b`. Jour de semaine 0-7 (0 et 7 = dimanche). Jour du
+mois et jour de semaine tous deux restreints : l'un OU l'autre (cron Vixie).
+Évaluées dans le fuseau de l'application (TIME_ZONE).
+"""
+
+from datetime import datetime, timedelta
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+
+# (min, max) par champ
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+# Au-delà : expression impossible (ex. 31 février)
+MAX_SEARCH_DAYS = 366 * 5
+
+
+def parse_field(text, low, high):
+    values = set()
+
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/", 1)
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"pas invalide : {step}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = int(part)
+            # "a/n" : de a jusqu'au maximum
+            end = high if step > 1 else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"{part} hors de [{low}, {high}]")
+
+        values.update(range(start, end + 1, step))
+
+    return values
+
+
+class CronSchedule:
+
+    def __init__(self, expression):
+        parts = expression.split()
+
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Expression cron invalide : {expression!r} (5 champs attendus)")
+
+        try:
+            fields = [parse_field(text, low, high) for text, (_, low, high) in zip(parts, FIELDS)]
+        except ValueError as exc:
+            raise ValueError(f"Expression cron invalide : {expression!r} ({exc})") from None
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (sorted(f) for f in fields)
+        # 7 = dimanche = 0 ; stockés au format Python (lundi = 0)
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+    def matches_day(self, day):
+        if day.month not in self.months:
+            return False
+
+        in_days = day.day in self.days
+        in_weekdays = day.weekday() in self.weekdays
+
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment):
+        """Premier déclenchement strictement après `moment` (datetime aware)."""
+        local = timezone.localtime(moment).replace(second=0, microsecond=0, tzinfo=None)
+        start = local + timedelta(minutes=1)
+
+        for offset in range(MAX_SEARCH_DAYS):
+            day = start.date() + timedelta(days=offset)
+
+            if not self.matches_day(day):
+                continue
+
+            for hour in self.hours:
+                for minute in self.minutes:
+                    candidate = datetime(day.year, day.month, day.day, hour, minute)
+                    if candidate >= start:
+                        return timezone.make_aware(candidate)
+
+        raise ValueError(f"Aucune occurrence pour {self.expression!r}")
+
+
+def validate_cron(expression):
+    """Validateur de champ modèle."""
+    try:
+        CronSchedule(expression)
+    except ValueError as exc:
+        raise ValidationError(str(exc))
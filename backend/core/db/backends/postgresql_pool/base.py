@@ -0,0 +1,113 @@
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+from django.db.backends.utils import NO_DB_ALIAS
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # dépendance optionnelle
+    ConnectionPool = None
+
+
+# Un pool par (alias, base) et par process : partagé entre les threads
+# du worker, la base change en tests (test_<NAME>).
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Backend PostgreSQL (psycopg 3) adossé à psycopg_pool.ConnectionPool.
+
+    ENGINE = "core.db.backends.postgresql_pool" ; réglages du pool dans
+    DATABASES[alias]["POOL"] (min_size, max_size, timeout, max_idle,
+    max_lifetime). Django « ferme » la connexion en fin de requête :
+    elle retourne au pool au lieu d'être détruite.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if not is_psycopg3 or ConnectionPool is None:
+            raise ImproperlyConfigured(
+                "core.db.backends.postgresql_pool requires psycopg 3 and psycopg-pool "
+                "(pip install 'psycopg[pool]')"
+            )
+
+        if self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured(
+                "Pooling and persistent connections are mutually exclusive: "
+                "set CONN_MAX_AGE to 0 when using the pool backend"
+            )
+
+    @property
+    def pool(self):
+        key = (self.alias, self.settings_dict["NAME"])
+        pool = _pools.get(key)
+
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(key)
+
+                if pool is None:
+                    options = self.settings_dict.get("POOL", {})
+
+                    pool = ConnectionPool(
+                        kwargs=self.get_connection_params(),
+                        min_size=options.get("min_size", 2),
+                        max_size=options.get("max_size", 10),
+                        timeout=options.get("timeout", 10),
+                        max_idle=options.get("max_idle", 600),
+                        max_lifetime=options.get("max_lifetime", 3600),
+                        # Connexion vérifiée (SELECT 1) avant d'être prêtée (psycopg_pool >= 3.2)
+                        check=getattr(ConnectionPool, "check_connection", None),
+                        name=f"django-{self.alias}",
+                        open=True,
+                    )
+                    _pools[key] = pool
+
+        return pool
+
+    def get_new_connection(self, conn_params):
+        # Connexions « sans base » (création de la base de test...) : hors pool
+        if self.alias == NO_DB_ALIAS:
+            return super().get_new_connection(conn_params)
+
+        options = self.settings_dict["OPTIONS"]
+        isolation_level = options.get("isolation_level")
+
+        try:
+            self.isolation_level = IsolationLevel(
+                isolation_level if isolation_level is not None else IsolationLevel.READ_COMMITTED
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {isolation_level} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+
+        connection = self.pool.getconn()
+
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.alias == NO_DB_ALIAS:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            # Le pool annule une transaction en cours et écarte les connexions cassées
+            self.pool.putconn(self.connection)
+            self.connection = None
+
+
+def close_pools():
+    """Ferme les pools du process (fin de worker, tests)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Alias de lecture de la requête / du job en cours (None = routage par défaut)
+_read_alias = ContextVar("read_alias", default=None)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def get_read_alias():
+    return _read_alias.get()
+
+
+def replica_alias():
+    """Alias du réplica configuré (settings.REPLICA_DATABASE_ALIAS) ou None."""
+    alias = getattr(settings, "REPLICA_DATABASE_ALIAS", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+# ======================================================
+# READ-YOUR-WRITES
+# ======================================================
+
+def _pin_key(user_id):
+    return f"db:primary_pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """
+    Après une écriture : les lectures de cet utilisateur restent sur le
+    primaire pendant REPLICA_PIN_SECONDS (retard de réplication max).
+    """
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return (
+        user is not None
+        and user.is_authenticated
+        and bool(cache.get(_pin_key(user.pk)))
+    )
+
+
+# ======================================================
+# ACTIVATION
+# ======================================================
+
+def activate_replica_reads(request):
+    """
+    Route les lectures ORM vers le réplica pour cette requête si :
+    réplica configuré, méthode sûre, et pas d'écriture récente du
+    demandeur. Retourne le token à passer à deactivate_replica_reads
+    (None si rien n'a été activé).
+    """
+    alias = replica_alias()
+
+    if (
+        alias is None
+        or request.method not in SAFE_METHODS
+        or is_pinned_to_primary(getattr(request, "user", None))
+    ):
+        return None
+
+    return _read_alias.set(alias)
+
+
+def deactivate_replica_reads(token):
+    if token is not None:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def read_from(alias):
+    """
+    with read_from("replica"):
+        Sale.objects.aggregate(...)   # jobs / commandes de reporting
+    """
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class ReadYourWritesMiddleware:
+    """
+    Toute écriture réussie (POST/PUT/PATCH/DELETE < 400) épingle son
+    auteur au primaire : ses prochains rapports voient ses propres ventes.
+    À placer après l'authentification (DRF repousse l'utilisateur JWT
+    sur la HttpRequest Django).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+
+        if self.is_successful_write(request, response):
+            pin_to_primary(getattr(request, "user", None))
+
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+
+        if self.is_successful_write(request, response):
+            # Cache (Redis) bloquant : hors de la boucle d'événements
+            await sync_to_async(pin_to_primary)(getattr(request, "user", None))
+
+        return response
+
+    def is_successful_write(self, request, response):
+        return (
+            replica_alias() is not None
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
@@ -0,0 +1,24 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from .replica import get_read_alias, replica_alias
+
+
+class ReplicaRouter:
+    """
+    Lectures : alias actif (ReplicaReadMixin / @replica_reads / read_from),
+    sinon routage par défaut. Écritures : toujours le primaire, y compris
+    pour un objet lu sur le réplica.
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Même données des deux côtés : relations primaire <-> réplica autorisées
+        databases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,45 @@
+from django.db import OperationalError, connections
+
+
+# SQLSTATE query_canceled (statement_timeout / pg_cancel_backend)
+QUERY_CANCELED = "57014"
+
+
+def set_statement_timeout(milliseconds, using="default"):
+    """
+    Plafonne la durée de chaque requête SQL de la session (PostgreSQL).
+    Retourne True si le réglage a été posé (à annuler avec
+    reset_statement_timeout : la connexion est réutilisée ensuite).
+    """
+    connection = connections[using]
+
+    if not milliseconds or connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('statement_timeout', %s, false)", [f"{int(milliseconds)}ms"])
+
+    return True
+
+
+def reset_statement_timeout(using="default"):
+    """Revient au statement_timeout de la connexion (OPTIONS / rôle / serveur)."""
+    connection = connections[using]
+
+    if connection.connection is None:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("RESET statement_timeout")
+
+
+def is_statement_timeout(exc):
+    if not isinstance(exc, OperationalError):
+        return False
+
+    cause = exc.__cause__
+    # psycopg 3 : sqlstate ; psycopg2 : pgcode
+    return QUERY_CANCELED in (
+        getattr(cause, "sqlstate", None),
+        getattr(cause, "pgcode", None),
+    )
@@ -0,0 +1,385 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger("core.perf")
+
+
+# ======================================================
+# REGISTRY (process -> cache partagé)
+# ======================================================
+
+def cache_is_shared():
+    """
+    Cache commun à tous les workers (Redis via REDIS_URL, Memcached, base) :
+    LocMem / Dummy restent propres au process, l'agrégation s'y limite.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """`manage.py check --deploy` : métriques agrégées sur un cache local au process."""
+    if cache_is_shared():
+        return []
+
+    return [checks.Warning(
+        "Le cache par défaut est local au process : /api/admin/metrics/ ne couvre "
+        "que le worker qui répond.",
+        hint="Définir REDIS_URL (ou un autre cache partagé) dès plusieurs workers.",
+        id="core.W001",
+    )]
+
+
+def empty_totals():
+    return {
+        "requests": 0,
+        "queries": 0,
+        "db_ms": 0.0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "max_queries": 0,
+        "bytes": 0,
+        "slow": 0,
+    }
+
+
+class RequestMetricsRegistry:
+    """
+    Garde les N dernières requêtes + des totaux cumulés par (route, pharmacie).
+    Chaque process (worker gunicorn / uvicorn) publie son état dans le cache
+    partagé, sous sa propre clé, au plus toutes les REQUEST_METRICS_FLUSH_SECONDS :
+    summary() agrège tous les workers, y compris ceux recyclés (max_requests)
+    tant que leur clé n'a pas expiré (REQUEST_METRICS_TTL). Suppose un cache
+    partagé (REDIS_URL) : en LocMem, chaque worker ne voit que lui-même
+    ("scope": "process" dans summary()).
+    Clés rangées sous une "époque" (horodatage du dernier reset) : un reset
+    change d'époque, chaque worker repart de zéro à sa publication suivante.
+    """
+
+    KEY = "request_metrics"
+
+    def __init__(self, buffer_size):
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=buffer_size)
+        self.totals = defaultdict(empty_totals)
+        self.epoch = None
+        self.slot = None
+        self.flushed_at = 0.0
+
+    def record(self, record):
+        with self.lock:
+            self.recent.append(record)
+
+            totals = self.totals[(record["route"], record["pharmacy_id"])]
+            totals["requests"] += 1
+            totals["queries"] += record["queries"]
+            totals["db_ms"] += record["db_ms"]
+            totals["total_ms"] += record["total_ms"]
+            totals["max_ms"] = max(totals["max_ms"], record["total_ms"])
+            totals["max_queries"] = max(totals["max_queries"], record["queries"])
+            totals["bytes"] += record["bytes"]
+            totals["slow"] += int(record["slow"])
+
+            due = time.time() - self.flushed_at >= settings.REQUEST_METRICS_FLUSH_SECONDS
+            if due:
+                self.flushed_at = time.time()
+
+        if due:
+            self.flush()
+
+    # ---------- cache partagé ----------
+
+    def current_epoch(self):
+        cache.add(f"{self.KEY}:epoch", time.time(), None)
+        return cache.get(f"{self.KEY}:epoch")
+
+    def flush(self):
+        """Publie l'état du process ; erreur de cache loggée, jamais remontée à la requête."""
+        try:
+            epoch = self.current_epoch()
+
+            with self.lock:
+                if epoch != self.epoch:
+                    if self.epoch is not None:
+                        # Reset demandé par un autre worker
+                        self.recent.clear()
+                        self.totals.clear()
+                    self.epoch, self.slot = epoch, None
+
+                state = {
+                    "recent": list(self.recent),
+                    "totals": {key: dict(value) for key, value in self.totals.items()},
+                }
+                slot = self.slot
+
+            if slot is None:
+                workers = f"{self.KEY}:{epoch}:workers"
+                cache.add(workers, 0, None)
+                slot = cache.incr(workers)
+                with self.lock:
+                    self.slot = slot
+
+            cache.set(f"{self.KEY}:{epoch}:worker:{slot}", state, settings.REQUEST_METRICS_TTL)
+        except Exception:
+            logger.warning("Request metrics: publication dans le cache impossible", exc_info=True)
+
+    def shared_states(self, epoch):
+        workers = cache.get(f"{self.KEY}:{epoch}:workers") or 0
+        keys = [f"{self.KEY}:{epoch}:worker:{slot}" for slot in range(1, workers + 1)]
+        return list(cache.get_many(keys).values())
+
+    # ---------- lecture ----------
+
+    def summary(self, pharmacy_id=None):
+        self.flush()
+
+        epoch = self.current_epoch()
+        states = self.shared_states(epoch)
+
+        totals = defaultdict(empty_totals)
+        recent = []
+
+        for state in states:
+            for (route, pharmacy), t in state["totals"].items():
+                if pharmacy_id and pharmacy != pharmacy_id:
+                    continue
+
+                merged = totals[route]
+                for field in ("requests", "queries", "db_ms", "total_ms", "bytes", "slow"):
+                    merged[field] += t[field]
+                merged["max_ms"] = max(merged["max_ms"], t["max_ms"])
+                merged["max_queries"] = max(merged["max_queries"], t["max_queries"])
+
+            recent.extend(
+                r for r in state["recent"]
+                if not pharmacy_id or r["pharmacy_id"] == pharmacy_id
+            )
+
+        recent.sort(key=lambda r: r["at"])
+
+        routes = []
+
+        for route, t in totals.items():
+            n = t["requests"]
+            durations = sorted(r["total_ms"] for r in recent if r["route"] == route)
+
+            routes.append({
+                "route": route,
+                "requests": n,
+                "avg_ms": round(t["total_ms"] / n, 2),
+                "avg_db_ms": round(t["db_ms"] / n, 2),
+                "avg_queries": round(t["queries"] / n, 2),
+                "max_queries": t["max_queries"],
+                "max_ms": round(t["max_ms"], 2),
+                "p95_ms": (
+                    round(durations[int(0.95 * (len(durations) - 1))], 2)
+                    if durations else None
+                ),
+                "avg_bytes": int(t["bytes"] / n),
+                "slow": t["slow"],
+            })
+
+        routes.sort(key=lambda r: r["avg_ms"] * r["requests"], reverse=True)
+
+        return {
+            "since": epoch,
+            "scope": "workers" if cache_is_shared() else "process",
+            "workers": len(states),
+            "slow_threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+            "routes": routes,
+            "recent": recent[-50:],
+        }
+
+    def reset(self):
+        # Nouvelle époque : les clés de l'ancienne expirent d'elles-mêmes
+        cache.set(f"{self.KEY}:epoch", time.time(), None)
+
+        with self.lock:
+            self.recent.clear()
+            self.totals.clear()
+            self.epoch, self.slot = None, None
+
+
+registry = RequestMetricsRegistry(settings.REQUEST_METRICS_BUFFER_SIZE)
+
+
+# ======================================================
+# QUERY CAPTURE
+# ======================================================
+
+class QueryRecorder:
+    """
+    execute_wrapper : compte les requêtes SQL et leur durée
+    (fonctionne aussi avec DEBUG=False, contrairement à connection.queries).
+    """
+
+    MAX_STATEMENTS = 200
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+
+            # Plusieurs threads possibles (requêtes parallèles des vues async)
+            with self.lock:
+                self.count += 1
+                self.duration += elapsed
+
+                if len(self.statements) < self.MAX_STATEMENTS:
+                    self.statements.append((elapsed, sql))
+
+
+# Recorder de la requête HTTP en cours. Porté par les contextvars, il suit
+# la requête dans les threads (vue sync servie en ASGI, sync_to_async,
+# pool de core.api.concurrency) là où un execute_wrapper posé sur la
+# connexion du thread appelant ne verrait rien.
+_active_recorder = ContextVar("active_query_recorder", default=None)
+
+
+def forward_to_active_recorder(execute, sql, params, many, context):
+    recorder = _active_recorder.get()
+
+    if recorder is None:
+        return execute(sql, params, many, context)
+
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_forwarding(sender, connection, **kwargs):
+    """
+    connection_created (branché dans CoreConfig.ready) : toute connexion,
+    quel que soit son thread, remonte ses requêtes au recorder actif.
+    En tête de liste : connection.execute_wrapper() retire le dernier.
+    """
+    if forward_to_active_recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, forward_to_active_recorder)
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class RequestMetricsMiddleware:
+    """
+    Mesure par requête : nb de requêtes SQL, temps DB, temps total,
+    taille de réponse. Tag : route (url_name) + pharmacie.
+    Ajoute l'en-tête Server-Timing et logge les requêtes lentes avec leur SQL.
+    Sync et async : sous ASGI la chaîne reste async jusqu'aux vues async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        token = _active_recorder.set(recorder)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _active_recorder.reset(token)
+
+        return self.process_metrics(request, response, recorder, start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        token = _active_recorder.set(recorder)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _active_recorder.reset(token)
+
+        return self.process_metrics(request, response, recorder, start)
+
+    def process_metrics(self, request, response, recorder, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+
+        match = getattr(request, "resolver_match", None)
+        route = (match.view_name if match else None) or request.path_info
+
+        # DRF repousse l'utilisateur JWT sur la HttpRequest Django
+        user = getattr(request, "user", None)
+        pharmacy_id = getattr(user, "pharmacy_id", None)
+
+        size = (
+            0 if getattr(response, "streaming", False)
+            else len(response.content)
+        )
+
+        slow = total_ms >= settings.SLOW_REQUEST_THRESHOLD_MS
+
+        registry.record({
+            "route": route,
+            "method": request.method,
+            "status": response.status_code,
+            "pharmacy_id": str(pharmacy_id) if pharmacy_id else None,
+            "queries": recorder.count,
+            "db_ms": round(db_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "bytes": size,
+            "slow": slow,
+            "at": time.time(),
+        })
+
+        if settings.SERVER_TIMING_HEADER:
+            # db = temps SQL cumulé : dépasse le total si requêtes parallèles
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+                f"app;dur={max(total_ms - db_ms, 0):.1f}, "
+                f"total;dur={total_ms:.1f}"
+            )
+
+        if slow:
+            self.log_slow_request(request, route, pharmacy_id, recorder, total_ms, db_ms)
+
+        return response
+
+    def log_slow_request(self, request, route, pharmacy_id, recorder, total_ms, db_ms):
+        statements = "\n".join(
+            f"  [{elapsed * 1000:.1f} ms] {sql}"
+            for elapsed, sql in recorder.statements
+        )
+
+        logger.warning(
+            "Slow request %s %s (%s) pharmacy=%s: %.1f ms total, "
+            "%d queries, %.1f ms DB\n%s",
+            request.method,
+            request.path,
+            route,
+            pharmacy_id,
+            total_ms,
+            recorder.count,
+            db_ms,
+            statements,
+        )
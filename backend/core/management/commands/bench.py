@@ -0,0 +1,182 @@
+import json
+import logging
+import platform
+import subprocess
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.services.bench import (
+    SCENARIOS,
+    build_tills,
+    run_scenario,
+    summarize_run,
+)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark API end-to-end (Django test client, threads) : ventes "
+        "concurrentes, polling dashboards, bons d'entrée, journal d'audit, "
+        "grandes listes (JSON / colonnaire, --accept-encoding pour la compression). "
+        "Écrit des ventes / bons : à lancer sur une base de bench (manage.py seed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=list(SCENARIOS),
+            help="Scenario to run (repeatable, default: all)",
+        )
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent tills (threads)")
+        parser.add_argument("--iterations", type=int, default=200, help="Iterations per scenario")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured iterations per till")
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--accept-encoding",
+            default="",
+            help="Accept-Encoding sent with every request (e.g. 'br, gzip'); bytes are then wire bytes",
+        )
+        parser.add_argument("--label", default="", help="Free text stored with the results")
+        parser.add_argument("--output", help="JSON results path (default: bench-results/<timestamp>.json)")
+        parser.add_argument("--compare", help="Previous JSON results to compare against")
+
+    def handle(self, *args, **options):
+        names = options["scenario"] or list(SCENARIOS)
+        started_at = timezone.now()
+        headers = {"Accept-Encoding": options["accept_encoding"]} if options["accept_encoding"] else None
+
+        # Log des requêtes lentes (SQL complet) : seulement en -v 2
+        if options["verbosity"] < 2:
+            logging.getLogger("core.perf").setLevel(logging.ERROR)
+
+        # Client de test : Host "testserver", DEBUG coupé (pas d'accumulation de connection.queries)
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], DEBUG=False):
+            try:
+                tills = build_tills(options["concurrency"], options["pharmacy"])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+            self.stdout.write(
+                f"🏁 {len(names)} scénario(s), {len(tills)} caisses sur "
+                f"{len({t.pharmacy.id for t in tills})} pharmacie(s)\n"
+            )
+
+            results = []
+            for name in names:
+                run = run_scenario(
+                    SCENARIOS[name],
+                    tills,
+                    options["iterations"],
+                    seed=options["seed"],
+                    warmup=options["warmup"],
+                    headers=headers,
+                )
+                summary = summarize_run(run)
+                results.append(summary)
+                self.print_summary(summary)
+
+        report = {
+            "meta": {
+                "label": options["label"],
+                "started_at": started_at.isoformat(),
+                "git_commit": git_commit(),
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "concurrency": options["concurrency"],
+                "iterations": options["iterations"],
+                "seed": options["seed"],
+                "accept_encoding": options["accept_encoding"] or None,
+            },
+            "scenarios": results,
+        }
+
+        output = Path(
+            options["output"]
+            or Path(settings.BASE_DIR) / "bench-results" / f"bench-{started_at:%Y%m%d-%H%M%S}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+        if options["compare"]:
+            self.print_comparison(json.loads(Path(options["compare"]).read_text()), report)
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Résultats : {output}"))
+
+    # ---------- affichage ----------
+
+    def print_summary(self, summary):
+        self.stdout.write(
+            f"\n▶ {summary['scenario']} — {summary['description']} "
+            f"({summary['wall_seconds']} s)"
+        )
+        self.stdout.write(
+            f"  {'route':<24} {'req':>6} {'err':>5} {'req/s':>8} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>6} {'bytes':>8}"
+        )
+
+        rows = list(summary["routes"].items())
+        if len(rows) > 1:
+            rows.append(("TOTAL", summary["total"]))
+
+        for route, s in rows:
+            lat = s["latency_ms"]
+            self.stdout.write(
+                f"  {route:<24} {s['requests']:>6} {s['errors']:>5} {s['throughput_rps'] or 0:>8} "
+                f"{lat['p50'] or 0:>8} {lat['p95'] or 0:>8} {lat['p99'] or 0:>8} "
+                f"{s['queries']['mean'] or 0:>6} {s['bytes_mean'] or 0:>8}"
+            )
+
+    def print_comparison(self, previous, current):
+        self.stdout.write(f"\n📊 Comparaison avec {previous['meta'].get('label') or previous['meta']['started_at']}")
+
+        before = {
+            (sc["scenario"], route): s
+            for sc in previous["scenarios"]
+            for route, s in sc["routes"].items()
+        }
+
+        for sc in current["scenarios"]:
+            for route, s in sc["routes"].items():
+                old = before.get((sc["scenario"], route))
+                if not old:
+                    continue
+
+                self.stdout.write(
+                    f"  {sc['scenario']:<10} {route:<24} "
+                    f"p95 {delta(old['latency_ms']['p95'], s['latency_ms']['p95'])}  "
+                    f"req/s {delta(old['throughput_rps'], s['throughput_rps'])}  "
+                    f"SQL {old['queries']['mean']} -> {s['queries']['mean']}  "
+                    f"bytes {delta(old['bytes_mean'], s['bytes_mean'])}"
+                )
+
+
+def delta(old, new):
+    if not old or new is None:
+        return f"{old} -> {new}"
+    return f"{old} -> {new} ({(new - old) / old * 100:+.1f}%)"
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,46 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from core.models import Pharmacy
+from core.services.expiry_risk import refresh_expiry_risk
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Nightly expiry risk: project FIFO depletion of every in-stock batch against "
+        "the demand forecast and store the batches expected to expire unsold"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        batches = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                count = refresh_expiry_risk(pharmacy)
+            except Exception:
+                failed += 1
+                logger.exception("Expiry risk failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            batches += count
+            self.stdout.write(f"⏳ {pharmacy.name} ({pharmacy.pk}) | {count} lots à risque")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {batches} batches at risk, {failed} pharmacies failed")
+        )
@@ -0,0 +1,46 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from core.models import Pharmacy
+from core.services.product_analytics import refresh_product_analytics
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Nightly product analytics: sell-through, days of cover, margin contribution, "
+        "ABC/XYZ bands and dead-stock flags for every active pharmacy"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        products = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                count = refresh_product_analytics(pharmacy)
+            except Exception:
+                failed += 1
+                logger.exception("Product analytics failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            products += count
+            self.stdout.write(f"📊 {pharmacy.name} ({pharmacy.pk}) | {count} produits analysés")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {products} products analysed, {failed} pharmacies failed")
+        )
@@ -0,0 +1,59 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from core.models import Pharmacy
+from core.services.reorder import create_reorder_drafts, reorder_suggestions
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Nightly replenishment: compute reorder quantities for every active "
+        "pharmacy and replace its automatic draft purchase orders (one per supplier)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report suggestions without writing drafts",
+        )
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        drafts = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                suggestions = reorder_suggestions(pharmacy)
+                suppliers = {s.supplier_id for s in suggestions}
+
+                if not options["dry_run"]:
+                    create_reorder_drafts(pharmacy, suggestions)
+            except Exception:
+                failed += 1
+                logger.exception("Reorder failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            drafts += len(suppliers)
+            self.stdout.write(
+                f"📦 {pharmacy.name} ({pharmacy.pk}) | {len(suggestions)} produits à commander, "
+                f"{len(suppliers)} fournisseur(s)"
+            )
+
+        label = "would be created" if options["dry_run"] else "created"
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {drafts} draft purchase orders {label}, {failed} pharmacies failed")
+        )
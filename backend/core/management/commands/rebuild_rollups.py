@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.rollups import rebuild_platform_rollup
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = "Rebuild platform daily sales rollups from Sale"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="Only rebuild days from this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Only rebuild the last N days (scheduled runs)",
+        )
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        if options["days"] is not None:
+            since = timezone.localdate() - timedelta(days=options["days"])
+
+        days = rebuild_platform_rollup(since=since)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {days} jours de rollup reconstruits")
+        )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from core.services.subscriptions import (
+    get_subscription_client,
+    reconcile_subscriptions,
+)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = "Reconcile pharmacy subscription state with Stripe (bulk)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report diffs without writing them",
+        )
+        parser.add_argument(
+            "--client",
+            help="Dotted path of the subscription client class "
+                 "(default: settings.SUBSCRIPTION_CLIENT)",
+        )
+        parser.add_argument(
+            "--api-base",
+            help="Stripe API base URL (e.g. a local fake Stripe server)",
+        )
+
+    def handle(self, *args, **options):
+        client_kwargs = {}
+        if options["api_base"]:
+            client_kwargs["api_base"] = options["api_base"]
+
+        client = get_subscription_client(options["client"], **client_kwargs)
+
+        diffs = reconcile_subscriptions(
+            client,
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+            dry_run=options["dry_run"],
+        )
+
+        for pharmacy, diff in diffs:
+            changes = ", ".join(
+                f"{field}: {old} -> {new}"
+                for field, (old, new) in diff.items()
+            )
+            self.stdout.write(f"🔄 {pharmacy.name} ({pharmacy.pk}) | {changes}")
+
+        label = "would be updated" if options["dry_run"] else "updated"
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {len(diffs)} pharmacies {label}")
+        )
@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import ScheduledJob
+from core.services.scheduler import claim, node_name, release, run_job, sync_jobs, tick
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Run scheduled jobs (settings.SCHEDULER_JOBS / ScheduledJob): cron schedules, "
+        "per-tenant fan-out over a process pool, one node per job via a DB lease"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run due jobs once and exit")
+        parser.add_argument("--run", metavar="NAME", help="Run this job now (ignores its schedule) and exit")
+        parser.add_argument("--list", action="store_true", help="List jobs and their next run")
+
+    def handle(self, *args, **options):
+        node = node_name()
+        created = sync_jobs()
+        if created:
+            self.stdout.write(f"🗓️  {created} job(s) created from SCHEDULER_JOBS")
+
+        if options["list"]:
+            for job in ScheduledJob.objects.all():
+                state = "on" if job.is_enabled else "off"
+                scope = "per tenant" if job.per_tenant else "global"
+                self.stdout.write(
+                    f"{job.name:<20} {job.schedule:<15} {scope:<10} {state:<3} next {job.next_run_at:%Y-%m-%d %H:%M}"
+                )
+            return
+
+        if options["run"]:
+            job = ScheduledJob.objects.filter(name=options["run"]).first()
+            if job is None:
+                raise CommandError(f"Unknown job {options['run']!r}")
+            if not claim(job, node):
+                raise CommandError(f"Job {job.name!r} is locked by {job.locked_by or 'another node'}")
+
+            try:
+                self.report(run_job(job, node))
+            finally:
+                release(job, node)
+            return
+
+        self.stdout.write(f"⏰ Scheduler started on {node}")
+
+        try:
+            while True:
+                for run in tick(node):
+                    self.report(run)
+
+                if options["once"]:
+                    return
+
+                # Réveil aligné sur la minute suivante (résolution du cron)
+                now = timezone.now()
+                time.sleep(min(settings.SCHEDULER_TICK_SECONDS, 60 - now.second - now.microsecond / 1e6) or 1)
+        except KeyboardInterrupt:
+            self.stdout.write("👋 Scheduler stopped")
+
+    def report(self, run):
+        line = f"{run.job.name} | {run.status} | {run.duration_ms} ms"
+        if run.job.per_tenant:
+            line += f" | {run.tenants_failed}/{run.tenants_total} tenants failed"
+
+        if run.status == "success":
+            self.stdout.write(self.style.SUCCESS(f"✅ {line}"))
+        else:
+            self.stderr.write(f"❌ {line}\n{run.error}")
@@ -1,118 +1,68 @@
-import random
-import uuid
-from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
 
-from django.core.management.base import BaseCommand
-from django.utils import timezone
-
-from core.models import (
-    Pharmacy,
-    CustomUser,
-    Product,
-    ProductBatch,
+from core.services.rollups import rebuild_platform_rollup
+from core.services.synthetic import (
+    BulkWriter,
+    DatasetSpec,
+    SyntheticDataGenerator,
 )
 
-# -------------------------
-# DATA DE TEST
-# -------------------------
-
-PRODUCT_CATALOG = [
-    ("Paracétamol", "Paracetamol", "500 mg", "comprime"),
-    ("Ibuprofène", "Ibuprofen", "400 mg", "comprime"),
-    ("Amoxicilline", "Amoxicillin", "500 mg", "gelule"),
-    ("Vitamine C", "Ascorbic Acid", "1000 mg", "comprime"),
-    ("Aspirine", "Acetylsalicylic Acid", "500 mg", "comprime"),
-    ("Diclofénac", "Diclofenac", "50 mg", "comprime"),
-    ("Metformine", "Metformin", "850 mg", "comprime"),
-    ("Ciprofloxacine", "Ciprofloxacin", "500 mg", "comprime"),
-    ("Sirop toux", None, "125 ml", "sirop"),
-    ("Pommade antibiotique", None, "15 g", "pommade"),
-]
-
-MANUFACTURERS = [
-    "Sanofi",
-    "Pfizer",
-    "Novartis",
-    "Bayer",
-    "Roche",
-    "GSK",
-]
-
-PHARMACIES = [
-    ("Pharmacie Centrale", "pharmacie"),
-    ("Pharmacie du Marché", "pharmacie"),
-    ("Pharmacie Espoir", "pharmacie"),
-]
 
 # -------------------------
 # COMMAND
 # -------------------------
 
 class Command(BaseCommand):
-    help = "Seed database with pharmacies, admins, products and batches"
+    help = (
+        "Seed database with synthetic pharmacies, admins, suppliers, products, "
+        "batches, stock entries and seasonal sales history (bulk_create / COPY)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacies", type=int, default=3)
+        parser.add_argument("--products", type=int, default=100, help="Products per pharmacy")
+        parser.add_argument("--batches", type=int, default=3, help="Max batches per product (1..N)")
+        parser.add_argument("--months", type=int, default=0, help="Months of sales history")
+        parser.add_argument("--sales-per-day", type=int, default=40, help="Average sales per pharmacy per day")
+        parser.add_argument("--stock-entries", type=int, default=4, help="Stock entries per pharmacy per month")
+        parser.add_argument("--suppliers", type=int, default=3, help="Suppliers per pharmacy")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (reproducible dataset)")
+        parser.add_argument("--chunk-size", type=int, default=10000, help="Rows buffered before each write")
+        parser.add_argument("--copy", action="store_true", help="Use PostgreSQL COPY instead of bulk_create")
 
     def handle(self, *args, **options):
-        self.stdout.write("🌱 Seeding database...\n")
-
-        for pharmacy_name, pharmacy_type in PHARMACIES:
-            pharmacy = Pharmacy.objects.create(
-                id=uuid.uuid4(),
-                name=pharmacy_name,
-                type=pharmacy_type,
-                city="N'Djamena",
-            )
-
-            self.stdout.write(f"🏪 Pharmacy created: {pharmacy.name}")
+        spec = DatasetSpec(
+            pharmacies=options["pharmacies"],
+            products=options["products"],
+            batches_per_product=max(1, options["batches"]),
+            months=options["months"],
+            sales_per_day=options["sales_per_day"],
+            stock_entries_per_month=options["stock_entries"],
+            suppliers=max(1, options["suppliers"]),
+            seed=options["seed"],
+        )
 
-            # -------------------------
-            # ADMIN
-            # -------------------------
-            admin = CustomUser.objects.create_user(
-                name=f"Admin {pharmacy.name}",
-                pharmacy=pharmacy,
-                role="admin",
-                pin="1234",
-            )
+        try:
+            writer = BulkWriter(chunk_size=options["chunk_size"], use_copy=options["copy"])
+        except ValueError as e:
+            raise CommandError(str(e))
 
-            self.stdout.write(f"👤 Admin created: {admin.name}")
+        self.stdout.write("🌱 Seeding database...\n")
 
-            # -------------------------
-            # PRODUITS
-            # -------------------------
-            for i in range(100):
-                base_product = random.choice(PRODUCT_CATALOG)
+        result = SyntheticDataGenerator(spec, writer=writer, stdout=self.stdout).run()
 
-                product = Product.objects.create(
-                    id=uuid.uuid4(),
-                    pharmacy=pharmacy,
-                    name=base_product[0],
-                    generic_name=base_product[1],
-                    dosage=base_product[2],
-                    form=base_product[3],
-                    unit_price=random.randint(500, 5000),
-                    purchase_price=random.randint(300, 4000),
-                    min_stock_level=random.randint(5, 20),
-                    manufacturer=random.choice(MANUFACTURERS),
-                    requires_prescription=random.choice([True, False]),
-                    is_active=True,
-                )
+        days = rebuild_platform_rollup()
 
-                # -------------------------
-                # LOTS (1 à 3 par produit)
-                # -------------------------
-                for _ in range(random.randint(1, 3)):
-                    ProductBatch.objects.create(
-                        id=uuid.uuid4(),
-                        product=product,
-                        quantity=random.randint(20, 150),
-                        expiry_date=date.today()
-                        + timedelta(days=random.randint(90, 720)),
-                    )
+        total = sum(result["rows"].values())
+        self.stdout.write("")
+        for model, count in result["rows"].items():
+            self.stdout.write(f"  {model:<22} {count:>12,}")
 
-            self.stdout.write(
-                f"💊 100 produits + lots créés pour {pharmacy.name}\n"
-            )
+        self.stdout.write(f"  {'PlatformDailySales':<22} {days:>12,}")
 
         self.stdout.write(
-            self.style.SUCCESS("✅ Seeding terminé avec succès 🎉")
+            self.style.SUCCESS(
+                f"✅ Seeding terminé : {total:,} lignes en {result['seconds']} s "
+                f"({int(total / max(result['seconds'], 0.001)):,} lignes/s) 🎉"
+            )
         )
@@ -0,0 +1,51 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from core.models import Pharmacy
+from core.services.notifications import (
+    notify_expired_products,
+    notify_expiring_soon_products,
+    notify_low_stock,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Stock alert digest: email admins / managers about critical stock, expired "
+        "batches and batches projected to expire unsold"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        sent = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                notify_low_stock(pharmacy)
+                notify_expired_products(pharmacy)
+                notify_expiring_soon_products(pharmacy)
+            except Exception:
+                failed += 1
+                logger.exception("Stock alerts failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            sent += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ stock alerts checked for {sent} pharmacies, {failed} failed")
+        )
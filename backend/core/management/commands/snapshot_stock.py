@@ -0,0 +1,77 @@
+import logging
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.models import Pharmacy, PharmacyDataVersion
+from core.services.ledger import ledger_drift, prune_snapshots, take_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Nightly stock snapshot: per-product quantities and cost value at local midnight "
+        "plus the pharmacy valuation, computed from the previous snapshot and the stock "
+        "movement ledger; old daily product snapshots pruned to month-ends"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+        parser.add_argument("--date", type=parse_date, help="Snapshot at the midnight opening this day (default: today)")
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="Backfill: one snapshot per day for the N days ending at --date",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Also report batches whose quantity differs from their ledger balance",
+        )
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        last_day = options["date"] or timezone.localdate()
+        # Du plus ancien au plus récent : chaque snapshot part du précédent
+        days = [last_day - timedelta(days=offset) for offset in reversed(range(max(options["days"], 1)))]
+
+        snapshots = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                for day in days:
+                    count = take_snapshot(pharmacy, day)
+                prune_snapshots(pharmacy)
+                # Une fois par pharmacie, pas par jour rejoué : ETag des vues à date
+                PharmacyDataVersion.bump(pharmacy.pk)
+                drift = ledger_drift(pharmacy) if options["check"] else []
+            except Exception:
+                failed += 1
+                logger.exception("Stock snapshot failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            snapshots += 1
+            self.stdout.write(f"📸 {pharmacy.name} ({pharmacy.pk}) | {count} produits en stock")
+
+            if drift:
+                self.stderr.write(
+                    f"⚠️  {pharmacy.name} ({pharmacy.pk}) | {len(drift)} lots hors journal : "
+                    + ", ".join(f"{batch_id} ({quantity} ≠ {ledger})" for batch_id, quantity, ledger in drift[:10])
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {snapshots} pharmacies snapshotted, {failed} failed")
+        )
@@ -0,0 +1,49 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from core.models import Pharmacy
+from core.services.write_off import write_off_expired
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# COMMAND
+# -------------------------
+
+class Command(BaseCommand):
+    help = (
+        "Nightly write-off: zero out expired batches still in stock and record "
+        "one valued StockAdjustment per batch"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pharmacy", action="append", help="Restrict to these pharmacy ids")
+
+    def handle(self, *args, **options):
+        pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+        if options["pharmacy"]:
+            pharmacies = pharmacies.filter(id__in=options["pharmacy"])
+
+        batches = failed = 0
+
+        for pharmacy in pharmacies.only("id", "name").iterator():
+            # Un tenant en erreur ne bloque pas les autres
+            try:
+                result = write_off_expired(pharmacy)
+            except Exception:
+                failed += 1
+                logger.exception("Write-off failed for pharmacy %s", pharmacy.pk)
+                self.stderr.write(f"❌ {pharmacy.name} ({pharmacy.pk})")
+                continue
+
+            batches += result["batches"]
+            self.stdout.write(
+                f"🗑️  {pharmacy.name} ({pharmacy.pk}) | {result['batches']} lots, "
+                f"{result['units']} unités, {result['value']} de pertes"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {batches} expired batches written off, {failed} pharmacies failed")
+        )
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.28 on 2026-10-19 17:34
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def backfill_platform_daily_sales(apps, schema_editor):
+    from django.db.models import Count, Sum
+    from django.db.models.functions import TruncDate
+
+    Sale = apps.get_model("core", "Sale")
+    PlatformDailySales = apps.get_model("core", "PlatformDailySales")
+
+    daily = (
+        Sale.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            revenue=Sum("total_price"),
+            cogs=Sum("cost_total"),
+            sales_count=Count("id"),
+        )
+        .order_by("day")
+    )
+
+    PlatformDailySales.objects.bulk_create(
+        [
+            PlatformDailySales(
+                date=item["day"],
+                revenue=item["revenue"] or 0,
+                cogs=item["cogs"] or 0,
+                sales_count=item["sales_count"],
+            )
+            for item in daily
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_alter_pharmacy_country'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cogs', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.RunPython(
+            backfill_platform_daily_sales,
+            migrations.RunPython.noop,
+        ),
+    ]
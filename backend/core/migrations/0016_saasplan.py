@@ -0,0 +1,47 @@
+# Generated by Django 4.2.28 on 2026-10-19 17:35
+
+from django.db import migrations, models
+
+
+# Tarifs jusque-là codés en dur dans AdminSubscriptionsListView
+# ("basic" y désignait le plan d'entrée, aujourd'hui "starter")
+DEFAULT_PLANS = (
+    ("starter", "Starter", 15000),
+    ("pro", "Pro", 25000),
+    ("enterprise", "Enterprise", 50000),
+)
+
+
+def seed_default_plans(apps, schema_editor):
+    SaaSPlan = apps.get_model("core", "SaaSPlan")
+
+    SaaSPlan.objects.bulk_create([
+        SaaSPlan(code=code, name=name, price=price, currency="xaf")
+        for code, name, price in DEFAULT_PLANS
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_platformdailysales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaaSPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(blank=True, choices=[('starter', 'Starter'), ('pro', 'Pro'), ('enterprise', 'Enterprise')], db_index=True, max_length=20, null=True)),
+                ('name', models.CharField(max_length=100)),
+                ('stripe_price_id', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(default='usd', max_length=10)),
+                ('active', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.RunPython(
+            seed_default_plans,
+            migrations.RunPython.noop,
+        ),
+    ]
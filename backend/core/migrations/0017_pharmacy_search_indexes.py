@@ -0,0 +1,48 @@
+# Generated by Django 4.2.28 on 2026-10-19 17:36
+
+from django.db import migrations, models
+
+
+# Index trigram (PostgreSQL) sur UPPER(col) : c'est l'expression générée
+# par `icontains`, la recherche admin peut donc les utiliser telle quelle.
+TRIGRAM_COLUMNS = ("name", "code", "city")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS core_pharmacy_{column}_trgm "
+            f"ON core_pharmacy USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS core_pharmacy_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_saasplan'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pharmacy',
+            index=models.Index(fields=['-created_at'], name='core_pharma_created_079a79_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['pharmacy', 'created_at'], name='core_sale_pharmac_1430a7_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
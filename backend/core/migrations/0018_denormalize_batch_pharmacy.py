@@ -0,0 +1,45 @@
+# Generated by Django 4.2.28 on 2026-10-19 17:38
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_pharmacy(apps, schema_editor):
+    Product = apps.get_model("core", "Product")
+    ProductBatch = apps.get_model("core", "ProductBatch")
+    Sale = apps.get_model("core", "Sale")
+    SaleBatchConsumption = apps.get_model("core", "SaleBatchConsumption")
+
+    ProductBatch.objects.update(
+        pharmacy=Subquery(
+            Product.objects.filter(pk=OuterRef("product_id")).values("pharmacy_id")[:1]
+        )
+    )
+
+    SaleBatchConsumption.objects.update(
+        pharmacy=Subquery(
+            Sale.objects.filter(pk=OuterRef("sale_id")).values("pharmacy_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_pharmacy_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productbatch',
+            name='pharmacy',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='core.pharmacy'),
+        ),
+        migrations.AddField(
+            model_name='salebatchconsumption',
+            name='pharmacy',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='core.pharmacy'),
+        ),
+        migrations.RunPython(backfill_pharmacy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.28 on 2026-10-19 17:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Séparé de 0018 : PostgreSQL refuse un ALTER TABLE après un UPDATE
+# sur la même table dans la même transaction (FK différées en attente).
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_denormalize_batch_pharmacy'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='productbatch',
+            name='pharmacy',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='core.pharmacy'),
+        ),
+        migrations.AlterField(
+            model_name='salebatchconsumption',
+            name='pharmacy',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.pharmacy'),
+        ),
+        migrations.AddIndex(
+            model_name='productbatch',
+            index=models.Index(fields=['pharmacy', 'expiry_date'], name='core_produc_pharmac_c3c7ca_idx'),
+        ),
+    ]
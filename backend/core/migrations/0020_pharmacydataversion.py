@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_batch_pharmacy_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PharmacyDataVersion',
+            fields=[
+                ('pharmacy', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to='core.pharmacy')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_pharmacydataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockentry',
+            name='origin',
+            field=models.CharField(choices=[('manual', 'Saisie'), ('reorder', 'Réapprovisionnement automatique')], default='manual', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='lead_time_days',
+            field=models.PositiveSmallIntegerField(default=7),
+        ),
+        migrations.AlterField(
+            model_name='stockentryitem',
+            name='expiry_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_reorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAnalytics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('window_days', models.PositiveSmallIntegerField()),
+                ('units_sold', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('margin', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('stock', models.PositiveIntegerField(default=0)),
+                ('stock_value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sell_through', models.FloatField(blank=True, null=True)),
+                ('days_of_cover', models.FloatField(blank=True, null=True)),
+                ('margin_share', models.FloatField(default=0)),
+                ('demand_cv', models.FloatField(blank=True, null=True)),
+                ('last_sale_at', models.DateTimeField(blank=True, null=True)),
+                ('days_since_last_sale', models.PositiveIntegerField(blank=True, null=True)),
+                ('abc_class', models.CharField(choices=[('A', 'A - 80 % de la marge'), ('B', 'B - 15 % suivants'), ('C', 'C - reste')], max_length=1)),
+                ('xyz_class', models.CharField(choices=[('X', 'X - demande régulière'), ('Y', 'Y - demande variable'), ('Z', 'Z - demande erratique')], max_length=1)),
+                ('flag', models.CharField(blank=True, choices=[('', 'Aucun'), ('dead_stock', 'Stock dormant'), ('slow_moving', 'Rotation lente')], default='', max_length=20)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('pharmacy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_analytics', to='core.pharmacy')),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analytics', to='core.product')),
+            ],
+            options={
+                'ordering': ['-margin'],
+                'indexes': [models.Index(fields=['pharmacy', 'flag'], name='core_produc_pharmac_923f6a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_product_analytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchExpiryRisk',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('expiry_date', models.DateField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('projected_sales', models.PositiveIntegerField(default=0)),
+                ('quantity_at_risk', models.PositiveIntegerField()),
+                ('value_at_risk', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('batch', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_risk', to='core.productbatch')),
+                ('pharmacy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_risks', to='core.pharmacy')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_risks', to='core.product')),
+            ],
+            options={
+                'ordering': ['expiry_date'],
+                'indexes': [models.Index(fields=['pharmacy', 'expiry_date'], name='core_batche_pharmac_0e467c_idx')],
+            },
+        ),
+    ]
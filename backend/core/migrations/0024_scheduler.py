@@ -0,0 +1,56 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:25
+
+import core.cron
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_batch_expiry_risk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('command', models.CharField(max_length=100)),
+                ('arguments', models.JSONField(blank=True, default=list)),
+                ('schedule', models.CharField(max_length=100, validators=[core.cron.validate_cron])),
+                ('per_tenant', models.BooleanField(default=False)),
+                ('is_enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('node', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('running', 'En cours'), ('success', 'Succès'), ('partial', 'Échec partiel'), ('failed', 'Échec')], default='running', max_length=20)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('tenants_total', models.PositiveIntegerField(default=0)),
+                ('tenants_failed', models.PositiveIntegerField(default=0)),
+                ('slowest_tenant_ms', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='core.scheduledjob')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['job', '-started_at'], name='core_jobrun_job_id_27c94d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_scheduler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockAdjustment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('reason', models.CharField(choices=[('expired', 'Péremption'), ('damaged', 'Casse / détérioration'), ('count', "Écart d'inventaire"), ('other', 'Autre')], max_length=20)),
+                ('quantity', models.IntegerField()),
+                ('unit_cost', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('expiry_date', models.DateField()),
+                ('note', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='productbatch',
+            index=models.Index(condition=models.Q(('quantity__gt', 0)), fields=['pharmacy', 'product', 'expiry_date'], name='core_batch_live_idx'),
+        ),
+        migrations.AddField(
+            model_name='stockadjustment',
+            name='batch',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjustments', to='core.productbatch'),
+        ),
+        migrations.AddField(
+            model_name='stockadjustment',
+            name='pharmacy',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_adjustments', to='core.pharmacy'),
+        ),
+        migrations.AddField(
+            model_name='stockadjustment',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.product'),
+        ),
+        migrations.AddField(
+            model_name='stockadjustment',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='stockadjustment',
+            index=models.Index(fields=['pharmacy', 'created_at'], name='core_stocka_pharmac_187964_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+def opening_movements(apps, schema_editor):
+    """Stock existant repris au journal : un mouvement "opening" par lot en stock."""
+    ProductBatch = apps.get_model("core", "ProductBatch")
+    StockMovement = apps.get_model("core", "StockMovement")
+
+    opened_at = django.utils.timezone.now()
+    batches = (
+        ProductBatch.objects
+        .filter(quantity__gt=0)
+        .values_list("id", "pharmacy_id", "product_id", "quantity", "purchase_price")
+        .iterator(chunk_size=5000)
+    )
+
+    movements = []
+    for batch_id, pharmacy_id, product_id, quantity, purchase_price in batches:
+        movements.append(StockMovement(
+            pharmacy_id=pharmacy_id,
+            product_id=product_id,
+            batch_id=batch_id,
+            kind="opening",
+            quantity=quantity,
+            unit_cost=purchase_price,
+            created_at=opened_at,
+        ))
+
+        if len(movements) >= 5000:
+            StockMovement.objects.bulk_create(movements, batch_size=1000)
+            movements = []
+
+    StockMovement.objects.bulk_create(movements, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_stock_adjustment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('opening', "Stock d'ouverture"), ('receipt', 'Réception'), ('sale', 'Vente'), ('adjustment', 'Ajustement'), ('write_off', 'Mise au rebut'), ('transfer', 'Transfert')], max_length=20)),
+                ('quantity', models.IntegerField()),
+                ('unit_cost', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('reference', models.UUIDField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='core.productbatch')),
+                ('pharmacy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='core.pharmacy')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.product')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('taken_at', models.DateTimeField()),
+                ('quantity', models.IntegerField()),
+                ('pharmacy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='core.pharmacy')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['pharmacy', 'taken_at'], name='core_stocks_pharmac_719513_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stocksnapshot',
+            constraint=models.UniqueConstraint(fields=('product', 'taken_at'), name='stock_snapshot_product_taken_at'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['pharmacy', 'created_at'], name='core_stockm_pharmac_a7b181_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['pharmacy', 'product', 'created_at'], name='core_stockm_pharmac_c88588_idx'),
+        ),
+        migrations.RunPython(opening_movements, migrations.RunPython.noop),
+    ]
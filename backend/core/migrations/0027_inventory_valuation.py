@@ -0,0 +1,44 @@
+# Generated by Django 4.2.28 on 2026-10-19 18:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def drop_unvalued_snapshots(apps, schema_editor):
+    """Snapshots sans valeur : données dérivées, refaites par snapshot_stock (le journal suffit d'ici là)."""
+    apps.get_model("core", "StockSnapshot").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stocksnapshot',
+            name='value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.CreateModel(
+            name='InventoryValuation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('taken_at', models.DateTimeField()),
+                ('products', models.PositiveIntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pharmacy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_valuations', to='core.pharmacy')),
+            ],
+            options={
+                'ordering': ['taken_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='inventoryvaluation',
+            constraint=models.UniqueConstraint(fields=('pharmacy', 'taken_at'), name='inventory_valuation_pharmacy_taken_at'),
+        ),
+        migrations.RunPython(drop_unvalued_snapshots, migrations.RunPython.noop),
+    ]
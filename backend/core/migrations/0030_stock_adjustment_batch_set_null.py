@@ -0,0 +1,19 @@
+# Generated by Django 4.2.28 on 2026-10-19 19:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_stock_transfer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockadjustment',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='adjustments', to='core.productbatch'),
+        ),
+    ]
@@ -1,6 +1,14 @@
+from .tenant import *
 from .pharmacy import *
+from .plan import *
 from .product import *
 from .sale import *
 from .stock import *
+from .ledger import *
+from .stock_count import *
+from .transfer import *
 from .supplier import *
-from .user import *
\ No newline at end of file
+from .user import *
+from .rollup import *
+from .analytics import *
+from .scheduler import *
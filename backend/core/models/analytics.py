@@ -0,0 +1,141 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+from .tenant import TenantQuerySet, TenantManager
+
+
+class ProductAnalytics(models.Model):
+    """
+    Indicateurs par produit, calculés par le job nocturne
+    (`manage.py compute_product_analytics`) et lus tels quels par les
+    endpoints intelligence / finance. Une ligne par produit actif,
+    remplacée à chaque calcul.
+    """
+
+    ABC_CHOICES = (
+        ("A", "A - 80 % de la marge"),
+        ("B", "B - 15 % suivants"),
+        ("C", "C - reste"),
+    )
+
+    XYZ_CHOICES = (
+        ("X", "X - demande régulière"),
+        ("Y", "Y - demande variable"),
+        ("Z", "Z - demande erratique"),
+    )
+
+    FLAG_CHOICES = (
+        ("", "Aucun"),
+        ("dead_stock", "Stock dormant"),
+        ("slow_moving", "Rotation lente"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="product_analytics"
+    )
+
+    product = models.OneToOneField(
+        "Product",
+        on_delete=models.CASCADE,
+        related_name="analytics"
+    )
+
+    # Fenêtre de ventes (jours complets avant computed_at)
+    window_days = models.PositiveSmallIntegerField()
+
+    units_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    margin = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Lots non expirés au moment du calcul
+    stock = models.PositiveIntegerField(default=0)
+    stock_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # vendu / (vendu + stock) sur la fenêtre ; None sans vente ni stock
+    sell_through = models.FloatField(null=True, blank=True)
+    # Jours de stock au rythme de la fenêtre ; None sans vente
+    days_of_cover = models.FloatField(null=True, blank=True)
+    # Part de la marge totale de la pharmacie
+    margin_share = models.FloatField(default=0)
+    # Coefficient de variation des ventes hebdomadaires
+    demand_cv = models.FloatField(null=True, blank=True)
+
+    last_sale_at = models.DateTimeField(null=True, blank=True)
+    days_since_last_sale = models.PositiveIntegerField(null=True, blank=True)
+
+    abc_class = models.CharField(max_length=1, choices=ABC_CHOICES)
+    xyz_class = models.CharField(max_length=1, choices=XYZ_CHOICES)
+    flag = models.CharField(max_length=20, choices=FLAG_CHOICES, blank=True, default="")
+
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["-margin"]
+        indexes = [
+            models.Index(fields=["pharmacy", "flag"]),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} | {self.abc_class}{self.xyz_class}"
+
+
+class BatchExpiryRisk(models.Model):
+    """
+    Lot qui devrait expirer avec du stock : écoulement FIFO des lots du
+    produit contre sa prévision de ventes (core.services.expiry_risk).
+    Recalculé par produit à chaque vente / validation de bon, et pour
+    toute la pharmacie par `manage.py compute_expiry_risk`.
+    Seuls les lots à risque ont une ligne.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="expiry_risks"
+    )
+
+    product = models.ForeignKey(
+        "Product",
+        on_delete=models.CASCADE,
+        related_name="expiry_risks"
+    )
+
+    batch = models.OneToOneField(
+        "ProductBatch",
+        on_delete=models.CASCADE,
+        related_name="expiry_risk"
+    )
+
+    expiry_date = models.DateField()
+
+    # Quantité du lot au moment du calcul
+    quantity = models.PositiveIntegerField()
+    # Unités du lot vendues d'ici l'expiration (prévision)
+    projected_sales = models.PositiveIntegerField(default=0)
+    quantity_at_risk = models.PositiveIntegerField()
+    # quantity_at_risk x prix d'achat du lot
+    value_at_risk = models.DecimalField(max_digits=14, decimal_places=2)
+
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["expiry_date"]
+        indexes = [
+            models.Index(fields=["pharmacy", "expiry_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.batch_id} | {self.quantity_at_risk} à risque"
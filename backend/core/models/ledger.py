@@ -0,0 +1,141 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+from .tenant import TenantQuerySet, TenantManager
+
+
+class StockMovement(models.Model):
+    """
+    Journal des mouvements de stock (append-only), écrit en bulk dans la
+    transaction qui modifie les lots. Σ quantity par lot = ProductBatch.quantity
+    (les lots antérieurs au journal y entrent par un mouvement "opening").
+    """
+
+    KIND_CHOICES = (
+        ("opening", "Stock d'ouverture"),
+        ("receipt", "Réception"),
+        ("sale", "Vente"),
+        ("adjustment", "Ajustement"),
+        ("write_off", "Mise au rebut"),
+        ("transfer", "Transfert"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="stock_movements"
+    )
+
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+    batch = models.ForeignKey(
+        "ProductBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="movements"
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Signée : positive = entrée, négative = sortie
+    quantity = models.IntegerField()
+    unit_cost = models.DecimalField(max_digits=10, decimal_places=2)
+
+    # Document source (Sale, StockEntry, StockAdjustment...) selon `kind`
+    reference = models.UUIDField(null=True, blank=True)
+
+    user = models.ForeignKey(
+        "CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["pharmacy", "created_at"]),
+            models.Index(fields=["pharmacy", "product", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} | {self.product_id} | {self.quantity:+d}"
+
+
+class StockSnapshot(models.Model):
+    """
+    Stock d'un produit à un instant (taken_at, minuit local) : point de
+    départ des requêtes "stock au jour J" (snapshot + mouvements suivants).
+    Produits à stock nul omis ; au-delà de STOCK_SNAPSHOT_DAILY_RETENTION_DAYS,
+    seuls les snapshots de fin de mois (1er à minuit) sont conservés.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="stock_snapshots"
+    )
+
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+
+    taken_at = models.DateTimeField()
+    quantity = models.IntegerField()
+    # Au coût d'achat des lots (Σ quantité × coût des mouvements)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "taken_at"], name="stock_snapshot_product_taken_at"),
+        ]
+        indexes = [
+            models.Index(fields=["pharmacy", "taken_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} | {self.taken_at:%Y-%m-%d %H:%M} | {self.quantity}"
+
+
+class InventoryValuation(models.Model):
+    """
+    Valorisation du stock d'une pharmacie à minuit (une ligne par nuit,
+    conservée sans limite) : tendance et clôtures mensuelles.
+    Totaux des StockSnapshot du même instant.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="inventory_valuations"
+    )
+
+    taken_at = models.DateTimeField()
+
+    products = models.PositiveIntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["taken_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["pharmacy", "taken_at"], name="inventory_valuation_pharmacy_taken_at"),
+        ]
+
+    def __str__(self):
+        return f"{self.pharmacy_id} | {self.taken_at:%Y-%m-%d} | {self.value}"
@@ -48,6 +48,17 @@ class Pharmacy(models.Model):
     country = models.CharField(max_length=100, default="Chad")
 
     city = models.CharField(max_length=100, blank=True, null=True)
+
+    # Réseau d'un même propriétaire : succursales rattachées au siège / dépôt
+    # (un seul niveau) ; les transferts de stock restent dans le réseau
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="branches"
+    )
+
     created_at = models.DateTimeField(default=timezone.now)
 
     # ==========
@@ -76,6 +87,11 @@ class Pharmacy(models.Model):
 
     grace_until = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"]),
+        ]
+
     # ==========
     # Utils
     # ==========
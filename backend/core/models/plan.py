@@ -1,11 +1,28 @@
 from django.db import models
 
+from .pharmacy import Pharmacy
+
+
 class SaaSPlan(models.Model):
+    """
+    Tarif mensuel d'un plan SaaS.
+    Une pharmacie est rattachée à son plan par `stripe_price_id`
+    (prix réellement facturé) ou, à défaut, par `code` (Pharmacy.plan).
+    """
+
+    code = models.CharField(
+        max_length=20,
+        choices=Pharmacy.PLAN_CHOICES,
+        blank=True,
+        null=True,
+        db_index=True
+    )
+
     name = models.CharField(max_length=100)
-    stripe_price_id = models.CharField(max_length=255, unique=True)
+    stripe_price_id = models.CharField(max_length=255, unique=True, blank=True, null=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     currency = models.CharField(max_length=10, default="usd")
     active = models.BooleanField(default=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
@@ -2,6 +2,9 @@ import uuid
 from django.db import models
 from django.utils import timezone
 
+from .rollup import PharmacyDataVersion
+from .tenant import TenantQuerySet, TenantManager
+
 
 class Product(models.Model):
 
@@ -33,5 +36,22 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # Prix, seuils, libellés : invalide les réponses mises en cache (ETag)
+        PharmacyDataVersion.bump(self.pharmacy_id)
+
+    def delete(self, *args, **kwargs):
+        pharmacy_id = self.pharmacy_id
+        result = super().delete(*args, **kwargs)
+
+        PharmacyDataVersion.bump(pharmacy_id)
+
+        return result
+
     def __str__(self):
         return f"{self.name} {self.dosage}"
\ No newline at end of file
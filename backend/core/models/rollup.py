@@ -0,0 +1,75 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class PlatformDailySales(models.Model):
+    """
+    Rollup journalier des ventes, toutes pharmacies confondues.
+    Alimenté à chaque vente (SaleCreateSerializer) et reconstructible
+    via `manage.py rebuild_rollups`.
+    """
+
+    date = models.DateField(unique=True)
+
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cogs = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.date} | {self.revenue}"
+
+
+class PharmacyDataVersion(models.Model):
+    """
+    Version des données métier d'une pharmacie (ventes, stock, produits) :
+    incrémentée dans la transaction de chaque écriture, elle sert de
+    validateur HTTP (ETag / Last-Modified) aux endpoints de lecture.
+    Table à part : un Pharmacy.save() complet ne peut pas la faire reculer.
+    """
+
+    pharmacy = models.OneToOneField(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="data_version",
+    )
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.pharmacy_id} | v{self.version}"
+
+    @classmethod
+    def bump(cls, pharmacy_id):
+        """
+        UPDATE atomique (F()) ; la ligne n'est créée qu'au premier
+        changement de la pharmacie (même schéma que record_sale_in_rollups).
+        """
+        increments = dict(version=F("version") + 1, updated_at=timezone.now())
+
+        if cls.objects.filter(pharmacy_id=pharmacy_id).update(**increments):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(pharmacy_id=pharmacy_id, version=1)
+        except IntegrityError:
+            cls.objects.filter(pharmacy_id=pharmacy_id).update(**increments)
+
+    @classmethod
+    def current(cls, pharmacy_id):
+        """(version, updated_at) ; (0, None) si jamais modifiée."""
+        row = (
+            cls.objects
+            .filter(pharmacy_id=pharmacy_id)
+            .values_list("version", "updated_at")
+            .first()
+        )
+        return row or (0, None)
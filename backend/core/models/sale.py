@@ -2,6 +2,8 @@ import uuid
 from django.db import models
 from django.utils import timezone
 
+from .tenant import TenantQuerySet, TenantManager
+
 
 class Sale(models.Model):
 
@@ -18,6 +20,14 @@ class Sale(models.Model):
 
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["pharmacy", "created_at"]),
+        ]
+
     def __str__(self):
         return f"Sale {self.id}"
 
@@ -34,11 +44,19 @@ class SaleBatchConsumption(models.Model):
 
     batch = models.ForeignKey("ProductBatch", on_delete=models.CASCADE)
 
+    # Dénormalisé (= sale.pharmacy) : filtre tenant sans JOIN
+    pharmacy = models.ForeignKey("Pharmacy", on_delete=models.CASCADE)
+
     quantity = models.PositiveIntegerField()
     unit_cost = models.DecimalField(max_digits=10, decimal_places=2)
     total_cost = models.DecimalField(max_digits=12, decimal_places=2)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
     def save(self, *args, **kwargs):
+        if not self.pharmacy_id:
+            self.pharmacy_id = self.sale.pharmacy_id
         self.total_cost = self.quantity * self.unit_cost
         super().save(*args, **kwargs)
 
@@ -87,5 +105,8 @@ class SaleAuditLog(models.Model):
     message = models.TextField(blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
     class Meta:
         ordering = ["-created_at"]
\ No newline at end of file
@@ -0,0 +1,81 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+from core.cron import validate_cron
+
+
+class ScheduledJob(models.Model):
+    """
+    Tâche planifiée exécutée par `manage.py run_scheduler` : une commande
+    de gestion, globale ou lancée une fois par pharmacie active
+    (`--pharmacy <id>`, en parallèle sur un pool de processus).
+    Créée depuis settings.SCHEDULER_JOBS ; planning modifiable en base.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    name = models.CharField(max_length=100, unique=True)
+    command = models.CharField(max_length=100)
+    arguments = models.JSONField(default=list, blank=True)
+
+    # Cron 5 champs, fuseau TIME_ZONE (core.cron)
+    schedule = models.CharField(max_length=100, validators=[validate_cron])
+    per_tenant = models.BooleanField(default=False)
+    is_enabled = models.BooleanField(default=True)
+
+    next_run_at = models.DateTimeField(null=True, blank=True)
+
+    # Verrou (bail) : un seul nœud exécute la tâche ; expire si le nœud meurt
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"{self.name} ({self.schedule})"
+
+
+class JobRun(models.Model):
+    """Une exécution de ScheduledJob : durée, tenants traités / en échec."""
+
+    STATUS_CHOICES = (
+        ("running", "En cours"),
+        ("success", "Succès"),
+        ("partial", "Échec partiel"),
+        ("failed", "Échec"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    job = models.ForeignKey(
+        ScheduledJob,
+        on_delete=models.CASCADE,
+        related_name="runs"
+    )
+
+    node = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    tenants_total = models.PositiveIntegerField(default=0)
+    tenants_failed = models.PositiveIntegerField(default=0)
+    # Tenant le plus long (ms) : repère les pharmacies qui dominent la durée
+    slowest_tenant_ms = models.PositiveIntegerField(default=0)
+
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["job", "-started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} | {self.status} | {self.started_at:%Y-%m-%d %H:%M}"
@@ -1,7 +1,10 @@
 import uuid
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from .tenant import TenantQuerySet, TenantManager
+
 
 class ProductBatch(models.Model):
 
@@ -13,14 +16,38 @@ class ProductBatch(models.Model):
         related_name="batches"
     )
 
+    # Dénormalisé (= product.pharmacy) : filtre tenant sans JOIN
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="batches"
+    )
+
     quantity = models.PositiveIntegerField()
     purchase_price = models.DecimalField(max_digits=10, decimal_places=2)
 
     expiry_date = models.DateField()
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
     class Meta:
         ordering = ["expiry_date", "created_at"]
+        indexes = [
+            models.Index(fields=["pharmacy", "expiry_date"]),
+            # Lots vivants seulement : les lots soldés / mis au rebut sortent des scans
+            models.Index(
+                fields=["pharmacy", "product", "expiry_date"],
+                condition=Q(quantity__gt=0),
+                name="core_batch_live_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.pharmacy_id:
+            self.pharmacy_id = self.product.pharmacy_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.product.name} | {self.quantity} | exp {self.expiry_date}"
@@ -33,6 +60,11 @@ class StockEntry(models.Model):
         ("validated", "Validé"),
     )
 
+    ORIGIN_CHOICES = (
+        ("manual", "Saisie"),
+        ("reorder", "Réapprovisionnement automatique"),
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     pharmacy = models.ForeignKey(
@@ -52,8 +84,13 @@ class StockEntry(models.Model):
     total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
+    # Brouillons "reorder" : régénérés chaque nuit tant qu'ils ne sont pas validés
+    origin = models.CharField(max_length=20, choices=ORIGIN_CHOICES, default="manual")
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
     class Meta:
         ordering = ["-created_at"]
 
@@ -72,10 +109,75 @@ class StockEntryItem(models.Model):
 
     quantity = models.PositiveIntegerField()
     purchase_price = models.DecimalField(max_digits=10, decimal_places=2)
-    expiry_date = models.DateField()
+    # Inconnue sur une commande : renseignée à la réception
+    expiry_date = models.DateField(null=True, blank=True)
 
     line_total = models.DecimalField(max_digits=12, decimal_places=2)
 
     def save(self, *args, **kwargs):
         self.line_total = self.quantity * self.purchase_price
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class StockAdjustment(models.Model):
+    """
+    Correction de stock d'un lot (audit) : mise au rebut des périmés,
+    casse, écart d'inventaire. quantity signée (négative = sortie), valorisée
+    au coût d'achat du lot.
+    """
+
+    REASON_CHOICES = (
+        ("expired", "Péremption"),
+        ("damaged", "Casse / détérioration"),
+        ("count", "Écart d'inventaire"),
+        ("other", "Autre"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="stock_adjustments"
+    )
+
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+    # SET_NULL : l'audit survit à la suppression du lot (produit, coût et péremption copiés)
+    batch = models.ForeignKey(
+        "ProductBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="adjustments"
+    )
+
+    # None : job nocturne
+    user = models.ForeignKey(
+        "CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    quantity = models.IntegerField()
+    unit_cost = models.DecimalField(max_digits=10, decimal_places=2)
+    value = models.DecimalField(max_digits=12, decimal_places=2)
+
+    # Copiée du lot : rapport de pertes par date de péremption
+    expiry_date = models.DateField()
+    note = models.CharField(max_length=255, blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["pharmacy", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_reason_display()} | {self.quantity} | {self.value}"
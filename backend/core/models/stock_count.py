@@ -0,0 +1,104 @@
+import uuid
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .tenant import TenantQuerySet, TenantManager
+
+
+class StockCount(models.Model):
+    """
+    Session d'inventaire physique : lignes comptées envoyées par lots
+    (scanners), écarts calculés en une requête, puis passés en
+    StockAdjustment "count" à la clôture. Une seule session ouverte par pharmacie.
+    """
+
+    STATUS_CHOICES = (
+        ("open", "En cours"),
+        ("posted", "Clôturé"),
+        ("cancelled", "Annulé"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="stock_counts"
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="open")
+    # Inventaire complet : les lots en stock non comptés passent à 0 à la clôture
+    full = models.BooleanField(default=False)
+    note = models.CharField(max_length=255, blank=True, default="")
+
+    created_by = models.ForeignKey(
+        "CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    posted_by = models.ForeignKey(
+        "CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    created_at = models.DateTimeField(default=timezone.now)
+    posted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["pharmacy"],
+                condition=Q(status="open"),
+                name="stock_count_one_open_per_pharmacy",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.pharmacy_id} | {self.created_at:%Y-%m-%d} | {self.status}"
+
+
+class StockCountLine(models.Model):
+    """
+    Quantité comptée d'un lot. expected_quantity = stock du lot au moment
+    du comptage : l'écart (compté - attendu) reste juste si des ventes ont
+    lieu entre le scan et la clôture. Un nouveau scan du lot remplace la ligne.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    count = models.ForeignKey(
+        "StockCount",
+        on_delete=models.CASCADE,
+        related_name="lines"
+    )
+
+    # Dénormalisés : filtre tenant et agrégats sans JOIN
+    pharmacy = models.ForeignKey("Pharmacy", on_delete=models.CASCADE)
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+    batch = models.ForeignKey("ProductBatch", on_delete=models.CASCADE, related_name="+")
+
+    counted_quantity = models.PositiveIntegerField()
+    expected_quantity = models.PositiveIntegerField()
+
+    counted_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["count", "batch"], name="stock_count_line_count_batch"),
+        ]
+
+    def __str__(self):
+        return f"{self.batch_id} | {self.counted_quantity} / {self.expected_quantity}"
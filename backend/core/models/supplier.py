@@ -2,6 +2,8 @@ import uuid
 from django.db import models
 from django.utils import timezone
 
+from .tenant import TenantQuerySet, TenantManager
+
 
 class Supplier(models.Model):
 
@@ -18,7 +20,13 @@ class Supplier(models.Model):
     email = models.EmailField(blank=True, null=True)
     address = models.TextField(blank=True, null=True)
 
+    # Délai commande -> réception (jours) : horizon du réapprovisionnement
+    lead_time_days = models.PositiveSmallIntegerField(default=7)
+
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
     def __str__(self):
         return self.name
\ No newline at end of file
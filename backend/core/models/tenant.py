@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models
+
+
+# Pharmacie (tenant) de la requête / du job en cours
+_current_pharmacy = ContextVar("current_pharmacy", default=None)
+
+
+class TenantNotSetError(RuntimeError):
+    pass
+
+
+def get_current_pharmacy():
+    return _current_pharmacy.get()
+
+
+def activate_tenant(pharmacy):
+    return _current_pharmacy.set(pharmacy)
+
+
+def deactivate_tenant(token):
+    _current_pharmacy.reset(token)
+
+
+@contextmanager
+def tenant_context(pharmacy):
+    """
+    with tenant_context(pharmacy):
+        Product.scoped.all()  # -> pharmacy uniquement
+    """
+    token = activate_tenant(pharmacy)
+    try:
+        yield pharmacy
+    finally:
+        deactivate_tenant(token)
+
+
+class TenantQuerySet(models.QuerySet):
+
+    def for_pharmacy(self, pharmacy):
+        # Colonne pharmacy_id directe sur tous les modèles tenant : pas de JOIN
+        return self.filter(pharmacy=pharmacy)
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    """
+    Manager `scoped` : filtre automatiquement sur la pharmacie active.
+    Lève TenantNotSetError hors contexte tenant (jamais de fuite cross-tenant).
+    """
+
+    def get_queryset(self):
+        pharmacy = get_current_pharmacy()
+
+        if pharmacy is None:
+            raise TenantNotSetError(
+                f"{self.model.__name__}.scoped used outside of a tenant context"
+            )
+
+        return super().get_queryset().for_pharmacy(pharmacy)
@@ -0,0 +1,107 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+from .tenant import TenantQuerySet, TenantManager
+
+
+class StockTransfer(models.Model):
+    """
+    Transfert de stock entre deux pharmacies d'un même réseau (Pharmacy.parent).
+    `pharmacy` = source (tenant propriétaire du document) ; les lots
+    destination sont créés au coût et à la péremption des lots source.
+    """
+
+    MODE_CHOICES = (
+        ("manual", "Manuel"),
+        ("replenishment", "Réapprovisionnement dépôt"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    pharmacy = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.CASCADE,
+        related_name="transfers_out"
+    )
+    # SET_NULL : l'historique de la source survit à la suppression de la destination
+    destination = models.ForeignKey(
+        "Pharmacy",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="transfers_in"
+    )
+
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default="manual")
+
+    user = models.ForeignKey(
+        "CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    lines_count = models.PositiveIntegerField(default=0)
+    quantity = models.PositiveIntegerField(default=0)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    note = models.CharField(max_length=255, blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["pharmacy", "created_at"]),
+            models.Index(fields=["destination", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.pharmacy_id} -> {self.destination_id} | {self.quantity}"
+
+
+class StockTransferLine(models.Model):
+    """Un lot source -> un lot destination (même coût, même péremption)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    transfer = models.ForeignKey(
+        "StockTransfer",
+        on_delete=models.CASCADE,
+        related_name="lines"
+    )
+
+    # Source (dénormalisée : filtre tenant sans JOIN)
+    pharmacy = models.ForeignKey("Pharmacy", on_delete=models.CASCADE)
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+    source_batch = models.ForeignKey(
+        "ProductBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+"
+    )
+
+    destination_product = models.ForeignKey(
+        "Product",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+"
+    )
+    destination_batch = models.ForeignKey(
+        "ProductBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+"
+    )
+
+    quantity = models.PositiveIntegerField()
+    unit_cost = models.DecimalField(max_digits=10, decimal_places=2)
+    expiry_date = models.DateField()
+
+    objects = TenantQuerySet.as_manager()
+    scoped = TenantManager()
+
+    def __str__(self):
+        return f"{self.product_id} | {self.quantity}"
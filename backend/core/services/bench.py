@@ -0,0 +1,322 @@
+import itertools
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+from django.db import connection, connections
+from django.db.models import Q, Sum
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.api.auth.views import generate_tokens_for_user
+from core.instrumentation import QueryRecorder
+from core.models import Pharmacy, CustomUser, Product, Supplier, StockEntry
+
+
+# ======================================================
+# CONTEXTE (tenants + données de référence)
+# ======================================================
+
+@dataclass
+class Till:
+    """Une caisse : pharmacie + jeton JWT + catalogue vendable."""
+    pharmacy: Pharmacy
+    token: str
+    product_ids: List[str]
+    supplier_ids: List[str]
+
+
+def build_tills(count, pharmacy_ids=None):
+    """
+    Prépare `count` caisses réparties sur les pharmacies actives
+    (les plus récentes d'abord). Requêtes hors chrono.
+    """
+    pharmacies = Pharmacy.objects.filter(is_active=True, subscription_status__in=["active", "trialing"])
+    if pharmacy_ids:
+        pharmacies = pharmacies.filter(id__in=pharmacy_ids)
+
+    today = timezone.localdate()
+    tills = []
+
+    for pharmacy in pharmacies.order_by("-created_at")[:count]:
+        user = (
+            CustomUser.objects
+            .filter(pharmacy=pharmacy, role__in=["admin", "gerant"], is_active=True)
+            .first()
+        )
+        if not user:
+            continue
+
+        # Produits avec du stock non expiré : les ventes doivent réussir
+        product_ids = list(
+            Product.objects.for_pharmacy(pharmacy)
+            .filter(is_active=True)
+            .annotate(stock=Sum("batches__quantity", filter=Q(batches__expiry_date__gte=today)))
+            .filter(stock__gte=20)
+            .values_list("id", flat=True)[:500]
+        )
+
+        tills.append(Till(
+            pharmacy=pharmacy,
+            token=generate_tokens_for_user(user, pharmacy=pharmacy)["access"],
+            product_ids=[str(pk) for pk in product_ids],
+            supplier_ids=[
+                str(pk) for pk in
+                Supplier.objects.for_pharmacy(pharmacy).values_list("id", flat=True)[:20]
+            ],
+        ))
+
+    if not tills:
+        raise ValueError("No active pharmacy with an admin user (run `manage.py seed` first)")
+
+    # count caisses même avec moins de pharmacies : plusieurs caisses par officine
+    return [tills[i % len(tills)] for i in range(count)]
+
+
+# ======================================================
+# SCÉNARIOS
+# ======================================================
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    ms: float
+    queries: int
+    bytes: int
+
+
+class BenchClient:
+    """
+    Client de test Django qui chronomètre chaque appel et compte
+    ses requêtes SQL (QueryRecorder sur la connexion du thread).
+    `headers` : en-têtes envoyés à chaque appel (ex. Accept-Encoding) ;
+    Sample.bytes est la taille du corps reçu, donc compressé le cas échéant.
+    """
+
+    def __init__(self, token, record=True, headers=None):
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {token}", headers=headers)
+        self.record = record
+        self.samples = []
+
+    def request(self, method, route, data=None, **url_kwargs):
+        url = reverse(route, kwargs=url_kwargs or None)
+        recorder = QueryRecorder()
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            if method == "get":
+                response = self.client.get(url, data)
+            else:
+                response = self.client.post(url, data or {}, content_type="application/json")
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if self.record:
+            self.samples.append(Sample(
+                route=route,
+                status=response.status_code,
+                ms=elapsed,
+                queries=recorder.count,
+                bytes=len(response.content),
+            ))
+
+        return response
+
+    def get(self, route, params=None, **url_kwargs):
+        return self.request("get", route, params, **url_kwargs)
+
+    def post(self, route, data=None, **url_kwargs):
+        return self.request("post", route, data, **url_kwargs)
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    # (bench_client, till, rng, iteration) : une itération du scénario
+    step: Callable
+
+
+def sale_step(bench, till, rng, iteration):
+    if till.product_ids:
+        bench.post("sale-create", {
+            "product_id": rng.choice(till.product_ids),
+            "quantity": rng.choice((1, 1, 1, 2, 3)),
+        })
+
+
+def dashboard_step(bench, till, rng, iteration):
+    bench.get("finance-dashboard")
+    bench.get("intelligence-overview")
+
+
+def stock_entry_step(bench, till, rng, iteration):
+    invoice_number = f"BENCH-{iteration}-{rng.randint(0, 10 ** 6)}"
+
+    created = bench.post("stock-entry-create", {
+        "supplier": rng.choice(till.supplier_ids) if till.supplier_ids else None,
+        "invoice_number": invoice_number,
+        "total_amount": f"{rng.randint(10000, 900000)}.00",
+    })
+    if created.status_code != 201:
+        return
+
+    # L'API de création ne renvoie pas l'id : lookup hors chrono
+    entry_id = (
+        StockEntry.objects.for_pharmacy(till.pharmacy)
+        .filter(invoice_number=invoice_number)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if entry_id:
+        bench.post("stock-entry-validate", pk=entry_id)
+
+
+def audit_step(bench, till, rng, iteration):
+    # Surtout les premières pages, parfois plus profond
+    page = 1 + min(int(rng.expovariate(0.5)), 20)
+
+    if bench.get("sale-audit-log", {"page": page}).status_code == 404:
+        if bench.record:
+            bench.samples.pop()  # page au-delà de la fin : non comptée
+        bench.get("sale-audit-log")
+
+
+def list_step(bench, till, rng, iteration, params=None):
+    bench.get("sale-history", params)
+    bench.get("product-stock", params)
+    bench.get("stock-entry-list", params)
+    bench.get("sale-audit-log", {**(params or {}), "page": 1})
+
+
+def columnar_list_step(bench, till, rng, iteration):
+    list_step(bench, till, rng, iteration, {"format": "columnar"})
+
+
+SCENARIOS = {
+    "sales": Scenario("sales", "Caisses concurrentes sur CreateSaleView", sale_step),
+    "dashboard": Scenario("dashboard", "Polling FinanceDashboardView + IntelligenceView", dashboard_step),
+    "stock": Scenario("stock", "Bons d'entrée : création + validation en masse", stock_entry_step),
+    "audit": Scenario("audit", "Navigation paginée du journal d'audit", audit_step),
+    "lists": Scenario("lists", "Grandes listes (ventes, stock, bons, audit) en JSON", list_step),
+    "lists-columnar": Scenario("lists-columnar", "Mêmes listes en ?format=columnar", columnar_list_step),
+}
+
+
+# ======================================================
+# EXÉCUTION
+# ======================================================
+
+@dataclass
+class ScenarioRun:
+    scenario: str
+    concurrency: int
+    iterations: int
+    wall_seconds: float = 0.0
+    samples: List[Sample] = field(default_factory=list)
+
+
+def run_scenario(scenario, tills, iterations, seed=0, warmup=5, headers=None):
+    """
+    `iterations` itérations réparties sur len(tills) threads (une caisse
+    par thread, chacun avec son client et sa connexion DB).
+    """
+    counter = itertools.count()
+    lock = threading.Lock()
+    run = ScenarioRun(scenario=scenario.name, concurrency=len(tills), iterations=iterations)
+
+    def worker(index):
+        till = tills[index]
+        rng = random.Random(seed * 1000 + index)
+
+        try:
+            # Échauffement (connexion, caches) hors mesure
+            warm = BenchClient(till.token, record=False, headers=headers)
+            for i in range(warmup):
+                scenario.step(warm, till, rng, -1 - i)
+
+            bench = BenchClient(till.token, headers=headers)
+
+            while True:
+                with lock:
+                    iteration = next(counter)
+                if iteration >= iterations:
+                    break
+
+                scenario.step(bench, till, rng, iteration)
+
+            return bench.samples
+        finally:
+            connections.close_all()
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(tills)) as pool:
+        for samples in pool.map(worker, range(len(tills))):
+            run.samples.extend(samples)
+
+    run.wall_seconds = time.perf_counter() - start
+    return run
+
+
+# ======================================================
+# RAPPORT
+# ======================================================
+
+def percentile(sorted_values, pct):
+    """Percentile au rang le plus proche (liste triée)."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def summarize_samples(samples, wall_seconds):
+    durations = sorted(s.ms for s in samples)
+    errors = Counter(s.status for s in samples if s.status >= 400)
+    n = len(samples)
+
+    return {
+        "requests": n,
+        "errors": sum(errors.values()),
+        "error_statuses": {str(k): v for k, v in sorted(errors.items())},
+        "throughput_rps": round(n / wall_seconds, 2) if wall_seconds else None,
+        "latency_ms": {
+            "p50": _round(percentile(durations, 50)),
+            "p95": _round(percentile(durations, 95)),
+            "p99": _round(percentile(durations, 99)),
+            "mean": _round(sum(durations) / n if n else None),
+            "max": _round(durations[-1] if durations else None),
+        },
+        "queries": {
+            "mean": _round(sum(s.queries for s in samples) / n if n else None),
+            "max": max((s.queries for s in samples), default=None),
+        },
+        "bytes_mean": int(sum(s.bytes for s in samples) / n) if n else None,
+    }
+
+
+def summarize_run(run):
+    routes = {}
+    for route in sorted({s.route for s in run.samples}):
+        routes[route] = summarize_samples([s for s in run.samples if s.route == route], run.wall_seconds)
+
+    return {
+        "scenario": run.scenario,
+        "description": SCENARIOS[run.scenario].description,
+        "concurrency": run.concurrency,
+        "iterations": run.iterations,
+        "wall_seconds": round(run.wall_seconds, 3),
+        "total": summarize_samples(run.samples, run.wall_seconds),
+        "routes": routes,
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
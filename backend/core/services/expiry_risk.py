@@ -0,0 +1,146 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import BatchExpiryRisk, PharmacyDataVersion, ProductBatch
+from core.services.forecast import cached_forecast, get_forecast
+
+
+# ======================================================
+# PROJECTION
+# ======================================================
+
+def project_depletion(batches, profile, today, forecast):
+    """
+    Écoulement FIFO des lots d'un produit (expiration la plus proche
+    d'abord, comme SaleCreateSerializer) contre sa demande prévue : chaque
+    lot ne reçoit que ce qui sera vendu avant son expiration, une fois les
+    lots précédents servis. Lots déjà expirés : invendables.
+    -> [(lot, unités vendues d'ici l'expiration, unités restantes)]
+    """
+    allocated = 0.0
+    projection = []
+
+    for batch in batches:
+        quantity, expiry_date = batch[2], batch[3]
+
+        if expiry_date < today or profile is None:
+            projection.append((batch, 0, quantity))
+            continue
+
+        # Vendable jusqu'au jour d'expiration inclus
+        sellable = forecast.cumulative(profile, (expiry_date - today).days + 1) - allocated
+        sold = min(quantity, max(0, math.floor(sellable)))
+
+        allocated += sold
+        projection.append((batch, sold, quantity - sold))
+
+    return projection
+
+
+def compute_expiry_risk(pharmacy, product_ids=None, today=None, forecast=None):
+    """
+    BatchExpiryRisk non enregistrés des lots en stock expirant d'ici
+    EXPIRY_RISK_HORIZON_DAYS (déjà expirés compris), pour tout le
+    catalogue ou les seuls `product_ids`. Prévision du jour (cache) par défaut.
+    """
+    today = today or timezone.localdate()
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    forecast = forecast or get_forecast(pharmacy_id, today)
+    computed_at = timezone.now()
+
+    batches = (
+        ProductBatch.objects.for_pharmacy(pharmacy_id)
+        .filter(
+            quantity__gt=0,
+            expiry_date__lte=today + timedelta(days=settings.EXPIRY_RISK_HORIZON_DAYS),
+        )
+        .order_by("product_id", "expiry_date", "created_at")
+        .values_list("id", "product_id", "quantity", "expiry_date", "purchase_price")
+    )
+
+    if product_ids is None:
+        profiles = forecast.daily()
+    else:
+        batches = batches.filter(product_id__in=product_ids)
+        profiles = {product_id: forecast.profile(product_id) for product_id in product_ids}
+
+    by_product = {}
+    for batch in batches:
+        by_product.setdefault(batch[1], []).append(batch)
+
+    risks = []
+
+    for product_id, product_batches in by_product.items():
+        for batch, sold, left in project_depletion(
+            product_batches, profiles.get(product_id), today, forecast
+        ):
+            if not left:
+                continue
+
+            batch_id, _, quantity, expiry_date, purchase_price = batch
+
+            risks.append(BatchExpiryRisk(
+                pharmacy_id=pharmacy_id,
+                product_id=product_id,
+                batch_id=batch_id,
+                expiry_date=expiry_date,
+                quantity=quantity,
+                projected_sales=sold,
+                quantity_at_risk=left,
+                value_at_risk=left * purchase_price,
+                computed_at=computed_at,
+            ))
+
+    return risks
+
+
+def refresh_expiry_risk(pharmacy, product_ids=None, today=None, forecast=None):
+    """
+    Remplace les lignes à risque de la pharmacie, ou des seuls `product_ids`
+    (incrémental). Sans `product_ids`, incrémente la version des données ;
+    l'appel incrémental la laisse à l'appelant (refresh_after_commit).
+    -> nb de lots à risque recalculés.
+    """
+    if product_ids is not None and not product_ids:
+        return 0
+
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    risks = compute_expiry_risk(pharmacy_id, product_ids, today, forecast)
+
+    # Incrémental : dans la transaction de l'appelant, sans SAVEPOINT
+    with transaction.atomic(savepoint=product_ids is None):
+        existing = BatchExpiryRisk.objects.for_pharmacy(pharmacy_id)
+        if product_ids is not None:
+            existing = existing.filter(product_id__in=product_ids)
+
+        existing.delete()
+        BatchExpiryRisk.objects.bulk_create(risks, batch_size=1000)
+
+        if product_ids is None:
+            PharmacyDataVersion.bump(pharmacy_id)
+
+    return len(risks)
+
+
+def refresh_after_commit(pharmacy, product_ids):
+    """
+    Recalcul incrémental après une vente ou une réception, appelé après
+    COMMIT (transaction.on_commit) : seulement si la prévision du jour est
+    déjà en cache — sinon laissé au job nocturne, une requête n'ajuste
+    jamais le modèle. -> nb de lots à risque recalculés | None (ignoré)
+    """
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    forecast = cached_forecast(pharmacy_id)
+    if forecast is None:
+        return None
+
+    with transaction.atomic():
+        count = refresh_expiry_risk(pharmacy_id, product_ids, forecast=forecast)
+        # Hors de la transaction de l'écriture : sa version est déjà publiée
+        PharmacyDataVersion.bump(pharmacy_id)
+
+    return count
@@ -0,0 +1,259 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Sale
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle : moyenne par jour de semaine
+    np = None
+
+
+# Saisonnalité hebdomadaire (jours)
+SEASON = 7
+
+# Grille (alpha niveau, gamma saison) évaluée pour chaque produit
+ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5)
+GAMMAS = (0.05, 0.1, 0.2, 0.3)
+
+# Semaines prises en compte par la méthode de repli (sans NumPy)
+FALLBACK_WEEKS = 4
+
+
+# ======================================================
+# PRÉVISION
+# ======================================================
+
+@dataclass
+class DemandForecast:
+    """
+    Demande prévue d'une pharmacie, jour par jour à partir de `start`
+    (inclus) sur `horizon` jours : unités par produit et chiffre d'affaires.
+    Produits sans vente sur l'historique : absents (demande nulle).
+    """
+    start: date
+    horizon: int
+    method: str  # "holt_winters" | "weekday_mean"
+    product_ids: List
+    # (produits, horizon) : ndarray float32 avec NumPy, listes sinon
+    quantity: object
+    revenue: List[float]
+
+    def demand(self, days):
+        """{product_id: unités prévues sur les `days` prochains jours}."""
+        days = max(0, days)
+
+        if np is not None and isinstance(self.quantity, np.ndarray):
+            totals = self.quantity[:, :days].sum(axis=1, dtype=float)
+
+            if days > self.horizon:
+                totals += self.quantity[:, -SEASON:].mean(axis=1, dtype=float) * (days - self.horizon)
+
+            totals = totals.tolist()
+        else:
+            totals = [_total(row, days, self.horizon) for row in self.quantity]
+
+        return dict(zip(self.product_ids, totals))
+
+    def revenue_total(self, days):
+        return _total(self.revenue, max(0, days), self.horizon)
+
+    def daily(self):
+        """{product_id: unités prévues jour par jour (horizon jours)}."""
+        rows = self.quantity.tolist() if np is not None and isinstance(self.quantity, np.ndarray) else self.quantity
+
+        return dict(zip(self.product_ids, rows))
+
+    def profile(self, product_id):
+        """Profil daily() d'un seul produit ; None s'il n'a pas de vente."""
+        try:
+            row = self.quantity[self.product_ids.index(product_id)]
+        except ValueError:
+            return None
+
+        return row.tolist() if np is not None and isinstance(row, np.ndarray) else row
+
+    def cumulative(self, daily, days):
+        """Unités prévues sur `days` jours pour un profil de daily()."""
+        return _total(daily, max(0, days), self.horizon)
+
+
+def _total(daily, days, horizon):
+    # Au-delà de l'horizon : moyenne journalière de la dernière semaine prévue
+    total = sum(daily[:days])
+
+    if days > horizon:
+        last_week = daily[-SEASON:]
+        total += sum(last_week) / len(last_week) * (days - horizon)
+
+    return float(total)
+
+
+def sales_history(pharmacy, today, days):
+    """
+    Ventes journalières par produit sur les `days` jours complets avant
+    `today`, en une requête (GROUP BY produit, jour ; index pharmacy+created_at).
+    -> (product_ids, [(ligne produit, jour 0..days-1, unités, CA)])
+    """
+    start = today - timedelta(days=days)
+    tz = timezone.get_current_timezone()
+
+    daily = (
+        Sale.objects.for_pharmacy(pharmacy)
+        .filter(
+            created_at__gte=timezone.make_aware(datetime.combine(start, time.min), tz),
+            created_at__lt=timezone.make_aware(datetime.combine(today, time.min), tz),
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values_list("product_id", "day")
+        .annotate(quantity=Sum("quantity"), revenue=Sum("total_price"))
+        .order_by()
+    )
+
+    index = {}
+    rows = [
+        (index.setdefault(product_id, len(index)), (day - start).days, quantity, revenue)
+        for product_id, day, quantity, revenue in daily
+    ]
+
+    return list(index), rows
+
+
+def build_forecast(pharmacy, today=None):
+    """Ajuste le modèle sur tout le catalogue vendu de la pharmacie."""
+    today = today or timezone.localdate()
+    days = settings.FORECAST_HISTORY_DAYS
+    horizon = settings.FORECAST_HORIZON_DAYS
+
+    product_ids, rows = sales_history(pharmacy, today, days)
+
+    if np is None:
+        quantity, revenue = weekday_mean(len(product_ids), rows, days, horizon)
+        method = "weekday_mean"
+    else:
+        quantity, revenue = holt_winters(len(product_ids), rows, days, horizon)
+        method = "holt_winters"
+
+    return DemandForecast(
+        start=today,
+        horizon=horizon,
+        method=method,
+        product_ids=product_ids,
+        quantity=quantity,
+        revenue=revenue,
+    )
+
+
+def get_forecast(pharmacy, today=None):
+    """
+    Prévision du jour, en cache jusqu'à minuit : le modèle ne voit que les
+    jours complets, les ventes du jour ne la changent pas.
+    """
+    today = today or timezone.localdate()
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    key = _forecast_key(pharmacy_id, today)
+
+    forecast = cache.get(key)
+
+    if forecast is None:
+        forecast = build_forecast(pharmacy_id, today)
+
+        midnight = timezone.make_aware(datetime.combine(today + timedelta(days=1), time.min))
+        cache.set(key, forecast, max(60, int((midnight - timezone.now()).total_seconds())))
+
+    return forecast
+
+
+def cached_forecast(pharmacy, today=None):
+    """Prévision du jour si déjà en cache, sans ajuster le modèle. -> DemandForecast | None"""
+    today = today or timezone.localdate()
+    return cache.get(_forecast_key(getattr(pharmacy, "pk", pharmacy), today))
+
+
+def _forecast_key(pharmacy_id, today):
+    return f"forecast:{pharmacy_id}:{today.isoformat()}"
+
+
+# ======================================================
+# MODÈLES
+# ======================================================
+
+def holt_winters(n_products, rows, days, horizon):
+    """
+    Lissage exponentiel additif niveau + saison hebdomadaire, tous les
+    produits d'un coup : chaque pas de temps est une opération NumPy sur
+    (grille de paramètres x produits). Paramètres retenus par produit :
+    erreur à un pas minimale après deux semaines d'initialisation.
+    Le CA de la pharmacie est une ligne de plus dans la même matrice.
+    """
+    series = np.zeros((n_products + 1, days))
+
+    if rows:
+        product, day, quantity, revenue = (np.array(column) for column in zip(*rows))
+        np.add.at(series, (product.astype(np.intp), day.astype(np.intp)), quantity.astype(float))
+        series[-1] = np.bincount(day.astype(np.intp), weights=revenue.astype(float), minlength=days)
+
+    grid = np.array([(a, g) for a in ALPHAS for g in GAMMAS])
+    alpha = grid[:, 0, None]
+    gamma = grid[:, 1, None]
+
+    # Initialisation : moyennes par jour de semaine des deux premières semaines
+    warmup = 2 * SEASON
+    first_weeks = series[:, :warmup].reshape(len(series), 2, SEASON).mean(axis=1)
+    level0 = first_weeks.mean(axis=1)
+
+    level = np.tile(level0, (len(grid), 1))
+    season = np.tile(first_weeks - level0[:, None], (len(grid), 1, 1))
+    sse = np.zeros_like(level)
+
+    for t in range(days):
+        s = t % SEASON
+        y = series[:, t]
+
+        if t >= warmup:
+            sse += (y - level - season[:, :, s]) ** 2
+
+        new_level = alpha * (y - season[:, :, s]) + (1 - alpha) * level
+        season[:, :, s] = gamma * (y - new_level) + (1 - gamma) * season[:, :, s]
+        level = new_level
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(len(series))
+    steps = (days + np.arange(horizon)) % SEASON
+
+    forecast = level[best, columns][:, None] + season[best, columns][:, steps]
+    forecast = np.clip(forecast, 0, None)
+
+    return forecast[:-1].astype(np.float32), forecast[-1].round(2).tolist()
+
+
+def weekday_mean(n_products, rows, days, horizon):
+    """
+    Repli sans NumPy : moyenne des FALLBACK_WEEKS derniers mêmes jours de
+    semaine (saisonnalité hebdomadaire, pas de lissage).
+    """
+    series = [[0.0] * days for _ in range(n_products + 1)]
+
+    for product, day, quantity, revenue in rows:
+        series[product][day] += quantity
+        series[-1][day] += float(revenue)
+
+    weeks = min(FALLBACK_WEEKS, days // SEASON) or 1
+
+    def predict(row):
+        week_profile = [
+            sum(row[days - SEASON * k + s] for k in range(1, weeks + 1) if days - SEASON * k + s >= 0) / weeks
+            for s in range(SEASON)
+        ]
+        return [week_profile[h % SEASON] for h in range(horizon)]
+
+    forecast = [predict(row) for row in series]
+
+    return forecast[:-1], [round(value, 2) for value in forecast[-1]]
@@ -0,0 +1,233 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import InventoryValuation, Product, ProductBatch, StockMovement, StockSnapshot
+
+
+# ======================================================
+# ÉCRITURE
+# ======================================================
+
+class MovementLine(NamedTuple):
+    product_id: UUID
+    batch_id: Optional[UUID]
+    quantity: int  # signée
+    unit_cost: object
+    reference: Optional[UUID] = None  # sinon : référence commune du mouvement
+
+
+def record_movements(pharmacy_id, kind, lines, *, reference=None, user=None, created_at=None):
+    """
+    Un INSERT groupé pour toutes les lignes (quantités nulles ignorées).
+    À appeler dans la transaction qui modifie les lots.
+    """
+    created_at = created_at or timezone.now()
+
+    return StockMovement.objects.bulk_create([
+        StockMovement(
+            pharmacy_id=pharmacy_id,
+            product_id=line.product_id,
+            batch_id=line.batch_id,
+            kind=kind,
+            quantity=line.quantity,
+            unit_cost=line.unit_cost,
+            reference=line.reference or reference,
+            user=user,
+            created_at=created_at,
+        )
+        for line in (MovementLine(*line) for line in lines)
+        if line.quantity
+    ], batch_size=1000)
+
+
+# ======================================================
+# STOCK À UNE DATE (snapshot + mouvements)
+# ======================================================
+
+def day_start(day):
+    """Minuit local ouvrant `day` : instant des snapshots nocturnes."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def position_at(pharmacy, moment, product_ids=None):
+    """
+    Stock par produit à l'instant `moment`, valorisé au coût des lots :
+    dernier snapshot de la pharmacie antérieur, plus les mouvements depuis.
+    Sans snapshot : tout le journal (qui commence au stock d'ouverture).
+    -> {product_id: (quantité, valeur)} (produits à stock nul omis)
+    """
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+
+    snapshots = StockSnapshot.objects.for_pharmacy(pharmacy_id)
+    movements = StockMovement.objects.for_pharmacy(pharmacy_id).filter(created_at__lte=moment)
+    if product_ids is not None:
+        snapshots = snapshots.filter(product_id__in=product_ids)
+        movements = movements.filter(product_id__in=product_ids)
+
+    base_at = (
+        StockSnapshot.objects.for_pharmacy(pharmacy_id)
+        .filter(taken_at__lte=moment)
+        .aggregate(latest=Max("taken_at"))["latest"]
+    )
+
+    quantities = defaultdict(int)
+    values = defaultdict(Decimal)
+
+    if base_at is not None:
+        for product_id, quantity, value in (
+            snapshots.filter(taken_at=base_at).values_list("product_id", "quantity", "value")
+        ):
+            quantities[product_id] += quantity
+            values[product_id] += value
+        movements = movements.filter(created_at__gt=base_at)
+
+    for product_id, quantity, value in (
+        movements
+        .values("product_id")
+        .annotate(
+            total=Sum("quantity"),
+            total_value=Sum(
+                ExpressionWrapper(
+                    F("quantity") * F("unit_cost"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                )
+            ),
+        )
+        .values_list("product_id", "total", "total_value")
+    ):
+        quantities[product_id] += quantity
+        values[product_id] += value or 0
+
+    return {
+        product_id: (quantity, values[product_id])
+        for product_id, quantity in quantities.items()
+        if quantity
+    }
+
+
+def stock_at(pharmacy, moment, product_ids=None):
+    """Quantités seules de position_at. -> {product_id: quantité}"""
+    return {
+        product_id: quantity
+        for product_id, (quantity, _) in position_at(pharmacy, moment, product_ids).items()
+    }
+
+
+def stock_on_date(pharmacy, day):
+    """Stock valorisé en fin de journée `day` (minuit suivant), par produit, avec son nom."""
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    position = position_at(pharmacy_id, day_start(day + timedelta(days=1)))
+
+    names = dict(
+        Product.objects.for_pharmacy(pharmacy_id)
+        .filter(id__in=list(position))
+        .values_list("id", "name")
+    )
+
+    return sorted(
+        (
+            {
+                "product_id": product_id,
+                "product_name": names.get(product_id, ""),
+                "quantity": quantity,
+                "value": value,
+            }
+            for product_id, (quantity, value) in position.items()
+        ),
+        key=lambda row: (row["product_name"], str(row["product_id"])),
+    )
+
+
+def take_snapshot(pharmacy, day=None):
+    """
+    Snapshot du stock à minuit ouvrant `day` (aujourd'hui par défaut),
+    calculé depuis le snapshot précédent et le journal : une ligne par
+    produit en stock + les totaux de la pharmacie (InventoryValuation).
+    Rejouable : remplace un snapshot existant au même instant.
+    Version des données incrémentée par l'appelant, une fois les jours
+    rejoués (snapshot_stock). -> nb de produits
+    """
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    taken_at = day_start(day or timezone.localdate())
+
+    with transaction.atomic():
+        StockSnapshot.objects.for_pharmacy(pharmacy_id).filter(taken_at=taken_at).delete()
+
+        snapshots = StockSnapshot.objects.bulk_create([
+            StockSnapshot(
+                pharmacy_id=pharmacy_id,
+                product_id=product_id,
+                taken_at=taken_at,
+                quantity=quantity,
+                value=value,
+            )
+            for product_id, (quantity, value) in position_at(pharmacy_id, taken_at).items()
+        ], batch_size=1000)
+
+        InventoryValuation.objects.update_or_create(
+            pharmacy_id=pharmacy_id,
+            taken_at=taken_at,
+            defaults=dict(
+                products=len(snapshots),
+                quantity=sum(snapshot.quantity for snapshot in snapshots),
+                value=sum((snapshot.value for snapshot in snapshots), Decimal("0")),
+            ),
+        )
+
+    return len(snapshots)
+
+
+def prune_snapshots(pharmacy, today=None):
+    """
+    Snapshots produit quotidiens gardés STOCK_SNAPSHOT_DAILY_RETENTION_DAYS ;
+    au-delà, seules les clôtures mensuelles (1er du mois à minuit) restent.
+    Les requêtes à une date ancienne partent alors du mois et du journal.
+    -> nb de lignes supprimées
+    """
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    today = today or timezone.localdate()
+    limit = day_start(today - timedelta(days=settings.STOCK_SNAPSHOT_DAILY_RETENTION_DAYS))
+
+    deleted, _ = (
+        StockSnapshot.objects.for_pharmacy(pharmacy_id)
+        .filter(taken_at__lt=limit)
+        .exclude(taken_at__day=1)
+        .delete()
+    )
+    return deleted
+
+
+# ======================================================
+# CONTRÔLE
+# ======================================================
+
+def ledger_drift(pharmacy):
+    """
+    Lots dont le stock diffère de la somme de leurs mouvements (écriture
+    hors journal). -> [(batch_id, quantité, solde du journal)]
+    """
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+
+    balance = (
+        StockMovement.objects
+        .filter(batch=OuterRef("pk"))
+        .values("batch")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+
+    return list(
+        ProductBatch.objects.for_pharmacy(pharmacy_id)
+        .annotate(ledger=Coalesce(Subquery(balance), 0))
+        .exclude(quantity=F("ledger"))
+        .values_list("id", "quantity", "ledger")
+    )
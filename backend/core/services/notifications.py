@@ -1,8 +1,10 @@
 from django.core.mail import send_mail
+from django.db import models
 from django.conf import settings
 from django.utils.timezone import now, timedelta
 
 from core.models import (
+    BatchExpiryRisk,
     SaleAuditLog,
     Product,
     ProductBatch,
@@ -83,7 +85,7 @@ def notify_expired_products(pharmacy):
     today = now().date()
 
     expired_batches = ProductBatch.objects.filter(
-        product__pharmacy=pharmacy,
+        pharmacy=pharmacy,
         expiry_date__lt=today,
         quantity__gt=0,
     ).select_related("product")
@@ -115,32 +117,33 @@ Merci d’agir immédiatement (retrait / destruction).
 
 def notify_expiring_soon_products(pharmacy, days=30):
     """
-    Alerte produits expirant bientôt
+    Alerte lots qui expireront avant d'être vendus, d'ici `days` jours
+    (projection précalculée : core.services.expiry_risk)
     """
     today = now().date()
     limit_date = today + timedelta(days=days)
 
-    batches = ProductBatch.objects.filter(
-        product__pharmacy=pharmacy,
+    risks = BatchExpiryRisk.objects.filter(
+        pharmacy=pharmacy,
         expiry_date__range=(today, limit_date),
-        quantity__gt=0,
     ).select_related("product")
 
-    if not batches.exists():
-        return
-
     lines = []
-    for batch in batches:
-        remaining_days = (batch.expiry_date - today).days
+    for risk in risks:
+        remaining_days = (risk.expiry_date - today).days
         lines.append(
-            f"- {batch.product.name} ({batch.quantity}) – expire dans {remaining_days} jours"
+            f"- {risk.product.name} : {risk.quantity_at_risk} / {risk.quantity} invendus "
+            f"prévus ({risk.value_at_risk}) – expire dans {remaining_days} jours"
         )
 
+    if not lines:
+        return
+
     subject = "⚠️ Produits proches d’expiration"
     message = f"""
 Attention ⚠️
 
-Les produits suivants expirent dans moins de {days} jours :
+Au rythme de vente prévu, les lots suivants expireront dans moins de {days} jours sans être écoulés :
 
 {chr(10).join(lines)}
 
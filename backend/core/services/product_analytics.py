@@ -0,0 +1,256 @@
+import math
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    RowRange,
+    Subquery,
+    Sum,
+    Value,
+    Window,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import (
+    PharmacyDataVersion,
+    Product,
+    ProductAnalytics,
+    ProductBatch,
+    Sale,
+)
+from core.services.forecast import SEASON, sales_history
+
+
+# Part cumulée de la marge : A jusqu'à 80 %, B jusqu'à 95 %, C au-delà
+ABC_LIMITS = (0.80, 0.95)
+
+# Coefficient de variation des ventes hebdomadaires : X <= 0.5 < Y <= 1 < Z
+XYZ_LIMITS = (0.5, 1.0)
+
+AMOUNT = DecimalField(max_digits=14, decimal_places=2)
+
+
+# ======================================================
+# INDICATEURS
+# ======================================================
+
+def product_metrics(pharmacy, today, days):
+    """
+    Une ligne par produit actif, en une requête : ventes de la fenêtre,
+    dernière vente et stock vendable en sous-requêtes corrélées, puis
+    fonctions de fenêtre sur le résultat (marge totale de la pharmacie,
+    marge cumulée des produits qui rapportent plus) pour le classement ABC.
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(today - timedelta(days=days), time.min), tz)
+    end = timezone.make_aware(datetime.combine(today, time.min), tz)
+
+    sales = (
+        Sale.objects
+        .filter(product=OuterRef("pk"), created_at__gte=start, created_at__lt=end)
+        .order_by()
+        .values("product")
+    )
+    batches = (
+        ProductBatch.objects
+        .filter(product=OuterRef("pk"), quantity__gt=0, expiry_date__gte=today)
+        .order_by()
+        .values("product")
+    )
+
+    def total(queryset, expression, zero=Value(0)):
+        return Coalesce(
+            Subquery(queryset.annotate(total=Sum(expression)).values("total")),
+            zero,
+        )
+
+    margin_rank = [F("margin").desc(), F("id").asc()]
+
+    return (
+        Product.objects.for_pharmacy(pharmacy)
+        .filter(is_active=True)
+        .annotate(
+            units_sold=total(sales, "quantity"),
+            revenue=total(sales, "total_price", Value(Decimal("0"), output_field=AMOUNT)),
+            margin=total(
+                sales,
+                ExpressionWrapper(F("total_price") - F("cost_total"), output_field=AMOUNT),
+                Value(Decimal("0"), output_field=AMOUNT),
+            ),
+            stock=total(batches, "quantity"),
+            stock_value=total(
+                batches,
+                ExpressionWrapper(F("quantity") * F("purchase_price"), output_field=AMOUNT),
+                Value(Decimal("0"), output_field=AMOUNT),
+            ),
+            last_sale_at=Subquery(
+                Sale.objects.filter(product=OuterRef("pk")).order_by("-created_at").values("created_at")[:1]
+            ),
+        )
+        .annotate(
+            # Marge positive seulement : les produits à perte ne diluent pas les parts
+            total_margin=Window(Sum("margin", filter=Q(margin__gt=0))),
+            cumulative_margin=Window(
+                Sum("margin"),
+                order_by=margin_rank,
+                frame=RowRange(start=None, end=0),
+            ),
+        )
+        .order_by(*margin_rank)
+        .values(
+            "id", "created_at", "units_sold", "revenue", "margin", "stock", "stock_value",
+            "last_sale_at", "total_margin", "cumulative_margin",
+        )
+    )
+
+
+def demand_variation(pharmacy, today, days):
+    """
+    {product_id: coefficient de variation des ventes par semaine} sur les
+    semaines complètes de la fenêtre (semaines sans vente comptées à 0).
+    """
+    product_ids, rows = sales_history(pharmacy, today, days)
+    weeks = max(1, days // SEASON)
+    offset = days - weeks * SEASON
+
+    weekly = [[0.0] * weeks for _ in product_ids]
+    for product, day, quantity, _ in rows:
+        if day >= offset:
+            weekly[product][(day - offset) // SEASON] += quantity
+
+    variation = {}
+    for product_id, series in zip(product_ids, weekly):
+        mean = sum(series) / weeks
+        if mean:
+            variance = sum((value - mean) ** 2 for value in series) / weeks
+            variation[product_id] = math.sqrt(variance) / mean
+
+    return variation
+
+
+def abc_class(margin, margin_before, total_margin):
+    if margin <= 0 or total_margin <= 0:
+        return "C"
+
+    share_before = margin_before / total_margin
+    if share_before < ABC_LIMITS[0]:
+        return "A"
+    if share_before < ABC_LIMITS[1]:
+        return "B"
+    return "C"
+
+
+def xyz_class(cv):
+    if cv is None:
+        return "Z"
+    if cv <= XYZ_LIMITS[0]:
+        return "X"
+    if cv <= XYZ_LIMITS[1]:
+        return "Y"
+    return "Z"
+
+
+def product_flag(stock, idle_days, abc, days_of_cover):
+    """Sous-performant : stock dormant, ou classe C couverte bien au-delà du seuil."""
+    if not stock:
+        return ""
+    if idle_days >= settings.ANALYTICS_DEAD_STOCK_DAYS:
+        return "dead_stock"
+    if abc == "C" and days_of_cover is not None and days_of_cover > settings.ANALYTICS_SLOW_MOVING_COVER_DAYS:
+        return "slow_moving"
+    return ""
+
+
+def compute_product_analytics(pharmacy, today=None):
+    """ProductAnalytics non enregistrés, un par produit actif."""
+    today = today or timezone.localdate()
+    days = settings.ANALYTICS_WINDOW_DAYS
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    computed_at = timezone.now()
+
+    variation = demand_variation(pharmacy_id, today, days)
+    results = []
+
+    for row in product_metrics(pharmacy_id, today, days):
+        units = row["units_sold"]
+        stock = row["stock"]
+        margin = Decimal(row["margin"])
+        total_margin = float(row["total_margin"] or 0)
+
+        last_sale_at = row["last_sale_at"]
+        # Jamais vendu : inactif depuis la création de la fiche
+        idle_since = timezone.localdate(last_sale_at or row["created_at"])
+        idle_days = max(0, (today - idle_since).days)
+
+        days_of_cover = round(stock / (units / days), 1) if units else None
+        # Marge cumulée des produits classés avant celui-ci
+        margin_before = float(row["cumulative_margin"]) - float(margin)
+        abc = abc_class(float(margin), margin_before, total_margin)
+
+        results.append(ProductAnalytics(
+            pharmacy_id=pharmacy_id,
+            product_id=row["id"],
+            window_days=days,
+            units_sold=units,
+            revenue=row["revenue"],
+            margin=margin,
+            stock=stock,
+            stock_value=row["stock_value"],
+            sell_through=round(units / (units + stock), 4) if units + stock else None,
+            days_of_cover=days_of_cover,
+            margin_share=round(float(margin) / total_margin, 4) if total_margin > 0 else 0,
+            demand_cv=round(variation[row["id"]], 3) if row["id"] in variation else None,
+            last_sale_at=last_sale_at,
+            days_since_last_sale=idle_days,
+            abc_class=abc,
+            xyz_class=xyz_class(variation.get(row["id"])),
+            flag=product_flag(stock, idle_days, abc, days_of_cover),
+            computed_at=computed_at,
+        ))
+
+    return results
+
+
+def refresh_product_analytics(pharmacy, today=None):
+    """Remplace les indicateurs de la pharmacie (une transaction). -> nb de produits."""
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    analytics = compute_product_analytics(pharmacy_id, today)
+
+    with transaction.atomic():
+        ProductAnalytics.objects.for_pharmacy(pharmacy_id).delete()
+        ProductAnalytics.objects.bulk_create(analytics, batch_size=1000)
+        PharmacyDataVersion.bump(pharmacy_id)
+
+    return len(analytics)
+
+
+# ======================================================
+# LECTURE
+# ======================================================
+
+def underperforming_products(pharmacy, limit=10):
+    """Produits signalés au dernier calcul, par valeur immobilisée décroissante."""
+    return [
+        {
+            **row,
+            "stock_value": float(row["stock_value"]),
+        }
+        for row in (
+            ProductAnalytics.objects.for_pharmacy(pharmacy)
+            .exclude(flag="")
+            .order_by("-stock_value", "product__name")
+            .values(
+                "product_id", "flag", "abc_class", "xyz_class", "stock", "stock_value",
+                "days_since_last_sale", "days_of_cover", "sell_through",
+                product_name=F("product__name"),
+            )[:limit]
+        )
+    ]
@@ -0,0 +1,220 @@
+import math
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum, UUIDField
+from django.utils import timezone
+
+from core.models import (
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    StockEntry,
+    StockEntryItem,
+    Supplier,
+)
+from core.services.expiry_risk import project_depletion
+from core.services.forecast import get_forecast
+
+
+# ======================================================
+# SUGGESTIONS
+# ======================================================
+
+@dataclass
+class ReorderSuggestion:
+    product_id: object
+    product_name: str
+    supplier_id: Optional[object]
+    lead_time_days: int
+    # Unités
+    stock: int              # lots non expirés
+    usable_stock: int       # dont vendable avant expiration (prévision)
+    at_risk: int            # dont expirera invendu sur l'horizon
+    on_order: int           # bons brouillons saisis (hors réappro auto)
+    demand: float           # prévue sur délai + couverture
+    target: int             # demande + stock de sécurité, au moins min_stock_level
+    quantity: int           # à commander
+    unit_cost: Decimal      # dernier prix d'achat connu
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def usable_quantity(batches, profile, horizon, today, forecast):
+    """
+    Écoulement FIFO contre la demande prévue (project_depletion, comme le
+    risque de péremption), borné à l'horizon : un lot qui expire avant ne
+    compte que pour ce qui sera vendu d'ici là. -> (utilisable, à risque)
+    """
+    usable = at_risk = 0
+
+    for batch, sold, left in project_depletion(batches, profile, today, forecast):
+        if (batch[3] - today).days + 1 >= horizon:
+            usable += batch[2]
+        else:
+            usable += sold
+            at_risk += left
+
+    return usable, at_risk
+
+
+def reorder_suggestions(pharmacy, today=None):
+    """
+    Quantités à commander pour tout le catalogue actif, en un passage :
+    produits (+ dernier fournisseur / prix d'achat), lots vendables,
+    commandes en cours, délais fournisseurs et prévision du jour.
+    Horizon par produit : délai du fournisseur + REORDER_COVERAGE_DAYS.
+    """
+    today = today or timezone.localdate()
+    forecast = get_forecast(pharmacy, today)
+    profiles = forecast.daily()
+
+    last_receipt = (
+        StockEntryItem.objects
+        .filter(
+            product=OuterRef("pk"),
+            stock_entry__status="validated",
+            stock_entry__supplier__isnull=False,
+        )
+        .order_by("-stock_entry__created_at")
+    )
+    last_batch = ProductBatch.objects.filter(product=OuterRef("pk")).order_by("-created_at")
+
+    products = (
+        Product.objects.for_pharmacy(pharmacy)
+        .filter(is_active=True)
+        .annotate(
+            supplier_id=Subquery(
+                last_receipt.values("stock_entry__supplier_id")[:1],
+                output_field=UUIDField(),
+            ),
+            unit_cost=Subquery(last_batch.values("purchase_price")[:1]),
+        )
+        .values_list("id", "name", "min_stock_level", "supplier_id", "unit_cost")
+    )
+
+    batches = defaultdict(list)
+    for batch in (
+        ProductBatch.objects.for_pharmacy(pharmacy)
+        .filter(quantity__gt=0, expiry_date__gte=today)
+        .order_by("product_id", "expiry_date", "created_at")
+        .values_list("id", "product_id", "quantity", "expiry_date")
+    ):
+        batches[batch[1]].append(batch)
+
+    on_order = dict(
+        StockEntryItem.objects
+        .filter(stock_entry__pharmacy=pharmacy, stock_entry__status="draft")
+        .exclude(stock_entry__origin="reorder")
+        .values("product_id")
+        .annotate(quantity=Sum("quantity"))
+        .values_list("product_id", "quantity")
+    )
+
+    lead_times = dict(Supplier.objects.for_pharmacy(pharmacy).values_list("id", "lead_time_days"))
+
+    suggestions = []
+
+    for product_id, name, min_stock_level, supplier_id, unit_cost in products:
+        lead_time = lead_times.get(supplier_id, settings.REORDER_DEFAULT_LEAD_TIME_DAYS)
+        horizon = lead_time + settings.REORDER_COVERAGE_DAYS
+        profile = profiles.get(product_id)
+
+        if profile is None:
+            demand = safety = 0.0
+        else:
+            demand = forecast.cumulative(profile, horizon)
+            safety = demand / horizon * settings.REORDER_SAFETY_DAYS
+
+        product_batches = batches.get(product_id, [])
+        stock = sum(batch[2] for batch in product_batches)
+        usable, at_risk = (
+            usable_quantity(product_batches, profile, horizon, today, forecast)
+            if profile is not None else (stock, 0)
+        )
+
+        target = max(math.ceil(demand + safety), min_stock_level)
+        pending = on_order.get(product_id, 0)
+        quantity = target - usable - pending
+
+        if quantity <= 0:
+            continue
+
+        suggestions.append(ReorderSuggestion(
+            product_id=product_id,
+            product_name=name,
+            supplier_id=supplier_id,
+            lead_time_days=lead_time,
+            stock=stock,
+            usable_stock=usable,
+            at_risk=at_risk,
+            on_order=pending,
+            demand=round(demand, 2),
+            target=target,
+            quantity=quantity,
+            unit_cost=unit_cost or Decimal("0"),
+        ))
+
+    suggestions.sort(key=lambda s: (str(s.supplier_id), s.product_name))
+    return suggestions
+
+
+# ======================================================
+# BONS DE COMMANDE BROUILLONS
+# ======================================================
+
+def create_reorder_drafts(pharmacy, suggestions, today=None) -> List[StockEntry]:
+    """
+    Un StockEntry brouillon (origin="reorder") par fournisseur, lignes en
+    bulk. Les brouillons automatiques encore non validés sont remplacés :
+    relancer le job ne duplique pas les commandes. `entry.lines` : nb de lignes.
+    """
+    today = today or timezone.localdate()
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+
+    by_supplier = defaultdict(list)
+    for suggestion in suggestions:
+        by_supplier[suggestion.supplier_id].append(suggestion)
+
+    with transaction.atomic():
+        StockEntry.objects.filter(pharmacy_id=pharmacy_id, origin="reorder", status="draft").delete()
+
+        entries = [
+            StockEntry(
+                pharmacy_id=pharmacy_id,
+                supplier_id=supplier_id,
+                origin="reorder",
+                status="draft",
+                invoice_number=f"REAPPRO-{today:%Y%m%d}",
+                total_amount=sum(s.quantity * s.unit_cost for s in lines),
+            )
+            for supplier_id, lines in by_supplier.items()
+        ]
+        StockEntry.objects.bulk_create(entries)
+
+        for entry, lines in zip(entries, by_supplier.values()):
+            entry.lines = len(lines)
+
+        StockEntryItem.objects.bulk_create(
+            [
+                StockEntryItem(
+                    stock_entry=entry,
+                    product_id=s.product_id,
+                    quantity=s.quantity,
+                    purchase_price=s.unit_cost,
+                    line_total=s.quantity * s.unit_cost,
+                )
+                for entry, lines in zip(entries, by_supplier.values())
+                for s in lines
+            ],
+            batch_size=1000,
+        )
+
+        PharmacyDataVersion.bump(pharmacy_id)
+
+    return entries
@@ -0,0 +1,98 @@
+from django.db import transaction, IntegrityError
+from django.db.models import Sum, Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Sale, PlatformDailySales
+
+
+# ======================================================
+# INCRÉMENTAL (chemin de vente)
+# ======================================================
+
+def record_sale_in_rollups(sale):
+    """
+    Ajoute une vente au rollup plateforme du jour.
+    UPDATE atomique (F()) : pas de lecture/écriture concurrente perdue ;
+    la ligne du jour n'est créée que pour la première vente.
+    Appelée après COMMIT (transaction.on_commit) : le verrou de la ligne
+    unique du jour ne dure que l'UPDATE, pas la transaction de chaque caisse ;
+    une vente perdue entre COMMIT et incrément est rattrapée par rebuild_rollups.
+    """
+    day = timezone.localdate(sale.created_at)
+
+    increments = dict(
+        revenue=F("revenue") + sale.total_price,
+        cogs=F("cogs") + sale.cost_total,
+        sales_count=F("sales_count") + 1,
+        updated_at=timezone.now(),
+    )
+
+    if PlatformDailySales.objects.filter(date=day).update(**increments):
+        return
+
+    try:
+        with transaction.atomic():
+            PlatformDailySales.objects.create(
+                date=day,
+                revenue=sale.total_price,
+                cogs=sale.cost_total,
+                sales_count=1,
+            )
+    except IntegrityError:
+        # Créée entre-temps par une vente concurrente
+        PlatformDailySales.objects.filter(date=day).update(**increments)
+
+
+# ======================================================
+# RECONSTRUCTION (backfill / correction)
+# ======================================================
+
+def rebuild_platform_rollup(since=None):
+    """
+    Recalcule le rollup plateforme depuis Sale (à partir de `since` inclus).
+    Retourne le nombre de jours écrits.
+    """
+    sales = Sale.objects.all()
+    if since:
+        sales = sales.filter(created_at__date__gte=since)
+
+    daily = (
+        sales
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            revenue=Sum("total_price"),
+            cogs=Sum("cost_total"),
+            sales_count=Count("id"),
+        )
+        .order_by("day")
+    )
+
+    updated_at = timezone.now()
+
+    rows = [
+        PlatformDailySales(
+            date=item["day"],
+            revenue=item["revenue"] or 0,
+            cogs=item["cogs"] or 0,
+            sales_count=item["sales_count"],
+            updated_at=updated_at,
+        )
+        for item in daily
+    ]
+
+    stale = PlatformDailySales.objects.all()
+    if since:
+        stale = stale.filter(date__gte=since)
+    stale.exclude(date__in=[r.date for r in rows]).delete()
+
+    PlatformDailySales.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["date"],
+        update_fields=["revenue", "cogs", "sales_count", "updated_at"],
+    )
+
+    return len(rows)
@@ -0,0 +1,262 @@
+import logging
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from io import StringIO
+from multiprocessing import get_context
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cron import CronSchedule
+from core.models import JobRun, Pharmacy, ScheduledJob
+from core.services import scheduler_worker
+
+logger = logging.getLogger(__name__)
+
+
+def node_name():
+    """Identifiant du nœud qui détient un verrou (hôte:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+# ======================================================
+# DÉFINITIONS (settings.SCHEDULER_JOBS)
+# ======================================================
+
+def sync_jobs(definitions=None, now=None):
+    """
+    Crée les tâches de SCHEDULER_JOBS absentes de la base. Les tâches
+    existantes ne sont pas écrasées (planning / activation modifiés en
+    base conservés) ; next_run_at calculé pour celles qui n'en ont pas.
+    -> nb de tâches créées
+    """
+    definitions = settings.SCHEDULER_JOBS if definitions is None else definitions
+    now = now or timezone.now()
+
+    existing = set(ScheduledJob.objects.filter(name__in=definitions).values_list("name", flat=True))
+
+    ScheduledJob.objects.bulk_create([
+        ScheduledJob(
+            name=name,
+            command=definition["command"],
+            arguments=definition.get("arguments", []),
+            schedule=definition["schedule"],
+            per_tenant=definition.get("per_tenant", False),
+            next_run_at=CronSchedule(definition["schedule"]).next_after(now),
+        )
+        for name, definition in definitions.items()
+        if name not in existing
+    ])
+
+    for job in ScheduledJob.objects.filter(next_run_at__isnull=True):
+        job.next_run_at = CronSchedule(job.schedule).next_after(now)
+        job.save(update_fields=["next_run_at"])
+
+    return len(definitions) - len(existing)
+
+
+# ======================================================
+# VERROU
+# ======================================================
+
+def claim(job, node, now=None):
+    """
+    Prend le verrou de la tâche par un UPDATE conditionnel (compare-and-set,
+    sans SELECT FOR UPDATE) : un seul nœud voit 1 ligne modifiée. Le bail
+    expire après SCHEDULER_LOCK_SECONDS si le nœud meurt en cours de route.
+    Seulement pour l'occurrence lue (`job.next_run_at`) : une lecture périmée
+    de due_jobs() ne relance pas une occurrence déjà exécutée et libérée.
+    Occurrence échue consommée dans le même UPDATE (next_run_at avancé) : un
+    run plus long que le bail n'est pas repris par un autre nœud. Lancement
+    manuel avant l'échéance : l'occurrence planifiée est conservée.
+    """
+    now = now or timezone.now()
+
+    next_run_at = job.next_run_at
+    if next_run_at is not None and next_run_at <= now:
+        next_run_at = CronSchedule(job.schedule).next_after(now)
+
+    claimed = (
+        ScheduledJob.objects
+        .filter(pk=job.pk, is_enabled=True, next_run_at=job.next_run_at)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(
+            locked_by=node,
+            locked_until=now + timedelta(seconds=settings.SCHEDULER_LOCK_SECONDS),
+            next_run_at=next_run_at,
+        )
+    )
+    return claimed == 1
+
+
+def release(job, node, now=None):
+    """
+    Libère le verrou (s'il est toujours à nous) et planifie l'occurrence
+    suivante : celles passées pendant un run long sont sautées.
+    """
+    now = now or timezone.now()
+
+    ScheduledJob.objects.filter(pk=job.pk, locked_by=node).update(
+        locked_by="",
+        locked_until=None,
+        next_run_at=CronSchedule(job.schedule).next_after(now),
+    )
+
+
+def due_jobs(now=None):
+    now = now or timezone.now()
+
+    return list(
+        ScheduledJob.objects
+        .filter(is_enabled=True, next_run_at__lte=now)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .order_by("next_run_at")
+    )
+
+
+# ======================================================
+# EXÉCUTION
+# ======================================================
+
+@dataclass
+class TaskResult:
+    pharmacy_id: Optional[str]
+    ok: bool
+    duration_ms: int
+    error: str = ""
+
+
+def run_command(command, arguments, pharmacy_id=None):
+    """
+    Lance une commande de gestion (dans le processus courant ou un worker).
+    Échec : exception, ou sortie d'erreur non vide (les commandes nocturnes
+    isolent un tenant en échec et le signalent sur stderr).
+    """
+    args = list(arguments) + (["--pharmacy", pharmacy_id] if pharmacy_id else [])
+    stdout, stderr = StringIO(), StringIO()
+    started = time.perf_counter()
+
+    try:
+        call_command(command, *args, stdout=stdout, stderr=stderr)
+        error = stderr.getvalue().strip()
+    except Exception as exc:
+        logger.exception("Scheduled command %s failed (pharmacy %s)", command, pharmacy_id)
+        error = f"{type(exc).__name__}: {exc}"
+
+    return TaskResult(
+        pharmacy_id=pharmacy_id,
+        ok=not error,
+        duration_ms=int((time.perf_counter() - started) * 1000),
+        error=error,
+    )
+
+
+def fan_out(command, arguments, pharmacy_ids, workers=None) -> List[TaskResult]:
+    """
+    Une exécution par pharmacie, sur SCHEDULER_WORKERS processus. 0 ou 1 :
+    séquentiel dans le processus courant (tests, SQLite en mémoire).
+    """
+    workers = settings.SCHEDULER_WORKERS if workers is None else workers
+
+    if workers <= 1 or len(pharmacy_ids) <= 1:
+        return [run_command(command, arguments, pharmacy_id) for pharmacy_id in pharmacy_ids]
+
+    # Aucune connexion du parent ne doit survivre côté workers
+    connections.close_all()
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(pharmacy_ids)),
+        mp_context=get_context("spawn"),
+        initializer=scheduler_worker.setup,
+    ) as pool:
+        futures = [
+            pool.submit(scheduler_worker.run, command, arguments, pharmacy_id)
+            for pharmacy_id in pharmacy_ids
+        ]
+        results = []
+
+        for pharmacy_id, future in zip(pharmacy_ids, futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:  # worker mort (OOM, signal)
+                results.append(TaskResult(pharmacy_id, False, 0, f"{type(exc).__name__}: {exc}"))
+
+    return results
+
+
+def tenant_ids():
+    """Pharmacies traitées par les tâches par tenant (mêmes critères que les commandes)."""
+    return [
+        str(pk) for pk in
+        Pharmacy.objects
+        .filter(is_active=True, subscription_status__in=["active", "trialing"])
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    ]
+
+
+def run_job(job, node) -> JobRun:
+    """Exécute une tâche dont on détient le verrou et enregistre ses métriques."""
+    run = JobRun.objects.create(job=job, node=node)
+    started = time.perf_counter()
+
+    try:
+        if job.per_tenant:
+            results = fan_out(job.command, job.arguments, tenant_ids())
+        else:
+            results = [run_command(job.command, job.arguments)]
+    except Exception as exc:
+        logger.exception("Scheduled job %s crashed", job.name)
+        results = [TaskResult(None, False, 0, f"{type(exc).__name__}: {exc}")]
+
+    failed = [result for result in results if not result.ok]
+
+    run.finished_at = timezone.now()
+    run.duration_ms = int((time.perf_counter() - started) * 1000)
+    run.tenants_total = len(results) if job.per_tenant else 0
+    run.tenants_failed = len(failed) if job.per_tenant else 0
+    run.slowest_tenant_ms = max((r.duration_ms for r in results), default=0) if job.per_tenant else 0
+    run.status = (
+        "success" if not failed else
+        "partial" if len(failed) < len(results) else
+        "failed"
+    )
+    run.error = "\n".join(
+        f"[{result.pharmacy_id}] {result.error}" if result.pharmacy_id else result.error
+        for result in failed
+    )[:10000]
+    run.save()
+
+    logger.info(
+        "Scheduled job %s: %s in %d ms (%d/%d tenants failed)",
+        job.name, run.status, run.duration_ms, run.tenants_failed, run.tenants_total,
+    )
+    return run
+
+
+def tick(node=None, now=None) -> List[JobRun]:
+    """
+    Un passage du planificateur : chaque tâche échue est verrouillée puis
+    exécutée ; un autre nœud qui l'a déjà prise est ignoré.
+    """
+    node = node or node_name()
+    runs = []
+
+    for job in due_jobs(now):
+        if not claim(job, node, now):
+            continue
+
+        try:
+            runs.append(run_job(job, node))
+        finally:
+            release(job, node)
+
+    return runs
@@ -0,0 +1,23 @@
+"""
+Points d'entrée des workers du planificateur (pool "spawn").
+Module sans import de modèles : le worker le dé-sérialise avant que
+django.setup() n'ait tourné.
+"""
+
+import django
+from django.db import close_old_connections
+
+
+def setup():
+    # DJANGO_SETTINGS_MODULE hérité du processus parent
+    django.setup()
+
+
+def run(command, arguments, pharmacy_id):
+    from core.services.scheduler import run_command
+
+    try:
+        return run_command(command, arguments, pharmacy_id)
+    finally:
+        # Worker longue durée : pas de connexion laissée ouverte entre tâches
+        close_old_connections()
@@ -0,0 +1,302 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    PharmacyDataVersion,
+    ProductBatch,
+    StockAdjustment,
+    StockCount,
+    StockCountLine,
+)
+from core.services.ledger import record_movements
+
+
+# ======================================================
+# SESSION
+# ======================================================
+
+def open_count(pharmacy, user=None, full=False, note=""):
+    """Nouvelle session ; refusée si une autre est déjà ouverte."""
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+
+    if StockCount.objects.for_pharmacy(pharmacy_id).filter(status="open").exists():
+        raise ValidationError({"detail": "Un inventaire est déjà en cours"})
+
+    try:
+        with transaction.atomic():
+            count = StockCount.objects.create(pharmacy_id=pharmacy_id, created_by=user, full=full, note=note)
+    except IntegrityError:
+        # Ouverte entre-temps par une requête concurrente (contrainte : une session ouverte)
+        raise ValidationError({"detail": "Un inventaire est déjà en cours"})
+
+    PharmacyDataVersion.bump(pharmacy_id)
+    return count
+
+
+def cancel_count(count):
+    """Abandon sans effet sur le stock (lignes conservées)."""
+    updated = StockCount.objects.filter(pk=count.pk, status="open").update(status="cancelled")
+    if not updated:
+        raise ValidationError({"detail": "Inventaire déjà clôturé ou annulé"})
+
+    PharmacyDataVersion.bump(count.pharmacy_id)
+
+
+# ======================================================
+# COMPTAGE (envois des scanners)
+# ======================================================
+
+def record_counts(count, lines, counted_at=None):
+    """
+    Enregistre un envoi [(batch_id, quantité comptée)] : une lecture des lots
+    (stock attendu à l'instant du scan), puis un seul INSERT ... ON CONFLICT
+    (re-scan d'un lot : la ligne est remplacée). Doublons de l'envoi : le dernier gagne.
+    -> {"received", "unknown": [batch_id]}
+    """
+    counted_at = counted_at or timezone.now()
+    counted = dict(lines)
+
+    batches = (
+        ProductBatch.objects.for_pharmacy(count.pharmacy_id)
+        .filter(id__in=list(counted))
+        .values_list("id", "product_id", "quantity")
+    )
+
+    rows = StockCountLine.objects.bulk_create(
+        [
+            StockCountLine(
+                count=count,
+                pharmacy_id=count.pharmacy_id,
+                product_id=product_id,
+                batch_id=batch_id,
+                counted_quantity=counted[batch_id],
+                expected_quantity=quantity,
+                counted_at=counted_at,
+            )
+            for batch_id, product_id, quantity in batches
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["count", "batch"],
+        update_fields=["counted_quantity", "expected_quantity", "counted_at"],
+    )
+
+    PharmacyDataVersion.bump(count.pharmacy_id)
+
+    known = {row.batch_id for row in rows}
+    return {"received": len(rows), "unknown": [batch_id for batch_id in counted if batch_id not in known]}
+
+
+# ======================================================
+# ÉCARTS (ensemblistes)
+# ======================================================
+
+def variance_lines(count):
+    """Lignes de la session avec leur écart (compté - attendu) et sa valeur au coût du lot."""
+    variance = F("counted_quantity") - F("expected_quantity")
+
+    return (
+        StockCountLine.objects
+        .filter(count=count)
+        .annotate(
+            variance=variance,
+            variance_value=ExpressionWrapper(
+                variance * F("batch__purchase_price"),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+    )
+
+
+def uncounted_batches(count):
+    """Lots en stock absents de la session (passés à 0 par un inventaire complet)."""
+    return (
+        ProductBatch.objects.for_pharmacy(count.pharmacy_id)
+        .filter(quantity__gt=0)
+        .exclude(id__in=StockCountLine.objects.filter(count=count).values("batch_id"))
+    )
+
+
+def count_variance_queries(count):
+    """{nom: callable} — rapport d'écarts d'une session, une requête par bloc."""
+    lines = variance_lines(count)
+
+    return {
+        "totals": lambda: lines.aggregate(
+            lines=Count("id"),
+            counted=Sum("counted_quantity"),
+            gained=Sum("variance", filter=Q(variance__gt=0)),
+            lost=Sum("variance", filter=Q(variance__lt=0)),
+            value=Sum("variance_value"),
+        ),
+        "variances": lambda: list(
+            lines
+            .exclude(variance=0)
+            .order_by("variance_value", "product__name")
+            .values(
+                "batch_id",
+                "product_id",
+                "product__name",
+                "batch__expiry_date",
+                "expected_quantity",
+                "counted_quantity",
+                "variance",
+                "variance_value",
+            )
+        ),
+        "uncounted": lambda: uncounted_batches(count).aggregate(
+            batches=Count("id"),
+            units=Sum("quantity"),
+            value=Sum(
+                ExpressionWrapper(
+                    F("quantity") * F("purchase_price"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                )
+            ),
+        ),
+    }
+
+
+def build_variance_report(count, results):
+    totals = results["totals"]
+    uncounted = results["uncounted"]
+
+    return {
+        "id": count.id,
+        "status": count.status,
+        "full": count.full,
+        "note": count.note,
+        "created_at": count.created_at,
+        "posted_at": count.posted_at,
+        "totals": {
+            "lines": totals["lines"],
+            "counted": totals["counted"] or 0,
+            "units_gained": totals["gained"] or 0,
+            "units_lost": -(totals["lost"] or 0),
+            "value": totals["value"] or Decimal("0"),
+        },
+        "uncounted": {
+            "batches": uncounted["batches"],
+            "units": uncounted["units"] or 0,
+            "value": uncounted["value"] or Decimal("0"),
+        },
+        "variances": [
+            {
+                "batch_id": row["batch_id"],
+                "product_id": row["product_id"],
+                "product_name": row["product__name"],
+                "expiry_date": row["batch__expiry_date"],
+                "expected_quantity": row["expected_quantity"],
+                "counted_quantity": row["counted_quantity"],
+                "variance": row["variance"],
+                "value": row["variance_value"],
+            }
+            for row in results["variances"]
+        ],
+    }
+
+
+# ======================================================
+# CLÔTURE
+# ======================================================
+
+def post_count(count, user=None):
+    """
+    Passe les écarts de la session en une transaction : session et lots
+    verrouillés, une StockAdjustment "count" par lot en écart, un seul
+    UPDATE des lots (stock += écart, plancher 0 si des ventes ont suivi
+    le scan), mouvements "adjustment" au journal.
+    Inventaire complet : les lots en stock non comptés sont d'abord comptés à 0.
+    -> {"batches", "units_gained", "units_lost", "value"}
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        count = StockCount.objects.select_for_update().get(pk=count.pk)
+
+        if count.status != "open":
+            raise ValidationError({"detail": "Inventaire déjà clôturé ou annulé"})
+
+        if count.full:
+            StockCountLine.objects.bulk_create([
+                StockCountLine(
+                    count=count,
+                    pharmacy_id=count.pharmacy_id,
+                    product_id=product_id,
+                    batch_id=batch_id,
+                    counted_quantity=0,
+                    expected_quantity=quantity,
+                    counted_at=now,
+                )
+                for batch_id, product_id, quantity in (
+                    uncounted_batches(count).values_list("id", "product_id", "quantity")
+                )
+            ], batch_size=1000)
+
+        changed = variance_lines(count).exclude(variance=0)
+
+        batches = {
+            batch_id: (quantity, purchase_price, expiry_date)
+            for batch_id, quantity, purchase_price, expiry_date in (
+                ProductBatch.objects
+                .filter(id__in=changed.values("batch_id"))
+                .select_for_update()
+                .values_list("id", "quantity", "purchase_price", "expiry_date")
+            )
+        }
+
+        adjustments = []
+        for batch_id, product_id, variance in changed.values_list("batch_id", "product_id", "variance"):
+            quantity, purchase_price, expiry_date = batches[batch_id]
+            # Plancher : le lot ne descend pas sous 0
+            applied = max(variance, -quantity)
+            if not applied:
+                continue
+
+            adjustments.append(StockAdjustment(
+                pharmacy_id=count.pharmacy_id,
+                product_id=product_id,
+                batch_id=batch_id,
+                user=user,
+                reason="count",
+                quantity=applied,
+                unit_cost=purchase_price,
+                value=applied * purchase_price,
+                expiry_date=expiry_date,
+                note=count.note,
+                created_at=now,
+            ))
+
+        StockAdjustment.objects.bulk_create(adjustments, batch_size=1000)
+
+        ProductBatch.objects.filter(id__in=changed.values("batch_id")).update(
+            quantity=Greatest(
+                F("quantity") + Subquery(changed.filter(batch_id=OuterRef("pk")).values("variance")[:1]),
+                0,
+            )
+        )
+
+        record_movements(
+            count.pharmacy_id, "adjustment",
+            [(a.product_id, a.batch_id, a.quantity, a.unit_cost, a.id) for a in adjustments],
+            user=user, created_at=now,
+        )
+
+        count.status = "posted"
+        count.posted_by = user
+        count.posted_at = now
+        count.save(update_fields=["status", "posted_by", "posted_at"])
+
+        PharmacyDataVersion.bump(count.pharmacy_id)
+
+    return {
+        "batches": len(adjustments),
+        "units_gained": sum(a.quantity for a in adjustments if a.quantity > 0),
+        "units_lost": -sum(a.quantity for a in adjustments if a.quantity < 0),
+        "value": sum((a.value for a in adjustments), Decimal("0")),
+    }
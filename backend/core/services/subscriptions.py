@@ -0,0 +1,193 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import stripe
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Pharmacy
+
+
+# Champs synchronisés depuis Stripe
+RECONCILED_FIELDS = ("subscription_status", "current_period_end", "grace_until")
+
+# Même grace period que le webhook invoice.payment_failed
+GRACE_PERIOD_DAYS = 7
+
+GRACE_STATUSES = ("past_due", "unpaid")
+PAID_STATUSES = ("active", "trialing")
+
+
+# ======================================================
+# CLIENTS (Stripe réel / stand-in local)
+# ======================================================
+
+class StripeSubscriptionClient:
+    """
+    Client Stripe minimal pour la réconciliation.
+
+    `api_base` permet de pointer le SDK vers un faux serveur Stripe local
+    (tests, staging) sans toucher à la configuration globale `stripe.*`.
+    """
+
+    def __init__(self, api_key=None, api_base=None):
+        base_addresses = {"api": api_base} if api_base else None
+
+        self.client = stripe.StripeClient(
+            api_key or settings.STRIPE_SECRET_KEY or "",
+            base_addresses=base_addresses,
+        )
+
+    def retrieve(self, subscription_id):
+        """
+        Retourne {"id", "status", "current_period_end"} ou None
+        si l'abonnement n'existe plus côté Stripe.
+        """
+        try:
+            sub = self.client.v1.subscriptions.retrieve(subscription_id).to_dict()
+        except stripe.InvalidRequestError as e:
+            if e.http_status == 404:
+                return None
+            raise
+
+        period_end = sub.get("current_period_end")
+
+        # Versions récentes de l'API : la période est portée par les items
+        if period_end is None:
+            items = (sub.get("items") or {}).get("data") or []
+            if items:
+                period_end = items[0].get("current_period_end")
+
+        return {
+            "id": sub["id"],
+            "status": sub["status"],
+            "current_period_end": period_end,
+        }
+
+
+def get_subscription_client(client_path=None, **kwargs):
+    """
+    Instancie le client configuré (settings.SUBSCRIPTION_CLIENT par défaut).
+    """
+    client_class = import_string(client_path or settings.SUBSCRIPTION_CLIENT)
+    kwargs.setdefault("api_base", settings.STRIPE_API_BASE)
+    return client_class(**kwargs)
+
+
+# ======================================================
+# DIFF
+# ======================================================
+
+def compute_subscription_state(pharmacy, remote, now=None):
+    """
+    État attendu d'une pharmacie d'après l'abonnement Stripe.
+    Reprend la sémantique des webhooks (grace period sur impayé).
+    """
+    now = now or timezone.now()
+
+    if remote is None:
+        return {
+            "subscription_status": "canceled",
+            "current_period_end": pharmacy.current_period_end,
+            "grace_until": pharmacy.grace_until,
+        }
+
+    status = remote["status"]
+
+    period_end = pharmacy.current_period_end
+    if remote.get("current_period_end"):
+        period_end = datetime.fromtimestamp(
+            remote["current_period_end"],
+            tz=dt_timezone.utc
+        )
+
+    grace_until = pharmacy.grace_until
+    if status in PAID_STATUSES:
+        grace_until = None
+    elif status in GRACE_STATUSES and not grace_until:
+        grace_until = now + timedelta(days=GRACE_PERIOD_DAYS)
+
+    return {
+        "subscription_status": status,
+        "current_period_end": period_end,
+        "grace_until": grace_until,
+    }
+
+
+def diff_subscription(pharmacy, expected):
+    return {
+        field: (getattr(pharmacy, field), value)
+        for field, value in expected.items()
+        if getattr(pharmacy, field) != value
+    }
+
+
+# ======================================================
+# RECONCILIATION
+# ======================================================
+
+def iter_subscribed_pharmacies(batch_size):
+    """
+    Pagination keyset (pk) : pas d'OFFSET, coût constant par page.
+    """
+    qs = (
+        Pharmacy.objects
+        .exclude(stripe_subscription_id__isnull=True)
+        .exclude(stripe_subscription_id="")
+        .only("id", "name", "stripe_subscription_id", *RECONCILED_FIELDS)
+        .order_by("pk")
+    )
+
+    last_pk = None
+
+    while True:
+        page_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        page = list(page_qs[:batch_size])
+
+        if not page:
+            return
+
+        yield page
+        last_pk = page[-1].pk
+
+
+def reconcile_subscriptions(client, batch_size=100, concurrency=8, dry_run=False):
+    """
+    Aligne subscription_status / current_period_end / grace_until sur Stripe.
+
+    Chaque page est récupérée chez Stripe avec au plus `concurrency`
+    requêtes simultanées, puis écrite en un seul bulk_update.
+    Retourne la liste des écarts : [(pharmacy, {field: (old, new)})].
+    """
+    diffs = []
+    now = timezone.now()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        for page in iter_subscribed_pharmacies(batch_size):
+
+            remotes = pool.map(
+                client.retrieve,
+                [p.stripe_subscription_id for p in page]
+            )
+
+            changed = []
+
+            for pharmacy, remote in zip(page, remotes):
+                expected = compute_subscription_state(pharmacy, remote, now)
+                diff = diff_subscription(pharmacy, expected)
+
+                if not diff:
+                    continue
+
+                diffs.append((pharmacy, diff))
+
+                for field, (_, new) in diff.items():
+                    setattr(pharmacy, field, new)
+                changed.append(pharmacy)
+
+            if changed and not dry_run:
+                Pharmacy.objects.bulk_update(changed, RECONCILED_FIELDS)
+
+    return diffs
@@ -0,0 +1,415 @@
+import csv
+import io
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Supplier,
+    Product,
+    ProductBatch,
+    Sale,
+    SaleBatchConsumption,
+    StockEntry,
+    StockEntryItem,
+    StockMovement,
+)
+
+
+# ======================================================
+# CATALOGUE / SAISONNALITÉ
+# ======================================================
+
+PRODUCT_CATALOG = [
+    ("Paracétamol", "Paracetamol", "500 mg", "comprime"),
+    ("Ibuprofène", "Ibuprofen", "400 mg", "comprime"),
+    ("Amoxicilline", "Amoxicillin", "500 mg", "gelule"),
+    ("Vitamine C", "Ascorbic Acid", "1000 mg", "comprime"),
+    ("Aspirine", "Acetylsalicylic Acid", "500 mg", "comprime"),
+    ("Diclofénac", "Diclofenac", "50 mg", "comprime"),
+    ("Metformine", "Metformin", "850 mg", "comprime"),
+    ("Ciprofloxacine", "Ciprofloxacin", "500 mg", "comprime"),
+    ("Artéméther-Luméfantrine", "Artemether/Lumefantrine", "20/120 mg", "comprime"),
+    ("Quinine", "Quinine", "300 mg", "injectable"),
+    ("SRO", "Oral Rehydration Salts", "20.5 g", "suspension"),
+    ("Sirop toux", None, "125 ml", "sirop"),
+    ("Pommade antibiotique", None, "15 g", "pommade"),
+]
+
+PHARMACY_NAMES = [
+    "Pharmacie Centrale",
+    "Pharmacie du Marché",
+    "Pharmacie Espoir",
+]
+
+CITIES = ["N'Djamena", "Moundou", "Sarh", "Abéché", "Kélo", "Doba"]
+
+SUPPLIER_NAMES = ["Sanofi", "Pfizer", "Novartis", "Bayer", "Roche", "GSK"]
+
+# Multiplicateur par mois (janvier = index 0) :
+# pic palu en saison des pluies (juil. -> oct.), harmattan (déc. -> fév.)
+MONTHLY_SEASONALITY = [1.15, 1.05, 0.9, 0.85, 0.9, 1.0, 1.25, 1.4, 1.45, 1.3, 1.0, 1.1]
+
+# Multiplicateur par jour de semaine (lundi = 0)
+WEEKDAY_SEASONALITY = [1.1, 1.0, 1.0, 1.0, 1.15, 1.2, 0.6]
+
+# Croissance annuelle de l'activité (ventes plus faibles dans le passé)
+YEARLY_GROWTH = 0.15
+
+
+@dataclass
+class DatasetSpec:
+    pharmacies: int = 3
+    products: int = 100
+    batches_per_product: int = 3
+    months: int = 0
+    sales_per_day: int = 40
+    stock_entries_per_month: int = 4
+    suppliers: int = 3
+    seed: int = 0
+
+
+# ======================================================
+# ÉCRITURE EN MASSE (bulk_create / COPY)
+# ======================================================
+
+class BulkWriter:
+    """
+    Tampon par modèle, vidé tous les `chunk_size` objets.
+    use_copy=True : COPY FROM STDIN (PostgreSQL), sinon bulk_create.
+    Les modèles sont vidés dans l'ordre de premier ajout (parents d'abord).
+    """
+
+    def __init__(self, chunk_size=10000, use_copy=False):
+        if use_copy and connection.vendor != "postgresql":
+            raise ValueError("COPY requires PostgreSQL")
+
+        self.chunk_size = chunk_size
+        self.use_copy = use_copy
+        self.buffers = {}
+        self.pending = 0
+        self.counts = {}
+
+    def add(self, obj):
+        self.buffers.setdefault(type(obj), []).append(obj)
+        self.pending += 1
+
+        if self.pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for model, objs in self.buffers.items():
+            if not objs:
+                continue
+
+            if self.use_copy:
+                self.copy(model, objs)
+            else:
+                model.objects.bulk_create(objs, batch_size=1000)
+
+            name = model.__name__
+            self.counts[name] = self.counts.get(name, 0) + len(objs)
+            objs.clear()
+
+        self.pending = 0
+
+    def copy(self, model, objs):
+        fields = model._meta.concrete_fields
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        for obj in objs:
+            row = []
+            for field in fields:
+                value = field.get_db_prep_save(field.pre_save(obj, True), connection)
+                row.append(r"\N" if value is None else value)
+            writer.writerow(row)
+
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+        sql = (
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+
+            if hasattr(raw, "copy"):  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:  # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(sql, buffer)
+
+
+# ======================================================
+# GÉNÉRATEUR
+# ======================================================
+
+def poisson(rng, lam):
+    """Tirage de Poisson (Knuth pour les petits lambda, approx. normale sinon)."""
+    if lam <= 0:
+        return 0
+
+    if lam > 30:
+        return max(0, round(rng.gauss(lam, math.sqrt(lam))))
+
+    threshold = math.exp(-lam)
+    k, p = 0, rng.random()
+    while p > threshold:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def money(value):
+    return Decimal(value).quantize(Decimal("0.01"))
+
+
+class SyntheticDataGenerator:
+    """
+    Jeu de données multi-tenant paramétrable pour les tests de charge :
+    pharmacies, admins, fournisseurs, produits, lots, bons d'entrée
+    (avec lignes) et historique de ventes saisonnier avec consommation
+    de lots. Une transaction par pharmacie.
+    """
+
+    def __init__(self, spec, writer=None, stdout=None):
+        self.spec = spec
+        self.writer = writer or BulkWriter()
+        self.stdout = stdout
+        self.rng = random.Random(spec.seed)
+        self.now = timezone.now()
+        self.today = timezone.localdate()
+        self.tz = timezone.get_current_timezone()
+
+        # Hash du PIN calculé une seule fois (PBKDF2 trop lent par utilisateur)
+        self.pin_hash = make_password("1234")
+
+    def run(self):
+        started = time.perf_counter()
+
+        for index in range(self.spec.pharmacies):
+            with transaction.atomic():
+                pharmacy = self.generate_pharmacy(index)
+                self.writer.flush()
+
+            self.log(f"🏪 {pharmacy.name} ({index + 1}/{self.spec.pharmacies})")
+
+        return {
+            "rows": dict(self.writer.counts),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    # ---------- tenant ----------
+
+    def generate_pharmacy(self, index):
+        rng = self.rng
+        spec = self.spec
+
+        name = (
+            PHARMACY_NAMES[index] if index < len(PHARMACY_NAMES)
+            else f"Pharmacie {index + 1}"
+        )
+
+        pharmacy = Pharmacy(
+            name=name,
+            type="depot" if index % 10 == 9 else "pharmacie",
+            city=CITIES[index % len(CITIES)],
+            plan=rng.choice(Pharmacy.PLAN_CHOICES)[0],
+            subscription_status="active",
+            created_at=self.now - timedelta(days=31 * spec.months + 30),
+        )
+        # bulk_create ne passe pas par save() : code unique dérivé de l'UUID
+        pharmacy.code = f"S{pharmacy.id.hex[:9].upper()}"
+        self.writer.add(pharmacy)
+
+        self.writer.add(CustomUser(
+            email=f"admin+{pharmacy.id.hex[:12]}@seed.ngr",
+            name=f"Admin {name}",
+            pharmacy=pharmacy,
+            role="admin",
+            password=self.pin_hash,
+        ))
+
+        suppliers = [
+            Supplier(pharmacy=pharmacy, name=rng.choice(SUPPLIER_NAMES))
+            for _ in range(spec.suppliers)
+        ]
+        for supplier in suppliers:
+            self.writer.add(supplier)
+
+        products = self.generate_products(pharmacy)
+        batches = self.generate_batches(pharmacy, products)
+
+        self.generate_stock_entries(pharmacy, suppliers, products)
+        self.generate_sales(pharmacy, products, batches)
+
+        return pharmacy
+
+    def generate_products(self, pharmacy):
+        rng = self.rng
+        products = []
+
+        for i in range(self.spec.products):
+            name, generic, dosage, form = PRODUCT_CATALOG[i % len(PRODUCT_CATALOG)]
+
+            product = Product(
+                pharmacy=pharmacy,
+                name=name if i < len(PRODUCT_CATALOG) else f"{name} {i // len(PRODUCT_CATALOG)}",
+                generic_name=generic,
+                dosage=dosage,
+                form=form,
+                unit_price=money(rng.randint(5, 50) * 100),
+                min_stock_level=rng.randint(5, 20),
+                is_active=rng.random() > 0.02,
+            )
+            products.append(product)
+            self.writer.add(product)
+
+        return products
+
+    def generate_batches(self, pharmacy, products):
+        rng = self.rng
+        batches = {}
+
+        for product in products:
+            batches[product.id] = []
+
+            for _ in range(rng.randint(1, self.spec.batches_per_product)):
+                batch = ProductBatch(
+                    pharmacy=pharmacy,
+                    product=product,
+                    quantity=rng.randint(0, 150),
+                    purchase_price=money(product.unit_price * Decimal(rng.uniform(0.55, 0.75))),
+                    # Quelques lots expirés / proches expiration
+                    expiry_date=self.today + timedelta(days=rng.randint(-30, 720)),
+                    created_at=self.now - timedelta(days=rng.randint(0, 31 * self.spec.months + 30)),
+                )
+                batches[product.id].append(batch)
+                self.writer.add(batch)
+
+                # Journal cohérent avec les lots (Σ mouvements = stock du lot)
+                if batch.quantity:
+                    self.writer.add(StockMovement(
+                        pharmacy=pharmacy,
+                        product=product,
+                        batch=batch,
+                        kind="opening",
+                        quantity=batch.quantity,
+                        unit_cost=batch.purchase_price,
+                        created_at=batch.created_at,
+                    ))
+
+        return batches
+
+    def generate_stock_entries(self, pharmacy, suppliers, products):
+        rng = self.rng
+
+        for month in range(self.spec.months + 1):
+            for _ in range(self.spec.stock_entries_per_month):
+                created_at = self.now - timedelta(days=31 * month + rng.randint(0, 30))
+
+                entry = StockEntry(
+                    pharmacy=pharmacy,
+                    supplier=rng.choice(suppliers),
+                    invoice_number=f"F-{rng.randint(100000, 999999)}",
+                    # Derniers bons encore en brouillon
+                    status="draft" if month == 0 and rng.random() < 0.3 else "validated",
+                    created_at=created_at,
+                )
+
+                items = []
+                for product in rng.sample(products, min(len(products), rng.randint(3, 10))):
+                    quantity = rng.randint(10, 200)
+                    purchase_price = money(product.unit_price * Decimal(rng.uniform(0.55, 0.75)))
+
+                    items.append(StockEntryItem(
+                        stock_entry=entry,
+                        product=product,
+                        quantity=quantity,
+                        purchase_price=purchase_price,
+                        expiry_date=created_at.date() + timedelta(days=rng.randint(180, 900)),
+                        line_total=quantity * purchase_price,
+                    ))
+
+                entry.total_amount = sum(item.line_total for item in items)
+
+                self.writer.add(entry)
+                for item in items:
+                    self.writer.add(item)
+
+    def generate_sales(self, pharmacy, products, batches):
+        rng = self.rng
+        spec = self.spec
+
+        if not spec.months or not products:
+            return
+
+        # Popularité de type Zipf : quelques produits font l'essentiel des ventes
+        ranked = products[:]
+        rng.shuffle(ranked)
+        cum_weights = list(_cumulate(1 / (rank + 1) ** 0.8 for rank in range(len(ranked))))
+
+        # Taille de pharmacie : facteur de volume propre au tenant
+        volume = rng.uniform(0.5, 1.5)
+
+        day = self.today - timedelta(days=31 * spec.months)
+
+        while day <= self.today:
+            years_ago = (self.today - day).days / 365
+            lam = (
+                spec.sales_per_day
+                * volume
+                * MONTHLY_SEASONALITY[day.month - 1]
+                * WEEKDAY_SEASONALITY[day.weekday()]
+                / (1 + YEARLY_GROWTH) ** years_ago
+            )
+
+            opening = timezone.make_aware(datetime.combine(day, dt_time(8)), self.tz)
+
+            for product in rng.choices(ranked, cum_weights=cum_weights, k=poisson(rng, lam)):
+                batch = rng.choice(batches[product.id])
+                quantity = rng.choices((1, 2, 3, 5), weights=(60, 25, 10, 5))[0]
+
+                sale = Sale(
+                    pharmacy=pharmacy,
+                    product=product,
+                    quantity=quantity,
+                    unit_price=product.unit_price,
+                    total_price=product.unit_price * quantity,
+                    cost_total=batch.purchase_price * quantity,
+                    created_at=min(self.now, opening + timedelta(seconds=rng.randint(0, 13 * 3600))),
+                )
+                self.writer.add(sale)
+
+                self.writer.add(SaleBatchConsumption(
+                    sale=sale,
+                    pharmacy=pharmacy,
+                    batch=batch,
+                    quantity=quantity,
+                    unit_cost=batch.purchase_price,
+                    total_cost=sale.cost_total,
+                ))
+
+            day += timedelta(days=1)
+
+
+def _cumulate(values):
+    total = 0
+    for value in values:
+        total += value
+        yield total
@@ -0,0 +1,249 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    Pharmacy,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    StockTransfer,
+    StockTransferLine,
+)
+from core.services.ledger import record_movements
+
+
+# ======================================================
+# RÉSEAU (siège / dépôt + succursales)
+# ======================================================
+
+def network_destination(source, destination_id):
+    """Pharmacie destination, refusée hors du réseau de `source` (Pharmacy.parent)."""
+    root = source.parent_id or source.pk
+
+    destination = (
+        Pharmacy.objects
+        .filter(Q(pk=root) | Q(parent_id=root), pk=destination_id)
+        .exclude(pk=source.pk)
+        .first()
+    )
+    if destination is None:
+        raise ValidationError({"destination": ["Pharmacie hors de votre réseau"]})
+
+    return destination
+
+
+def destination_products(destination_id, product_ids):
+    """
+    {produit source: produit destination}, appariés par (nom, dosage, forme) ;
+    les produits absents de la destination y sont créés (prix et seuil de la source).
+    """
+    sources = list(
+        Product.objects
+        .filter(id__in=product_ids)
+        .values_list("id", "name", "dosage", "form", "generic_name", "unit_price", "min_stock_level")
+    )
+
+    existing = {
+        (name, dosage, form): product_id
+        for product_id, name, dosage, form in (
+            Product.objects.for_pharmacy(destination_id)
+            .filter(name__in={row[1] for row in sources})
+            .order_by("-created_at")  # doublons : le plus ancien l'emporte
+            .values_list("id", "name", "dosage", "form")
+        )
+    }
+
+    missing = {}
+    for _, name, dosage, form, generic_name, unit_price, min_stock_level in sources:
+        key = (name, dosage, form)
+        if key not in existing and key not in missing:
+            missing[key] = Product(
+                pharmacy_id=destination_id,
+                name=name,
+                dosage=dosage,
+                form=form,
+                generic_name=generic_name,
+                unit_price=unit_price,
+                min_stock_level=min_stock_level,
+            )
+
+    Product.objects.bulk_create(missing.values(), batch_size=1000)
+    existing.update({key: product.id for key, product in missing.items()})
+
+    return {product_id: existing[(name, dosage, form)] for product_id, name, dosage, form, *_ in sources}
+
+
+# ======================================================
+# TRANSFERT
+# ======================================================
+
+def transfer_stock(source, destination, lines, user=None, mode="manual", note="", today=None):
+    """
+    Transfère [(lot source, quantité)] de `source` vers `destination` en une
+    transaction : lots source verrouillés (SELECT ... FOR UPDATE, ordre des id),
+    un lot destination par ligne (coût et péremption conservés), un seul
+    UPDATE des lots source, mouvements "transfer" des deux côtés.
+    Lignes du même lot cumulées ; lot inconnu, expiré ou insuffisant : rien n'est transféré.
+    -> StockTransfer
+    """
+    today = today or timezone.localdate()
+    now = timezone.now()
+
+    requested = defaultdict(int)
+    for batch_id, quantity in lines:
+        requested[batch_id] += quantity
+
+    with transaction.atomic():
+        batches = {
+            batch_id: (product_id, quantity, purchase_price, expiry_date)
+            for batch_id, product_id, quantity, purchase_price, expiry_date in (
+                ProductBatch.objects.for_pharmacy(source.pk)
+                .filter(id__in=list(requested))
+                .order_by("id")
+                .select_for_update()
+                .values_list("id", "product_id", "quantity", "purchase_price", "expiry_date")
+            )
+        }
+
+        errors = []
+        for batch_id, quantity in requested.items():
+            if batch_id not in batches:
+                errors.append(f"Lot {batch_id} introuvable")
+            elif batches[batch_id][3] < today:
+                errors.append(f"Lot {batch_id} expiré")
+            elif batches[batch_id][1] < quantity:
+                errors.append(f"Lot {batch_id} : stock insuffisant ({batches[batch_id][1]} < {quantity})")
+        if errors:
+            raise ValidationError({"lines": errors})
+
+        products = destination_products(destination.pk, {row[0] for row in batches.values()})
+
+        transfer = StockTransfer.objects.create(
+            pharmacy=source,
+            destination=destination,
+            mode=mode,
+            user=user,
+            lines_count=len(requested),
+            quantity=sum(requested.values()),
+            value=sum((quantity * batches[batch_id][2] for batch_id, quantity in requested.items()), Decimal("0")),
+            note=note,
+            created_at=now,
+        )
+
+        received = ProductBatch.objects.bulk_create([
+            ProductBatch(
+                pharmacy_id=destination.pk,
+                product_id=products[batches[batch_id][0]],
+                quantity=quantity,
+                purchase_price=batches[batch_id][2],
+                expiry_date=batches[batch_id][3],
+                created_at=now,
+            )
+            for batch_id, quantity in requested.items()
+        ], batch_size=1000)
+
+        ProductBatch.objects.filter(id__in=list(requested)).update(
+            quantity=Case(
+                *[When(id=batch_id, then=F("quantity") - Value(quantity)) for batch_id, quantity in requested.items()],
+                output_field=IntegerField(),
+            )
+        )
+
+        StockTransferLine.objects.bulk_create([
+            StockTransferLine(
+                transfer=transfer,
+                pharmacy=source,
+                product_id=batches[batch_id][0],
+                source_batch_id=batch_id,
+                destination_product_id=batch.product_id,
+                destination_batch=batch,
+                quantity=quantity,
+                unit_cost=batch.purchase_price,
+                expiry_date=batch.expiry_date,
+            )
+            for (batch_id, quantity), batch in zip(requested.items(), received)
+        ], batch_size=1000)
+
+        record_movements(
+            source.pk, "transfer",
+            [(batches[batch_id][0], batch_id, -quantity, batches[batch_id][2]) for batch_id, quantity in requested.items()],
+            reference=transfer.id, user=user, created_at=now,
+        )
+        record_movements(
+            destination.pk, "transfer",
+            [(batch.product_id, batch.id, batch.quantity, batch.purchase_price) for batch in received],
+            reference=transfer.id, user=user, created_at=now,
+        )
+
+        PharmacyDataVersion.bump(source.pk)
+        PharmacyDataVersion.bump(destination.pk)
+
+    return transfer
+
+
+# ======================================================
+# RÉAPPROVISIONNEMENT DÉPÔT -> SUCCURSALE
+# ======================================================
+
+def replenishment_lines(source, destination, today=None):
+    """
+    Lignes [(lot source, quantité)] qui remontent chaque produit en stock bas
+    de la succursale (même règle que la liste "stock bas") à
+    TRANSFER_REPLENISH_TARGET_FACTOR × min_stock_level, servies FEFO sur les
+    lots non expirés de `source` ; produits appariés par (nom, dosage, forme).
+    """
+    today = today or timezone.localdate()
+
+    needs = {
+        (name, dosage, form): settings.TRANSFER_REPLENISH_TARGET_FACTOR * min_stock_level - stock
+        for name, dosage, form, min_stock_level, stock in (
+            Product.objects.for_pharmacy(destination.pk)
+            .filter(is_active=True)
+            .annotate(stock=Coalesce(Sum("batches__quantity", filter=Q(batches__quantity__gt=0)), 0))
+            .filter(stock__lte=F("min_stock_level"))
+            .values_list("name", "dosage", "form", "min_stock_level", "stock")
+        )
+    }
+    if not needs:
+        return []
+
+    lines = []
+    for batch_id, name, dosage, form, quantity in (
+        ProductBatch.objects.for_pharmacy(source.pk)
+        .filter(
+            quantity__gt=0,
+            expiry_date__gte=today,
+            product__is_active=True,
+            product__name__in={key[0] for key in needs},
+        )
+        .order_by("expiry_date", "created_at")
+        .values_list("id", "product__name", "product__dosage", "product__form", "quantity")
+    ):
+        need = needs.get((name, dosage, form), 0)
+        if need <= 0:
+            continue
+
+        taken = min(need, quantity)
+        needs[(name, dosage, form)] = need - taken
+        lines.append((batch_id, taken))
+
+    return lines
+
+
+def replenish_branch(source, destination, user=None, today=None):
+    """Transfert "replenishment" des besoins de la succursale. -> StockTransfer | None (rien à envoyer)"""
+    if destination.parent_id != source.pk:
+        raise ValidationError({"destination": ["Réapprovisionnement : uniquement vers une succursale de ce siège / dépôt"]})
+
+    lines = replenishment_lines(source, destination, today)
+    if not lines:
+        return None
+
+    return transfer_stock(source, destination, lines, user=user, mode="replenishment", today=today)
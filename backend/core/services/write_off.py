@@ -0,0 +1,140 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from core.models import BatchExpiryRisk, PharmacyDataVersion, ProductBatch, StockAdjustment
+from core.services.ledger import record_movements
+
+
+# ======================================================
+# MISE AU REBUT DES PÉRIMÉS
+# ======================================================
+
+def write_off_expired(pharmacy, user=None, batch_ids=None, today=None):
+    """
+    Met au rebut les lots expirés encore en stock (tous, ou les seuls
+    `batch_ids`) : une StockAdjustment "expired" par lot, puis un seul
+    UPDATE quantity = 0. Les lignes de risque de ces lots disparaissent.
+    Lots verrouillés le temps de l'opération (SELECT ... FOR UPDATE).
+    -> {"batches", "units", "value"}
+    """
+    today = today or timezone.localdate()
+    pharmacy_id = getattr(pharmacy, "pk", pharmacy)
+    created_at = timezone.now()
+
+    expired = ProductBatch.objects.for_pharmacy(pharmacy_id).filter(quantity__gt=0, expiry_date__lt=today)
+    if batch_ids is not None:
+        expired = expired.filter(id__in=batch_ids)
+
+    with transaction.atomic():
+        batches = list(
+            expired
+            .select_for_update()
+            .values_list("id", "product_id", "quantity", "purchase_price", "expiry_date")
+        )
+
+        if not batches:
+            return {"batches": 0, "units": 0, "value": Decimal("0")}
+
+        adjustments = StockAdjustment.objects.bulk_create([
+            StockAdjustment(
+                pharmacy_id=pharmacy_id,
+                product_id=product_id,
+                batch_id=batch_id,
+                user=user,
+                reason="expired",
+                quantity=-quantity,
+                unit_cost=purchase_price,
+                value=-quantity * purchase_price,
+                expiry_date=expiry_date,
+                created_at=created_at,
+            )
+            for batch_id, product_id, quantity, purchase_price, expiry_date in batches
+        ], batch_size=1000)
+
+        ids = [batch[0] for batch in batches]
+        ProductBatch.objects.filter(id__in=ids).update(quantity=0)
+        record_movements(
+            pharmacy_id, "write_off",
+            [(a.product_id, a.batch_id, a.quantity, a.unit_cost, a.id) for a in adjustments],
+            user=user, created_at=created_at,
+        )
+        BatchExpiryRisk.objects.for_pharmacy(pharmacy_id).filter(batch_id__in=ids).delete()
+
+        PharmacyDataVersion.bump(pharmacy_id)
+
+    return {
+        "batches": len(adjustments),
+        "units": -sum(a.quantity for a in adjustments),
+        "value": -sum(a.value for a in adjustments),
+    }
+
+
+# ======================================================
+# RAPPORT DES PERTES
+# ======================================================
+
+def write_off_period(date_from=None, date_to=None):
+    date_to = date_to or timezone.localdate()
+    return date_from or date_to - timedelta(days=89), date_to
+
+
+def write_off_queries(date_from, date_to):
+    """{nom: callable} — sorties de stock (quantity < 0) de la période, par le tenant actif."""
+    losses = StockAdjustment.scoped.filter(
+        quantity__lt=0,
+        created_at__date__gte=date_from,
+        created_at__date__lt=date_to + timedelta(days=1),
+    )
+
+    totals = dict(units=Sum("quantity"), value=Sum("value"), adjustments=Count("id"))
+
+    return {
+        "by_reason": lambda: list(losses.values("reason").annotate(**totals).order_by("reason")),
+        "monthly": lambda: list(
+            losses
+            .annotate(month=TruncMonth("created_at"))
+            .values("month")
+            .annotate(**totals)
+            .order_by("month")
+        ),
+        "products": lambda: list(
+            losses
+            .values("product_id", "product__name")
+            .annotate(**totals)
+            .order_by("value", "product__name")[:10]
+        ),
+    }
+
+
+def build_write_off_report(date_from, date_to, results):
+    """Quantités et valeurs en positif (pertes)."""
+
+    def loss(row, **extra):
+        return {
+            **extra,
+            "units": -(row["units"] or 0),
+            "value": -(row["value"] or 0),
+            "adjustments": row["adjustments"],
+        }
+
+    by_reason = [loss(row, reason=row["reason"]) for row in results["by_reason"]]
+
+    return {
+        "period": {"start": date_from, "end": date_to},
+        "total": {
+            "units": sum(row["units"] for row in by_reason),
+            "value": sum((row["value"] for row in by_reason), Decimal("0")),
+            "adjustments": sum(row["adjustments"] for row in by_reason),
+        },
+        "by_reason": by_reason,
+        "monthly": [loss(row, month=row["month"].date()) for row in results["monthly"]],
+        "products": [
+            loss(row, product_id=row["product_id"], product_name=row["product__name"])
+            for row in results["products"]
+        ],
+    }
@@ -0,0 +1,158 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Supplier,
+    Product,
+    ProductBatch,
+    Sale,
+    SaleBatchConsumption,
+    SaleAuditLog,
+    StockEntry,
+    StockMovement,
+)
+
+
+# =====================================================
+# DATASET MULTI-TENANT (tests de budget de requêtes)
+# =====================================================
+
+FORMS = [code for code, _ in Product.FORM_CHOICES]
+
+
+def grow_tenant(pharmacy, scale, user=None, seed=0):
+    """
+    Ajoute à `pharmacy` un volume de données proportionnel à `scale` :
+    produits, lots (dont expirés / proches expiration), ventes avec
+    consommation de lots, journal d'audit et bons d'entrée.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = now.date()
+
+    supplier = Supplier.objects.create(pharmacy=pharmacy, name=f"Supplier {seed}")
+
+    products = Product.objects.bulk_create([
+        Product(
+            pharmacy=pharmacy,
+            name=f"Produit {seed}-{i}",
+            dosage="500 mg",
+            form=rng.choice(FORMS),
+            unit_price=Decimal(rng.randint(500, 5000)),
+            min_stock_level=rng.randint(5, 40),
+        )
+        for i in range(10 * scale)
+    ])
+
+    batches = ProductBatch.objects.bulk_create([
+        ProductBatch(
+            pharmacy=pharmacy,
+            product=product,
+            quantity=rng.randint(0, 120),
+            purchase_price=product.unit_price * Decimal("0.6"),
+            expiry_date=today + timedelta(days=rng.choice([-20, 15, 200, 400])),
+        )
+        for product in products
+        for _ in range(2)
+    ])
+
+    # Journal : stock d'ouverture des lots (cf. migration 0026)
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            pharmacy=pharmacy,
+            product=batch.product,
+            batch=batch,
+            kind="opening",
+            quantity=batch.quantity,
+            unit_cost=batch.purchase_price,
+            created_at=now - timedelta(days=90),
+        )
+        for batch in batches
+        if batch.quantity
+    ])
+
+    sales = []
+    consumptions = []
+
+    for i in range(30 * scale):
+        batch = rng.choice(batches)
+        qty = rng.randint(1, 5)
+
+        sale = Sale(
+            pharmacy=pharmacy,
+            product=batch.product,
+            quantity=qty,
+            unit_price=batch.product.unit_price,
+            total_price=batch.product.unit_price * qty,
+            cost_total=batch.purchase_price * qty,
+            created_at=now - timedelta(days=rng.randint(0, 59), hours=rng.randint(0, 10)),
+        )
+        sales.append(sale)
+
+        consumptions.append(SaleBatchConsumption(
+            sale=sale,
+            pharmacy=pharmacy,
+            batch=batch,
+            quantity=qty,
+            unit_cost=batch.purchase_price,
+            total_cost=batch.purchase_price * qty,
+        ))
+
+    Sale.objects.bulk_create(sales)
+    SaleBatchConsumption.objects.bulk_create(consumptions)
+
+    SaleAuditLog.objects.bulk_create([
+        SaleAuditLog(
+            pharmacy=pharmacy,
+            user=user,
+            product=rng.choice(products),
+            action=rng.choice(["SUCCESS", "BLOCKED"]),
+            reason=rng.choice(["other", "insufficient_stock", "expired_stock"]),
+            requested_quantity=rng.randint(1, 5),
+        )
+        for _ in range(10 * scale)
+    ])
+
+    StockEntry.objects.bulk_create([
+        StockEntry(
+            pharmacy=pharmacy,
+            supplier=supplier,
+            invoice_number=f"F-{seed}-{i}",
+            total_amount=Decimal(rng.randint(10000, 90000)),
+            status=rng.choice(["draft", "validated"]),
+        )
+        for i in range(5 * scale)
+    ])
+
+    return products
+
+
+def grow_platform(scale, seed=0):
+    """
+    Autres tenants (bruit cross-tenant + volume pour les vues SaaS Admin).
+    """
+    statuses = [code for code, _ in Pharmacy.SUBSCRIPTION_STATUS]
+    plans = [code for code, _ in Pharmacy.PLAN_CHOICES]
+
+    for i in range(3 * scale):
+        pharmacy = Pharmacy.objects.create(
+            name=f"Pharmacie {seed}-{i}",
+            type="pharmacie" if i % 4 else "depot",
+            city="Moundou" if i % 2 else "N'Djamena",
+            plan=plans[i % len(plans)],
+            subscription_status=statuses[i % len(statuses)],
+        )
+
+        user = CustomUser.objects.create_user(
+            email=f"user-{seed}-{i}@example.com",
+            name=f"User {seed}-{i}",
+            pharmacy=pharmacy,
+            pin="1234",
+        )
+
+        grow_tenant(pharmacy, 1, user=user, seed=seed * 1000 + i)
@@ -0,0 +1,159 @@
+import threading
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.api.concurrency import gather_queries
+from core.instrumentation import registry
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    ProductBatch,
+    Sale,
+)
+
+
+class AsyncReportViewTests(TestCase):
+    """Les variantes async renvoient exactement la réponse de leur vue sync."""
+
+    ROUTES = [
+        ("finance-dashboard", "finance-dashboard-async"),
+        ("intelligence-overview", "intelligence-overview-async"),
+        ("product-stock", "product-stock-async"),
+    ]
+
+    def setUp(self):
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        product = Product.objects.create(
+            pharmacy=self.pharmacy,
+            name="Paracétamol",
+            dosage="500 mg",
+            form="comprime",
+            unit_price=1000,
+            min_stock_level=100,
+        )
+        ProductBatch.objects.create(
+            product=product,
+            quantity=40,
+            purchase_price=600,
+            expiry_date=timezone.now().date() - timedelta(days=3),
+        )
+
+        for amount in (1000, 2500, 4000):
+            Sale.objects.create(
+                pharmacy=self.pharmacy,
+                product=product,
+                quantity=1,
+                unit_price=amount,
+                total_price=amount,
+                cost_total=600,
+            )
+
+        # Autre pharmacie : ne doit jamais apparaître
+        other = Pharmacy.objects.create(name="Autre", type="pharmacie")
+        Sale.objects.create(
+            pharmacy=other,
+            product=Product.objects.create(pharmacy=other, name="X", unit_price=1),
+            quantity=1,
+            unit_price=99999,
+            total_price=99999,
+        )
+
+        self.client = self.client_for(self.user)
+
+    def client_for(self, user):
+        client = APIClient()
+        tokens = generate_tokens_for_user(user, pharmacy=self.pharmacy)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client
+
+    def test_async_routes_match_sync_responses(self):
+        for sync_route, async_route in self.ROUTES:
+            with self.subTest(route=async_route):
+                expected = self.client.get(reverse(sync_route))
+                response = self.client.get(reverse(async_route))
+
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertEqual(response.json(), expected.json())
+
+        self.assertEqual(response.json()[0]["stock"], 40)
+
+    def test_auth_and_permission_errors_match_drf(self):
+        cashier = CustomUser.objects.create_user(
+            email="caisse@example.com",
+            name="Caisse",
+            pharmacy=self.pharmacy,
+            role="caissier",
+            pin="5678",
+        )
+
+        for sync_route, async_route in self.ROUTES:
+            for client in (APIClient(), self.client_for(cashier)):
+                with self.subTest(route=async_route):
+                    expected = client.get(reverse(sync_route))
+                    response = client.get(reverse(async_route))
+
+                    self.assertIn(response.status_code, (401, 403))
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response.json(), expected.json())
+                    self.assertEqual(
+                        response.get("WWW-Authenticate"),
+                        expected.get("WWW-Authenticate"),
+                    )
+
+    def test_request_metrics_count_queries_of_async_views(self):
+        registry.reset()
+
+        self.client.get(reverse("finance-dashboard"))
+        self.client.get(reverse("finance-dashboard-async"))
+
+        sync_record, async_record = list(registry.recent)[-2:]
+
+        self.assertEqual(async_record["route"], "finance-dashboard-async")
+        self.assertGreater(async_record["queries"], 0)
+        self.assertEqual(async_record["queries"], sync_record["queries"])
+
+
+class GatherQueriesTests(TestCase):
+
+    @override_settings(ASYNC_DB_THREADS=2)
+    def test_queries_run_concurrently_on_the_pool(self):
+        # Deux tâches qui s'attendent : bloquerait si exécutées en série
+        barrier = threading.Barrier(2, timeout=5)
+
+        def meet(value):
+            return lambda: (barrier.wait(), value)[1]
+
+        results = async_to_sync(gather_queries)({"a": meet(1), "b": meet(2)})
+
+        self.assertEqual(results, {"a": 1, "b": 2})
+
+    def test_without_threads_queries_run_in_order(self):
+        calls = []
+
+        results = async_to_sync(gather_queries)({
+            "a": lambda: calls.append("a") or 1,
+            "b": lambda: calls.append("b") or 2,
+        })
+
+        self.assertEqual(results, {"a": 1, "b": 2})
+        self.assertEqual(calls, ["a", "b"])
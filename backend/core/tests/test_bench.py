@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+
+from core.services.bench import Sample, percentile, summarize_samples
+
+
+class BenchReportTests(SimpleTestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summary_counts_errors_throughput_and_queries(self):
+        samples = [
+            Sample(route="sale-create", status=201, ms=10.0, queries=20, bytes=60),
+            Sample(route="sale-create", status=201, ms=30.0, queries=22, bytes=60),
+            Sample(route="sale-create", status=400, ms=5.0, queries=6, bytes=90),
+        ]
+
+        summary = summarize_samples(samples, wall_seconds=0.5)
+
+        self.assertEqual(summary["requests"], 3)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["error_statuses"], {"400": 1})
+        self.assertEqual(summary["throughput_rps"], 6.0)
+        self.assertEqual(summary["latency_ms"]["p50"], 10.0)
+        self.assertEqual(summary["latency_ms"]["max"], 30.0)
+        self.assertEqual(summary["queries"]["max"], 22)
+        self.assertEqual(summary["bytes_mean"], 70)
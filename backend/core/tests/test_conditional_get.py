@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    PharmacyDataVersion,
+    PlatformDailySales,
+    Product,
+    ProductBatch,
+)
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        self.product = Product.objects.create(
+            pharmacy=self.pharmacy,
+            name="Paracétamol",
+            dosage="500 mg",
+            form="comprime",
+            unit_price=1000,
+        )
+        ProductBatch.objects.create(
+            product=self.product,
+            quantity=50,
+            purchase_price=600,
+            expiry_date=timezone.now().date() + timedelta(days=365),
+        )
+        PlatformDailySales.objects.create(date=timezone.localdate())
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def get(self, route, **headers):
+        return self.client.get(reverse(route), **headers)
+
+    def test_unchanged_data_answers_304_without_aggregates(self):
+        for route in ("finance-dashboard", "finance-dashboard-async", "dashboard"):
+            with self.subTest(route=route):
+                first = self.get(route)
+
+                self.assertEqual(first.status_code, 200)
+                self.assertIn("ETag", first)
+                self.assertIn("Last-Modified", first)
+                self.assertIn("no-cache", first["Cache-Control"])
+
+                with CaptureQueriesContext(connection) as queries:
+                    second = self.get(route, HTTP_IF_NONE_MATCH=first["ETag"])
+
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b"")
+                self.assertEqual(second["ETag"], first["ETag"])
+                # Utilisateur + pharmacie (auth) + version : aucun agrégat
+                self.assertEqual(len(queries), 3)
+
+    def test_if_modified_since(self):
+        first = self.get("product-stock")
+
+        not_modified = self.get("product-stock", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+        PharmacyDataVersion.bump(self.pharmacy.id)
+        PharmacyDataVersion.objects.filter(pharmacy=self.pharmacy).update(
+            updated_at=timezone.now() + timedelta(seconds=5)
+        )
+
+        modified = self.get("product-stock", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(modified.status_code, 200)
+
+    def test_sale_invalidates_etag(self):
+        etag = self.get("finance-dashboard")["ETag"]
+
+        response = self.client.post(
+            reverse("sale-create"),
+            {"product_id": str(self.product.id), "quantity": 2},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        refreshed = self.get("finance-dashboard", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed["ETag"], etag)
+        self.assertEqual(refreshed.data["current"]["revenue"], 2000)
+
+    def test_product_change_invalidates_etag(self):
+        etag = self.get("low-stock")["ETag"]
+
+        self.product.min_stock_level = 500
+        self.product.save()
+
+        refreshed = self.get("low-stock", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(len(refreshed.data), 1)
+
+    def test_etag_depends_on_query_and_pharmacy(self):
+        everything = self.get("dashboard")["ETag"]
+        finance_only = self.client.get(reverse("dashboard"), {"widgets": "finance"})["ETag"]
+
+        other = Pharmacy.objects.create(
+            name="Autre",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        other_user = CustomUser.objects.create_user(
+            email="autre@example.com",
+            name="Autre",
+            pharmacy=other,
+            role="admin",
+            pin="4321",
+        )
+        tokens = generate_tokens_for_user(other_user, pharmacy=other)
+        other_client = APIClient()
+        other_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        self.assertNotEqual(everything, finance_only)
+        self.assertEqual(
+            other_client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=everything).status_code,
+            200,
+        )
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    ProductBatch,
+    Sale,
+)
+
+
+class CompositeDashboardTests(TestCase):
+
+    # widget -> endpoint unitaire équivalent
+    WIDGET_ROUTES = {
+        "finance": "finance-dashboard",
+        "top_products": "finance-top-products",
+        "low_stock": "low-stock",
+        "expiry_alerts": "expiry-alerts",
+        "intelligence": "intelligence-overview",
+    }
+
+    def setUp(self):
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        today = timezone.now().date()
+
+        for name, quantity, expiry in (
+            ("Paracétamol", 5, today + timedelta(days=10)),
+            ("Amoxicilline", 300, today + timedelta(days=400)),
+        ):
+            product = Product.objects.create(
+                pharmacy=self.pharmacy,
+                name=name,
+                unit_price=1000,
+                min_stock_level=20,
+            )
+            ProductBatch.objects.create(
+                product=product,
+                quantity=quantity,
+                purchase_price=600,
+                expiry_date=expiry,
+            )
+            Sale.objects.create(
+                pharmacy=self.pharmacy,
+                product=product,
+                quantity=2,
+                unit_price=1000,
+                total_price=2000,
+                cost_total=1200,
+            )
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def get(self, route, **params):
+        response = self.client.get(reverse(route), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def count_queries(self, route, **params):
+        # Prévision de demande en cache pour la journée : chaque appel la recalcule
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get(route, **params)
+        return len(queries)
+
+    def test_widgets_match_standalone_endpoints(self):
+        for route in ("dashboard", "dashboard-async"):
+            widgets = self.get(route)["widgets"]
+
+            self.assertEqual(list(widgets), list(self.WIDGET_ROUTES))
+
+            for name, standalone in self.WIDGET_ROUTES.items():
+                with self.subTest(route=route, widget=name):
+                    self.assertEqual(widgets[name], self.get(standalone))
+
+    def test_only_requested_widgets_are_computed(self):
+        data = self.get("dashboard", widgets="low_stock,finance,low_stock")
+
+        self.assertEqual(list(data["widgets"]), ["low_stock", "finance"])
+        self.assertEqual([p["name"] for p in data["widgets"]["low_stock"]], ["Paracétamol"])
+
+    def test_shared_sales_aggregates_run_once(self):
+        separate = (
+            self.count_queries("finance-dashboard")
+            + self.count_queries("intelligence-overview")
+        )
+        combined = self.count_queries("dashboard", widgets="finance,intelligence")
+
+        # Auth + version des données (3 requêtes) et agrégats ventes
+        # courants / précédents (2) économisés
+        self.assertEqual(combined, separate - 5)
+
+    def test_unknown_widget_is_rejected(self):
+        for route in ("dashboard", "dashboard-async"):
+            response = self.client.get(reverse(route), {"widgets": "finance,meteo"})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("meteo", response.json()["widgets"][0])
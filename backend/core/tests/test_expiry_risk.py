@@ -0,0 +1,159 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    BatchExpiryRisk,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    Sale,
+    StockEntry,
+    StockEntryItem,
+)
+from core.services.expiry_risk import refresh_expiry_risk
+
+
+class ExpiryRiskTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        # Vendu 2 / jour : 8 unités du lot court partent avant son expiration
+        self.fast = Product.objects.create(pharmacy=self.pharmacy, name="Paracétamol", unit_price=1000)
+        self.short = self.batch(self.fast, 10, days=3, price=600)
+        self.long = self.batch(self.fast, 20, days=365, price=650)
+        self.expired = self.batch(self.fast, 5, days=-2, price=600)
+        Sale.objects.bulk_create([
+            Sale(
+                pharmacy=self.pharmacy,
+                product=self.fast,
+                quantity=2,
+                unit_price=1000,
+                total_price=2000,
+                cost_total=1200,
+                created_at=timezone.make_aware(datetime.combine(self.today - timedelta(days=offset), time(12))),
+            )
+            for offset in range(1, 85)
+        ])
+
+        # Jamais vendu : tout le lot est à risque
+        self.unsold = Product.objects.create(pharmacy=self.pharmacy, name="Amoxicilline", unit_price=1000)
+        self.dormant = self.batch(self.unsold, 30, days=100, price=200)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def batch(self, product, quantity, days, price):
+        return ProductBatch.objects.create(
+            product=product,
+            quantity=quantity,
+            purchase_price=price,
+            expiry_date=self.today + timedelta(days=days),
+        )
+
+    def risks(self):
+        return {
+            r.batch_id: (r.projected_sales, r.quantity_at_risk, r.value_at_risk)
+            for r in BatchExpiryRisk.objects.for_pharmacy(self.pharmacy)
+        }
+
+    def test_fifo_projection_against_forecast(self):
+        version = PharmacyDataVersion.current(self.pharmacy.id)[0]
+
+        self.assertEqual(refresh_expiry_risk(self.pharmacy, today=self.today), 3)
+        self.assertEqual(self.risks(), {
+            self.short.id: (8, 2, 1200),
+            self.expired.id: (0, 5, 3000),
+            self.dormant.id: (0, 30, 6000),
+        })
+        self.assertGreater(PharmacyDataVersion.current(self.pharmacy.id)[0], version)
+
+    def test_sale_refreshes_only_the_sold_product(self):
+        call_command("compute_expiry_risk", stdout=StringIO())
+        BatchExpiryRisk.objects.filter(batch=self.dormant).update(quantity_at_risk=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("sale-create"), {"product_id": str(self.fast.id), "quantity": 8}, format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # Lot court ramené à 2 unités : écoulé avant expiration
+        risks = self.risks()
+        self.assertNotIn(self.short.id, risks)
+        self.assertEqual(risks[self.expired.id], (0, 5, 3000))
+        self.assertEqual(risks[self.dormant.id][1], 1)
+
+    def test_sale_leaves_refresh_to_nightly_job_without_cached_forecast(self):
+        refresh_expiry_risk(self.pharmacy)
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("sale-create"), {"product_id": str(self.fast.id), "quantity": 8}, format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # Prévision non recalculée sur le chemin caisse : lignes inchangées
+        self.assertIn(self.short.id, self.risks())
+        self.assertIsNone(cache.get(f"forecast:{self.pharmacy.id}:{self.today.isoformat()}"))
+
+    def test_receipt_refreshes_after_commit_from_cached_forecast(self):
+        def receive():
+            entry = StockEntry.objects.create(pharmacy=self.pharmacy)
+            StockEntryItem.objects.create(
+                stock_entry=entry, product=self.unsold, quantity=12,
+                purchase_price=200, expiry_date=self.today + timedelta(days=50),
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse("stock-entry-validate", kwargs={"pk": entry.pk}), {}, format="json")
+            self.assertEqual(response.status_code, 200, response.content)
+            return ProductBatch.objects.get(product=self.unsold, quantity=12, created_at__gte=entry.created_at)
+
+        # Prévision absente du cache : laissé au job nocturne, aucun ajustement du modèle
+        cold = receive()
+        self.assertNotIn(cold.id, self.risks())
+        self.assertIsNone(cache.get(f"forecast:{self.pharmacy.id}:{self.today.isoformat()}"))
+
+        call_command("compute_expiry_risk", stdout=StringIO())
+        warm = receive()
+        self.assertEqual(self.risks()[warm.id], (0, 12, 2400))
+
+    def test_endpoint_serves_precomputed_rows(self):
+        refresh_expiry_risk(self.pharmacy)
+
+        rows = self.client.get(reverse("expiry-risk")).json()
+
+        self.assertEqual(
+            [row["batch_id"] for row in rows],
+            [str(self.expired.id), str(self.short.id), str(self.dormant.id)],
+        )
+        self.assertEqual(rows[1]["days_to_expiry"], 3)
+        self.assertEqual((rows[1]["quantity"], rows[1]["quantity_at_risk"]), (10, 2))
+        self.assertEqual(rows[2]["product_name"], "Amoxicilline")
@@ -0,0 +1,103 @@
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    Sale,
+)
+from core.services.forecast import build_forecast, get_forecast
+
+
+class DemandForecastTests(TestCase):
+    """
+    Un produit vendu 7 unités le jour de semaine de `peak`, 1 unité les
+    autres jours, sur 12 semaines : les deux méthodes retrouvent le profil.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        self.product = Product.objects.create(pharmacy=self.pharmacy, name="Paracétamol", unit_price=100)
+        self.idle = Product.objects.create(pharmacy=self.pharmacy, name="Jamais vendu", unit_price=100)
+
+        self.today = timezone.localdate()
+        self.peak = self.today + timedelta(days=3)
+
+        sales = []
+        for offset in range(1, 12 * 7 + 1):
+            day = self.today - timedelta(days=offset)
+            quantity = 7 if day.weekday() == self.peak.weekday() else 1
+
+            sales.append(Sale(
+                pharmacy=self.pharmacy,
+                product=self.product,
+                quantity=quantity,
+                unit_price=100,
+                total_price=100 * quantity,
+                cost_total=60 * quantity,
+                created_at=timezone.make_aware(datetime.combine(day, time(12))),
+            ))
+
+        # Ventes du jour : hors modèle (journée incomplète)
+        sales.append(Sale(
+            pharmacy=self.pharmacy,
+            product=self.product,
+            quantity=500,
+            unit_price=100,
+            total_price=50000,
+            cost_total=30000,
+        ))
+        Sale.objects.bulk_create(sales)
+
+    def test_weekly_profile_is_forecast_per_product(self):
+        forecast = build_forecast(self.pharmacy, self.today)
+        daily = list(forecast.quantity[0])
+
+        self.assertEqual(forecast.product_ids, [self.product.id])
+        self.assertEqual(daily.index(max(daily[:7])), 3)
+        self.assertAlmostEqual(forecast.demand(7)[self.product.id], 13, places=2)
+        self.assertAlmostEqual(forecast.demand(14)[self.product.id], 26, places=2)
+        self.assertNotIn(self.idle.id, forecast.demand(7))
+
+        self.assertAlmostEqual(forecast.revenue[3], 700, places=0)
+        self.assertAlmostEqual(forecast.revenue_total(7), 1300, places=0)
+
+    def test_forecast_is_cached_for_the_day(self):
+        first = get_forecast(self.pharmacy, self.today)
+
+        with self.assertNumQueries(0):
+            again = get_forecast(self.pharmacy.id, self.today)
+
+        self.assertEqual(again.demand(7), first.demand(7))
+
+    def test_intelligence_uses_forecast(self):
+        client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        forecast = client.get(reverse("intelligence-overview")).json()["sales_forecast_7d"]
+
+        self.assertEqual(len(forecast["next_7_days"]), 7)
+        self.assertEqual(max(forecast["next_7_days"]), forecast["next_7_days"][3])
+        self.assertAlmostEqual(forecast["next_7_days"][3], 700, places=0)
@@ -0,0 +1,66 @@
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.instrumentation import RequestMetricsRegistry, check_shared_cache
+
+
+class RequestMetricsRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        # Deux workers : chacun son registre, un seul cache
+        self.first = RequestMetricsRegistry(100)
+        self.second = RequestMetricsRegistry(100)
+
+    def record(self, registry, route, pharmacy_id, total_ms, queries=2):
+        registry.record({
+            "route": route,
+            "method": "GET",
+            "status": 200,
+            "pharmacy_id": pharmacy_id,
+            "queries": queries,
+            "db_ms": 1.0,
+            "total_ms": total_ms,
+            "bytes": 100,
+            "slow": False,
+            "at": time.time(),
+        })
+
+    def routes(self, summary):
+        return {r["route"]: (r["requests"], r["avg_ms"], r["max_ms"]) for r in summary["routes"]}
+
+    def test_summary_aggregates_workers_and_filters_totals(self):
+        self.record(self.first, "sale-create", "a", 10)
+        self.record(self.first, "sale-create", "b", 30)
+        self.record(self.second, "sale-create", "a", 20)
+        self.record(self.second, "product-stock", "b", 40)
+        self.second.flush()
+
+        summary = self.first.summary()
+        self.assertEqual(summary["workers"], 2)
+        self.assertEqual(self.routes(summary), {
+            "sale-create": (3, 20.0, 30.0),
+            "product-stock": (1, 40.0, 40.0),
+        })
+
+        # Filtre pharmacie : totaux, p95 et dernières requêtes
+        summary = self.first.summary("a")
+        self.assertEqual(self.routes(summary), {"sale-create": (2, 15.0, 20.0)})
+        self.assertEqual(summary["routes"][0]["p95_ms"], 10.0)
+        self.assertEqual({r["pharmacy_id"] for r in summary["recent"]}, {"a"})
+
+    def test_reset_applies_to_every_worker(self):
+        self.record(self.first, "sale-create", "a", 10)
+        self.record(self.second, "sale-create", "a", 20)
+
+        self.first.reset()
+        self.second.flush()
+
+        self.assertEqual(self.first.summary()["routes"], [])
+
+    def test_process_local_cache_is_reported(self):
+        # LocMem (REDIS_URL absent) : un registre par worker
+        self.assertEqual(self.first.summary()["scope"], "process")
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ["core.W001"])
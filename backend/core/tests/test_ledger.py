@@ -0,0 +1,262 @@
+from datetime import date, timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.api.sales.serializers import SaleCreateSerializer
+from core.api.stock.serializers import StockEntryValidationSerializer
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    InventoryValuation,
+    PlatformDailySales,
+    Product,
+    ProductBatch,
+    Sale,
+    StockEntry,
+    StockEntryItem,
+    StockMovement,
+    StockSnapshot,
+)
+from core.services.ledger import day_start, ledger_drift, record_movements, stock_at, take_snapshot
+from core.services.write_off import write_off_expired
+
+
+class StockLedgerTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        self.product = Product.objects.create(pharmacy=self.pharmacy, name="Paracétamol", unit_price=1000)
+        self.other = Product.objects.create(pharmacy=self.pharmacy, name="Amoxicilline", unit_price=800)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def entry(self, *lines):
+        entry = StockEntry.objects.create(pharmacy=self.pharmacy)
+        items = [
+            StockEntryItem.objects.create(
+                stock_entry=entry,
+                product=product,
+                quantity=quantity,
+                purchase_price=600,
+                expiry_date=expiry_date,
+            )
+            for product, quantity, expiry_date in lines
+        ]
+        return entry, items
+
+    def validate(self, entry, payload=None):
+        return self.client.post(reverse("stock-entry-validate", kwargs={"pk": entry.pk}), payload or {}, format="json")
+
+    def test_receipt_sale_and_write_off_are_journaled(self):
+        expiry = self.today + timedelta(days=300)
+        entry, (dated, undated) = self.entry((self.product, 10, expiry), (self.other, 5, None))
+
+        # Péremption manquante : rien n'est reçu
+        response = self.validate(entry)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProductBatch.objects.exists())
+        self.assertEqual(StockEntry.objects.get(pk=entry.pk).status, "draft")
+
+        response = self.validate(entry, {"items": [{"id": str(undated.id), "expiry_date": str(expiry)}]})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            set(ProductBatch.objects.values_list("product_id", "quantity", "expiry_date")),
+            {(self.product.id, 10, expiry), (self.other.id, 5, expiry)},
+        )
+        self.assertEqual(
+            set(StockMovement.objects.values_list("kind", "quantity", "reference", "user_id")),
+            {("receipt", 10, entry.id, self.user.id), ("receipt", 5, entry.id, self.user.id)},
+        )
+
+        response = self.client.post(
+            reverse("sale-create"), {"product_id": str(self.product.id), "quantity": 3}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        sale = StockMovement.objects.get(kind="sale")
+        self.assertEqual((sale.quantity, str(sale.reference)), (-3, response.json()["sale_id"]))
+
+        ProductBatch.objects.filter(product=self.other).update(expiry_date=self.today - timedelta(days=1))
+        write_off_expired(self.pharmacy)
+        self.assertEqual(StockMovement.objects.get(kind="write_off").quantity, -5)
+
+        self.assertEqual(ledger_drift(self.pharmacy), [])
+        self.assertEqual(stock_at(self.pharmacy, timezone.now()), {self.product.id: 7})
+
+    def test_concurrent_validation_receives_once(self):
+        entry, _ = self.entry((self.product, 10, self.today + timedelta(days=300)))
+
+        # Lecture "brouillon" d'une requête concurrente, puis validation par l'autre
+        stale = StockEntry.objects.get(pk=entry.pk)
+        self.assertEqual(self.validate(entry).status_code, 200)
+
+        serializer = StockEntryValidationSerializer(
+            stale, data={}, context={"request": SimpleNamespace(user=self.user)}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+
+        self.assertEqual(ProductBatch.objects.count(), 1)
+        self.assertEqual(StockMovement.objects.filter(kind="receipt").count(), 1)
+        self.assertEqual(self.validate(entry).status_code, 400)
+
+    def test_sale_rereads_stock_under_lock(self):
+        batch = ProductBatch.objects.create(
+            product=self.product, quantity=5, purchase_price=600, expiry_date=self.today + timedelta(days=300)
+        )
+        serializer = SaleCreateSerializer(
+            data={"product_id": str(self.product.id), "quantity": 4},
+            context={"request": SimpleNamespace(user=self.user)},
+        )
+        serializer.is_valid(raise_exception=True)
+
+        # Vente concurrente entre la validation et la création
+        ProductBatch.objects.filter(pk=batch.pk).update(quantity=3)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+
+        self.assertEqual(ProductBatch.objects.get(pk=batch.pk).quantity, 3)
+        self.assertFalse(Sale.objects.exists())
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_platform_rollup_is_incremented_after_commit(self):
+        ProductBatch.objects.create(
+            product=self.product, quantity=5, purchase_price=600, expiry_date=self.today + timedelta(days=300)
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                reverse("sale-create"), {"product_id": str(self.product.id), "quantity": 2}, format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        # Ligne du jour intouchée dans la transaction de vente
+        self.assertFalse(PlatformDailySales.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        day = PlatformDailySales.objects.get(date=self.today)
+        self.assertEqual((day.revenue, day.cogs, day.sales_count), (2000, 1200, 1))
+
+    def test_stock_at_from_snapshot_and_deltas(self):
+        batch = ProductBatch.objects.create(
+            product=self.product, quantity=0, purchase_price=600, expiry_date=self.today + timedelta(days=300)
+        )
+
+        def move(days_ago, quantity, product=self.product):
+            record_movements(
+                self.pharmacy.id, "adjustment", [(product.id, batch.id, quantity, 600)],
+                created_at=day_start(self.today - timedelta(days=days_ago)) + timedelta(hours=10),
+            )
+
+        move(5, 50)
+        move(4, -10)
+        move(4, 8, product=self.other)
+        move(2, -15)
+        move(0, -5)
+
+        expected = {
+            4: {self.product.id: 40, self.other.id: 8},
+            2: {self.product.id: 25, self.other.id: 8},
+            0: {self.product.id: 20, self.other.id: 8},
+        }
+        replay = {days: stock_at(self.pharmacy, day_start(self.today - timedelta(days=days - 1))) for days in expected}
+        self.assertEqual(replay, expected)
+
+        # Snapshots nocturnes : mêmes réponses, rejouables
+        self.assertEqual(take_snapshot(self.pharmacy, self.today - timedelta(days=3)), 2)
+        call_command("snapshot_stock", "--date", str(self.today - timedelta(days=1)), stdout=StringIO())
+        call_command("snapshot_stock", "--date", str(self.today - timedelta(days=1)), stdout=StringIO())
+        self.assertEqual(StockSnapshot.objects.count(), 4)
+        self.assertEqual(
+            StockSnapshot.objects.get(taken_at=day_start(self.today - timedelta(days=1)), product=self.product).quantity,
+            25,
+        )
+
+        for days, stock in expected.items():
+            moment = day_start(self.today - timedelta(days=days - 1))
+            self.assertEqual(stock_at(self.pharmacy, moment), stock)
+
+        rows = self.client.get(reverse("stock-on-date"), {"date": str(self.today - timedelta(days=2))}).json()
+        self.assertEqual(
+            [(row["product_name"], row["quantity"]) for row in rows],
+            [("Amoxicilline", 8), ("Paracétamol", 25)],
+        )
+
+        movements = self.client.get(reverse("stock-movements"), {"product_id": str(self.other.id)}).json()
+        self.assertEqual([(m["kind"], m["quantity"]) for m in movements], [("adjustment", 8)])
+
+    @override_settings(STOCK_SNAPSHOT_DAILY_RETENTION_DAYS=10)
+    def test_valuation_backfill_and_retention(self):
+        expiry = self.today + timedelta(days=300)
+        old = ProductBatch.objects.create(product=self.product, quantity=0, purchase_price=600, expiry_date=expiry)
+        new = ProductBatch.objects.create(product=self.other, quantity=0, purchase_price=400, expiry_date=expiry)
+
+        record_movements(self.pharmacy.id, "receipt", [(self.product.id, old.id, 50, 600)],
+                         created_at=day_start(self.today - timedelta(days=40)) + timedelta(hours=9))
+        record_movements(self.pharmacy.id, "receipt", [(self.other.id, new.id, 10, 400)],
+                         created_at=day_start(self.today - timedelta(days=3)) + timedelta(hours=9))
+
+        call_command("snapshot_stock", "--days", "45", stdout=StringIO())
+
+        self.assertEqual(InventoryValuation.objects.count(), 45)
+        self.assertEqual(
+            InventoryValuation.objects.values_list("products", "quantity", "value").get(taken_at=day_start(self.today)),
+            (2, 60, 34000),
+        )
+        # Au-delà de 10 jours : seuls les snapshots produit du 1er du mois restent
+        limit = day_start(self.today - timedelta(days=10))
+        self.assertEqual(
+            {timezone.localtime(t).day for t in StockSnapshot.objects.filter(taken_at__lt=limit).values_list("taken_at", flat=True)},
+            {1},
+        )
+        self.assertEqual(StockSnapshot.objects.filter(taken_at__gte=limit).count(), 11 + 3)
+
+        # Valeur en fin de journée, à partir des snapshots
+        params = {"date_from": str(self.today - timedelta(days=5)), "date_to": str(self.today)}
+        response = self.client.get(reverse("finance-valuation"), params)
+        rows = response.json()
+        self.assertEqual(
+            [(row["date"], row["value"]) for row in rows],
+            [(str(self.today - timedelta(days=days)), value)
+             for days, value in ((5, 30000), (4, 30000), (3, 34000), (2, 34000), (1, 34000))],
+        )
+
+        # Snapshot rejoué : plus de 304 sur l'ancien ETag
+        call_command("snapshot_stock", stdout=StringIO())
+        refreshed = self.client.get(reverse("finance-valuation"), params, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(refreshed.status_code, 200)
+
+        # Clôtures mensuelles : dernier jour de chaque mois échu
+        months = self.client.get(reverse("finance-valuation"), {"interval": "month"}).json()
+        self.assertTrue(months)
+        self.assertTrue(all((date.fromisoformat(row["date"]) + timedelta(days=1)).day == 1 for row in months))
+
+        # Stock à une date ancienne : clôture mensuelle + journal
+        moment = day_start(self.today - timedelta(days=20))
+        self.assertEqual(stock_at(self.pharmacy, moment), {self.product.id: 50})
@@ -0,0 +1,133 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    PharmacyDataVersion,
+    Product,
+    ProductAnalytics,
+    ProductBatch,
+    Sale,
+)
+from core.services.product_analytics import refresh_product_analytics
+
+
+class ProductAnalyticsTests(TestCase):
+    """
+    Fenêtre de 84 jours, marge de 400 par unité :
+    - Paracétamol : 5 / jour (A, X)
+    - Vitamine C : 1 / jour (B, X)
+    - Sirop : 1 vente toutes les 3 semaines, 300 en stock (C, Z, rotation lente)
+    - Pommade : jamais vendue, créée il y a 100 jours (stock dormant)
+    """
+
+    def setUp(self):
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        self.star = self.product("Paracétamol", stock=50, price=600)
+        self.sell(self.star, range(1, 85), quantity=5)
+
+        self.steady = self.product("Vitamine C", stock=40, price=600)
+        self.sell(self.steady, range(1, 85), quantity=1)
+
+        self.slow = self.product("Sirop", stock=300, price=100)
+        self.sell(self.slow, (1, 22, 43, 64), quantity=1)
+
+        self.dead = self.product("Pommade", stock=100, price=500)
+        Product.objects.filter(pk=self.dead.pk).update(created_at=timezone.now() - timedelta(days=100))
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    # ---------- helpers ----------
+
+    def product(self, name, stock, price):
+        product = Product.objects.create(pharmacy=self.pharmacy, name=name, unit_price=1000)
+        ProductBatch.objects.create(
+            product=product,
+            quantity=stock,
+            purchase_price=price,
+            expiry_date=self.today + timedelta(days=365),
+        )
+        return product
+
+    def sell(self, product, offsets, quantity):
+        Sale.objects.bulk_create([
+            Sale(
+                pharmacy=self.pharmacy,
+                product=product,
+                quantity=quantity,
+                unit_price=1000,
+                total_price=1000 * quantity,
+                cost_total=600 * quantity,
+                created_at=timezone.make_aware(datetime.combine(self.today - timedelta(days=offset), time(12))),
+            )
+            for offset in offsets
+        ])
+
+    # ---------- tests ----------
+
+    def test_metrics_and_bands(self):
+        version = PharmacyDataVersion.current(self.pharmacy.id)[0]
+
+        self.assertEqual(refresh_product_analytics(self.pharmacy, self.today), 4)
+
+        rows = {a.product_id: a for a in ProductAnalytics.objects.for_pharmacy(self.pharmacy)}
+
+        star = rows[self.star.id]
+        self.assertEqual((star.units_sold, star.stock, star.abc_class, star.xyz_class), (420, 50, "A", "X"))
+        self.assertEqual(star.days_of_cover, 10.0)
+        self.assertAlmostEqual(star.sell_through, 420 / 470, places=4)
+        self.assertAlmostEqual(star.margin_share, 168000 / 203200, places=4)
+
+        self.assertEqual((rows[self.steady.id].abc_class, rows[self.steady.id].xyz_class), ("B", "X"))
+
+        slow = rows[self.slow.id]
+        self.assertEqual((slow.abc_class, slow.xyz_class, slow.flag), ("C", "Z", "slow_moving"))
+        self.assertEqual(slow.days_since_last_sale, 1)
+
+        dead = rows[self.dead.id]
+        self.assertEqual((dead.units_sold, dead.last_sale_at, dead.days_of_cover), (0, None, None))
+        self.assertEqual((dead.abc_class, dead.flag, dead.days_since_last_sale), ("C", "dead_stock", 100))
+
+        self.assertGreater(PharmacyDataVersion.current(self.pharmacy.id)[0], version)
+
+    def test_endpoints_read_precomputed_rows(self):
+        call_command("compute_product_analytics", stdout=StringIO())
+
+        # Ventes postérieures au calcul : ignorées jusqu'au prochain passage
+        self.sell(self.dead, (0,), quantity=1)
+
+        underperforming = self.client.get(reverse("intelligence-overview")).json()["underperforming_products"]
+        self.assertEqual(
+            [(p["product_name"], p["flag"]) for p in underperforming],
+            [("Pommade", "dead_stock"), ("Sirop", "slow_moving")],
+        )
+
+        rotation = {row["product"]: row for row in self.client.get(reverse("finance-stock-rotation")).json()}
+        self.assertEqual(rotation["Paracétamol"]["rotation_ratio"], 8.4)
+        self.assertEqual(rotation["Pommade"]["sold_quantity"], 0)
+        self.assertEqual(rotation["Vitamine C"]["abc_class"], "B")
@@ -0,0 +1,370 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse, include
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    StockCount,
+    StockEntry,
+    StockEntryItem,
+    Supplier,
+)
+
+from core.services.expiry_risk import refresh_expiry_risk
+from core.services.ledger import take_snapshot
+from core.services.product_analytics import refresh_product_analytics
+from core.services.scheduler import sync_jobs
+from core.services.stock_count import record_counts
+from core.services.transfer import transfer_stock
+
+from .dataset import grow_tenant, grow_platform
+
+
+# =====================================================
+# CASES : un appel par route de core/api/urls.py
+# =====================================================
+
+@dataclass
+class Case:
+    route: str
+    method: str
+    budget: int
+    user: Optional[str] = "tenant"  # "tenant" | "saas" | None
+    prepare: Optional[Callable] = None  # (test) -> (url kwargs, payload)
+
+
+CASES = [
+    # AUTH
+    Case("pin-login", "post", 4, user=None,
+         prepare=lambda t: ({}, {"pharmacy_id": str(t.pharmacy.id), "pin": "1234"})),
+    Case("admin-login", "post", 3, user=None,
+         prepare=lambda t: ({}, {"email": "root@example.com", "password": "secret123"})),
+
+    # SALES
+    # Lots verrouillés ; rollup plateforme et risque de péremption après COMMIT (hors compte),
+    # alertes stock hors requête (digest planifié send_stock_alerts)
+    Case("sale-create", "post", 15,
+         prepare=lambda t: (cache.clear(), ({}, t.sale_payload()))[-1]),
+    Case("sale-history", "get", 3),
+    Case("sale-audit-log", "get", 4),
+
+    # PRODUCTS
+    Case("product-stock", "get", 4),
+    Case("product-stock-async", "get", 4),
+    Case("low-stock", "get", 4),
+    Case("expiry-alerts", "get", 4),
+    Case("expiry-risk", "get", 4,
+         prepare=lambda t: (refresh_expiry_risk(t.pharmacy), ({}, None))[1]),
+
+    # STOCK
+    Case("stock-entry-create", "post", 7,
+         prepare=lambda t: ({}, {
+             "supplier": str(t.supplier.id),
+             "invoice_number": "F-NEW",
+             "total_amount": "1000.00",
+         })),
+    Case("stock-entry-list", "get", 4),
+    Case("stock-entry-detail", "get", 4,
+         prepare=lambda t: ({"pk": t.draft_entry().pk}, None)),
+    # + lots reçus et mouvements (INSERT groupés) ; produits du bon re-projetés
+    # après COMMIT (hors compte)
+    Case("stock-entry-validate", "post", 10,
+         prepare=lambda t: (cache.clear(), ({"pk": t.received_entry().pk}, {}))[1]),
+    # Réapprovisionnement : prévision recalculée (cache vidé)
+    Case("stock-reorder", "get", 8, prepare=lambda t: (cache.clear(), ({}, None))[1]),
+    Case("stock-reorder-drafts", "post", 15, prepare=lambda t: t.previous_reorder_drafts()),
+    # Lots expirés du jeu de données (à chaque taille) mis au rebut, puis rapport
+    Case("stock-write-off-expired", "post", 10, prepare=lambda t: ({}, {})),
+    Case("stock-write-offs", "get", 6),
+    Case("stock-movements", "get", 4),
+    # Dernier snapshot + mouvements depuis
+    Case("stock-on-date", "get", 7, prepare=lambda t: (take_snapshot(t.pharmacy), ({}, None))[1]),
+    # Inventaire complet : un lot sur deux compté avec écart, les autres à 0 ;
+    # clôture = verrous + un INSERT / UPDATE ensembliste par table, quel que soit le nombre de lots ;
+    # ouverture = INSERT dans un SAVEPOINT (session ouverte concurrente -> 400)
+    Case("stock-count-create", "post", 7, prepare=lambda t: t.close_stock_counts()),
+    Case("stock-count-list", "get", 4, prepare=lambda t: (t.stock_count(counted=True), ({}, None))[1]),
+    Case("stock-count-lines", "post", 6,
+         prepare=lambda t: ({"pk": t.stock_count().pk}, {"lines": t.counted_lines(payload=True)})),
+    Case("stock-count-detail", "get", 7,
+         prepare=lambda t: ({"pk": t.stock_count(counted=True).pk}, None)),
+    Case("stock-count-post", "post", 15,
+         prepare=lambda t: ({"pk": t.stock_count(counted=True).pk}, {})),
+    Case("stock-count-cancel", "post", 5,
+         prepare=lambda t: ({"pk": t.stock_count(counted=True).pk}, {})),
+    # Transfert vers une succursale : une unité de chaque lot vendable ; lots
+    # verrouillés, produits appariés / créés et écritures en bulk (2 versions de données)
+    Case("stock-transfer-create", "post", 19, prepare=lambda t: ({}, t.transfer_payload())),
+    # Succursale vidée : tout son catalogue en stock bas
+    Case("stock-transfer-replenish", "post", 20, prepare=lambda t: ({}, t.emptied_branch())),
+    Case("stock-transfer-list", "get", 4),
+    Case("stock-transfer-detail", "get", 5, prepare=lambda t: ({"pk": t.sample_transfer().pk}, None)),
+
+    # FINANCE
+    Case("finance-dashboard", "get", 7),
+    Case("finance-dashboard-async", "get", 7),
+    # + clôtures mensuelles (InventoryValuation)
+    Case("finance-monthly", "get", 5),
+    Case("finance-top-products", "get", 4),
+    Case("finance-valuation", "get", 4, prepare=lambda t: (take_snapshot(t.pharmacy), ({}, None))[1]),
+    Case("finance-valuation", "get", 4,
+         prepare=lambda t: (take_snapshot(t.pharmacy), ({}, {"interval": "month"}))[1]),
+    # Lu dans ProductAnalytics (job nocturne rejoué pour la taille courante)
+    Case("finance-stock-rotation", "get", 4,
+         prepare=lambda t: (refresh_product_analytics(t.pharmacy), ({}, None))[1]),
+
+    # INTELLIGENCE
+    # Prévision de demande : calculée une fois par jour (cache vidé : pire cas)
+    # + produits sous-performants précalculés (ProductAnalytics)
+    Case("intelligence-overview", "get", 11, prepare=lambda t: (cache.clear(), ({}, None))[1]),
+    Case("intelligence-overview-async", "get", 11, prepare=lambda t: (cache.clear(), ({}, None))[1]),
+
+    # DASHBOARD COMPOSITE (tous les widgets)
+    Case("dashboard", "get", 16, prepare=lambda t: (cache.clear(), ({}, None))[1]),
+    Case("dashboard-async", "get", 16, prepare=lambda t: (cache.clear(), ({}, None))[1]),
+
+    # BILLING (Stripe mocké)
+    Case("billing-checkout", "post", 2, prepare=lambda t: ({}, {"price_id": "price_test"})),
+    Case("billing-portal", "post", 2),
+    Case("billing-me", "get", 2),
+
+    # SAAS ADMIN
+    Case("admin-overview", "get", 4, user="saas", prepare=lambda t: (cache.clear(), ({}, None))[1]),
+    Case("admin-pharmacies", "get", 2, user="saas"),
+    Case("admin-pharmacies", "post", 2, user="saas",
+         prepare=lambda t: ({}, {"name": "Nouvelle", "type": "pharmacie"})),
+    Case("admin-pharmacy-detail", "get", 2, user="saas",
+         prepare=lambda t: ({"pk": t.pharmacy.pk}, None)),
+    Case("admin-pharmacy-detail", "patch", 3, user="saas",
+         prepare=lambda t: ({"pk": t.pharmacy.pk}, {"city": "Abéché"})),
+    Case("admin-pharmacy-detail", "delete", 24, user="saas",
+         prepare=lambda t: ({"pk": t.empty_pharmacy().pk}, None)),
+    Case("admin-pharmacy-activate", "post", 3, user="saas",
+         prepare=lambda t: ({"pk": t.pharmacy.pk}, {})),
+    Case("admin-pharmacy-suspend", "post", 3, user="saas",
+         prepare=lambda t: ({"pk": t.empty_pharmacy().pk}, {})),
+    Case("admin-subscriptions", "get", 4, user="saas"),
+    Case("admin-request-metrics", "get", 1, user="saas"),
+    Case("admin-jobs", "get", 2, user="saas", prepare=lambda t: (sync_jobs(), ({}, None))[1]),
+]
+
+
+def iter_route_names(patterns):
+    for p in patterns:
+        if isinstance(p, URLResolver):
+            yield from iter_route_names(p.url_patterns)
+        elif isinstance(p, URLPattern):
+            yield p.name
+
+
+# =====================================================
+# TESTS
+# =====================================================
+
+class QueryBudgetTests(TestCase):
+    """
+    Chaque endpoint est appelé sur un petit puis un gros jeu de données :
+    le nombre de requêtes SQL doit rester identique (pas de N+1)
+    et sous le budget déclaré.
+    """
+
+    SMALL = 1
+    LARGE = 4
+
+    def setUp(self):
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            stripe_customer_id="cus_test",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        self.saas_admin = CustomUser.objects.create_superuser(
+            email="root@example.com",
+            name="Root",
+            password="secret123",
+        )
+
+        self.supplier = Supplier.objects.create(pharmacy=self.pharmacy, name="Fournisseur")
+        self.sellable = Product.objects.create(
+            pharmacy=self.pharmacy,
+            name="Paracétamol",
+            dosage="500 mg",
+            form="comprime",
+            unit_price=1000,
+        )
+
+        self.scale = 0
+        self.branch = None
+
+    # ---------- helpers (prepare) ----------
+
+    def sale_payload(self):
+        ProductBatch.objects.create(
+            product=self.sellable,
+            quantity=10,
+            purchase_price=600,
+            expiry_date=timezone.now().date() + timedelta(days=365),
+        )
+        return {"product_id": str(self.sellable.id), "quantity": 1}
+
+    def draft_entry(self):
+        return StockEntry.objects.create(pharmacy=self.pharmacy, supplier=self.supplier)
+
+    def received_entry(self):
+        entry = self.draft_entry()
+        StockEntryItem.objects.bulk_create([
+            StockEntryItem(
+                stock_entry=entry,
+                product=self.sellable,
+                quantity=quantity,
+                purchase_price=600,
+                expiry_date=timezone.localdate() + timedelta(days=365),
+                line_total=quantity * 600,
+            )
+            for quantity in (10, 20)
+        ])
+        return entry
+
+    def previous_reorder_drafts(self):
+        # Régime établi : les brouillons de la veille sont remplacés
+        cache.clear()
+        StockEntry.objects.create(pharmacy=self.pharmacy, supplier=self.supplier, origin="reorder")
+        return {}, {}
+
+    def counted_lines(self, payload=False):
+        batches = ProductBatch.objects.filter(pharmacy=self.pharmacy).values_list("id", "quantity")
+        lines = [(batch_id, quantity + i % 3 - 1) for i, (batch_id, quantity) in enumerate(batches) if i % 2 and quantity]
+        if payload:
+            return [{"batch_id": str(batch_id), "quantity": quantity} for batch_id, quantity in lines]
+        return lines
+
+    def close_stock_counts(self):
+        # Une seule session ouverte par pharmacie
+        StockCount.objects.filter(pharmacy=self.pharmacy, status="open").update(status="cancelled")
+        return {}, {"full": True}
+
+    def stock_count(self, counted=False):
+        self.close_stock_counts()
+        count = StockCount.objects.create(pharmacy=self.pharmacy, created_by=self.user, full=True)
+        if counted:
+            record_counts(count, self.counted_lines())
+        return count
+
+    def network_branch(self):
+        if self.branch is None:
+            self.branch = Pharmacy.objects.create(name="Succursale", type="pharmacie", parent=self.pharmacy)
+            # Régime établi : version de données déjà créée
+            PharmacyDataVersion.bump(self.branch.id)
+        return self.branch
+
+    def transfer_lines(self):
+        return list(
+            ProductBatch.objects
+            .filter(pharmacy=self.pharmacy, quantity__gt=0, expiry_date__gte=timezone.localdate())
+            .values_list("id", flat=True)
+        )
+
+    def transfer_payload(self):
+        return {
+            "destination": str(self.network_branch().id),
+            "lines": [{"batch_id": str(batch_id), "quantity": 1} for batch_id in self.transfer_lines()],
+        }
+
+    def emptied_branch(self):
+        ProductBatch.objects.filter(pharmacy=self.network_branch()).delete()
+        return {"destination": str(self.branch.id)}
+
+    def sample_transfer(self):
+        return transfer_stock(self.pharmacy, self.network_branch(), [(batch_id, 1) for batch_id in self.transfer_lines()])
+
+    def empty_pharmacy(self):
+        return Pharmacy.objects.create(name="Vide", type="pharmacie")
+
+    # ---------- mesure ----------
+
+    def grow(self, scale):
+        grow_tenant(self.pharmacy, scale, user=self.user, seed=scale)
+        grow_platform(scale, seed=scale)
+        self.scale += scale
+
+    def client_for(self, who):
+        client = APIClient()
+
+        if who == "tenant":
+            tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        elif who == "saas":
+            tokens = generate_tokens_for_user(self.saas_admin, is_saas_admin=True)
+        else:
+            return client
+
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client
+
+    def measure(self, case):
+        kwargs, payload = case.prepare(self) if case.prepare else ({}, None)
+        client = self.client_for(case.user)
+        url = reverse(case.route, kwargs=kwargs)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, case.method)(url, payload, format="json")
+
+        self.assertLess(
+            response.status_code, 400,
+            f"{case.method.upper()} {url} -> {response.status_code}: {response.content[:300]}"
+        )
+        return len(queries)
+
+    def measure_all(self):
+        stripe_session = SimpleNamespace(url="https://stripe.test/session")
+
+        with mock.patch("stripe.checkout.Session.create", return_value=stripe_session), \
+                mock.patch("stripe.billing_portal.Session.create", return_value=stripe_session):
+            return [self.measure(case) for case in CASES]
+
+    # ---------- tests ----------
+
+    def test_every_api_route_has_a_budget(self):
+        routes = set(iter_route_names(include("core.api.urls")[0].urlpatterns))
+        covered = {case.route for case in CASES}
+
+        self.assertEqual(routes - covered, set(), "Routes sans budget de requêtes")
+
+    def test_query_count_is_bounded_and_independent_of_data_size(self):
+        self.grow(self.SMALL)
+        small = self.measure_all()
+
+        self.grow(self.LARGE)
+        large = self.measure_all()
+
+        for case, n_small, n_large in zip(CASES, small, large):
+            with self.subTest(route=case.route, method=case.method):
+                self.assertEqual(
+                    n_small, n_large,
+                    f"{case.route}: {n_small} requêtes -> {n_large} quand les données x{self.LARGE}"
+                )
+                self.assertLessEqual(n_large, case.budget)
@@ -0,0 +1,126 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Pharmacy
+
+
+# =====================================================
+# FAKE STRIPE SERVER (local stand-in)
+# =====================================================
+
+PERIOD_END = int(datetime(2030, 1, 31, tzinfo=dt_timezone.utc).timestamp())
+
+FAKE_SUBSCRIPTIONS = {
+    "sub_active": {"status": "active", "current_period_end": PERIOD_END},
+    "sub_past_due": {"status": "past_due", "current_period_end": PERIOD_END},
+    "sub_synced": {"status": "trialing", "current_period_end": PERIOD_END},
+}
+
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        sub_id = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        sub = FAKE_SUBSCRIPTIONS.get(sub_id)
+
+        if sub is None:
+            status, body = 404, {
+                "error": {
+                    "type": "invalid_request_error",
+                    "message": f"No such subscription: '{sub_id}'",
+                }
+            }
+        else:
+            status, body = 200, {"id": sub_id, "object": "subscription", **sub}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class ReconcileSubscriptionsTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStripeHandler)
+        cls.api_base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        period_end = datetime.fromtimestamp(PERIOD_END, tz=dt_timezone.utc)
+
+        self.active = self._pharmacy("sub_active", "past_due",
+                                     grace_until=datetime(2029, 1, 1, tzinfo=dt_timezone.utc))
+        self.past_due = self._pharmacy("sub_past_due", "active")
+        self.synced = self._pharmacy("sub_synced", "trialing", current_period_end=period_end)
+        self.missing = self._pharmacy("sub_missing", "active")
+        self.no_sub = self._pharmacy(None, "inactive")
+
+    def _pharmacy(self, sub_id, status, **extra):
+        return Pharmacy.objects.create(
+            name=f"Pharmacie {sub_id}",
+            type="pharmacie",
+            stripe_subscription_id=sub_id,
+            subscription_status=status,
+            **extra
+        )
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command(
+            "reconcile_subscriptions",
+            "--api-base", self.api_base,
+            "--batch-size", "2",
+            "--concurrency", "2",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_reconcile_updates_drifted_pharmacies(self):
+        output = self._run()
+
+        self.assertIn("3 pharmacies updated", output)
+
+        self.active.refresh_from_db()
+        self.assertEqual(self.active.subscription_status, "active")
+        self.assertIsNone(self.active.grace_until)
+        self.assertEqual(self.active.current_period_end.timestamp(), PERIOD_END)
+
+        self.past_due.refresh_from_db()
+        self.assertEqual(self.past_due.subscription_status, "past_due")
+        self.assertGreater(self.past_due.grace_until, datetime.now(dt_timezone.utc) + timedelta(days=6))
+
+        self.missing.refresh_from_db()
+        self.assertEqual(self.missing.subscription_status, "canceled")
+
+        self.no_sub.refresh_from_db()
+        self.assertEqual(self.no_sub.subscription_status, "inactive")
+
+    def test_dry_run_reports_without_writing(self):
+        output = self._run("--dry-run")
+
+        self.assertIn("3 pharmacies would be updated", output)
+        self.assertIn("subscription_status: past_due -> active", output)
+
+        self.active.refresh_from_db()
+        self.assertEqual(self.active.subscription_status, "past_due")
@@ -0,0 +1,164 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    Sale,
+    StockEntry,
+    StockEntryItem,
+    Supplier,
+)
+from core.services.reorder import reorder_suggestions
+
+
+class ReorderTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        self.supplier = Supplier.objects.create(pharmacy=self.pharmacy, name="Grossiste", lead_time_days=5)
+
+        # Vendu 2 / jour ; 10 unités expirent dans 3 jours, 20 dans un an
+        self.fast = self.product("Paracétamol", min_stock_level=5)
+        self.batch(self.fast, 10, days=3, price=600)
+        self.batch(self.fast, 20, days=365, price=650)
+        self.sell(self.fast, per_day=2)
+
+        receipt = StockEntry.objects.create(pharmacy=self.pharmacy, supplier=self.supplier, status="validated")
+        StockEntryItem.objects.create(
+            stock_entry=receipt, product=self.fast, quantity=20, purchase_price=650,
+            expiry_date=self.today + timedelta(days=365),
+        )
+
+        # Bon saisi non validé : déjà en route
+        pending = StockEntry.objects.create(pharmacy=self.pharmacy, supplier=self.supplier)
+        StockEntryItem.objects.create(stock_entry=pending, product=self.fast, quantity=5, purchase_price=650)
+
+        # Jamais vendu, sous le seuil minimum, jamais reçu via un bon
+        self.unsold = self.product("Amoxicilline", min_stock_level=10)
+
+        # Vendu 1 / jour, largement couvert
+        self.covered = self.product("Vitamine C", min_stock_level=5)
+        self.batch(self.covered, 500, days=400, price=100)
+        self.sell(self.covered, per_day=1)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    # ---------- helpers ----------
+
+    def product(self, name, min_stock_level):
+        return Product.objects.create(
+            pharmacy=self.pharmacy, name=name, unit_price=1000, min_stock_level=min_stock_level,
+        )
+
+    def batch(self, product, quantity, days, price):
+        ProductBatch.objects.create(
+            product=product,
+            quantity=quantity,
+            purchase_price=price,
+            expiry_date=self.today + timedelta(days=days),
+        )
+
+    def sell(self, product, per_day):
+        Sale.objects.bulk_create([
+            Sale(
+                pharmacy=self.pharmacy,
+                product=product,
+                quantity=per_day,
+                unit_price=1000,
+                total_price=1000 * per_day,
+                cost_total=600 * per_day,
+                created_at=timezone.make_aware(datetime.combine(self.today - timedelta(days=offset), time(12))),
+            )
+            for offset in range(1, 85)
+        ])
+
+    # ---------- tests ----------
+
+    def test_order_quantities(self):
+        suggestions = {s.product_id: s for s in reorder_suggestions(self.pharmacy, self.today)}
+
+        self.assertNotIn(self.covered.id, suggestions)
+
+        fast = suggestions[self.fast.id]
+        # Horizon 5 + 14 jours : demande 38 + sécurité 3 jours (6)
+        self.assertEqual(fast.supplier_id, self.supplier.id)
+        self.assertAlmostEqual(fast.demand, 38, places=1)
+        self.assertEqual(fast.target, 44)
+        # Lot court : 4 jours de ventes (8) avant expiration, 2 perdus
+        self.assertEqual((fast.stock, fast.usable_stock, fast.at_risk), (30, 28, 2))
+        self.assertEqual(fast.on_order, 5)
+        self.assertEqual(fast.quantity, 11)
+
+        unsold = suggestions[self.unsold.id]
+        self.assertIsNone(unsold.supplier_id)
+        self.assertEqual(unsold.lead_time_days, 7)
+        self.assertEqual(unsold.quantity, 10)
+
+    def test_drafts_per_supplier_replace_previous_ones(self):
+        version = PharmacyDataVersion.current(self.pharmacy.id)[0]
+
+        for _ in range(2):
+            response = self.client.post(reverse("stock-reorder-drafts"))
+            self.assertEqual(response.status_code, 201, response.content)
+
+        drafts = StockEntry.objects.filter(pharmacy=self.pharmacy, origin="reorder")
+
+        self.assertEqual(drafts.count(), 2)
+        self.assertEqual({d["lines"] for d in response.json()}, {1})
+
+        order = drafts.get(supplier=self.supplier)
+        line = order.items.get()
+        self.assertEqual((line.product_id, line.quantity, line.expiry_date), (self.fast.id, 11, None))
+        self.assertEqual(order.total_amount, 11 * 650)
+
+        # Le bon saisi n'est pas touché
+        self.assertEqual(StockEntry.objects.filter(origin="manual", status="draft").count(), 1)
+        self.assertGreater(PharmacyDataVersion.current(self.pharmacy.id)[0], version)
+
+    def test_suggestion_endpoint(self):
+        response = self.client.get(reverse("stock-reorder"))
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            {row["product_name"]: row["quantity"] for row in response.json()},
+            {"Paracétamol": 11, "Amoxicilline": 10},
+        )
+
+    def test_nightly_command(self):
+        call_command("generate_reorder_drafts", "--dry-run", stdout=StringIO())
+        self.assertFalse(StockEntry.objects.filter(origin="reorder").exists())
+
+        out = StringIO()
+        call_command("generate_reorder_drafts", stdout=out)
+
+        self.assertEqual(StockEntry.objects.filter(origin="reorder", status="draft").count(), 2)
+        self.assertIn("2 draft purchase orders created", out.getvalue())
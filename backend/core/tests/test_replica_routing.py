@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import router
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.api.mixins import replica_reads
+from core.db.replica import get_read_alias
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    ProductBatch,
+    Sale,
+    PlatformDailySales,
+)
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class ReplicaRoutingTests(TestCase):
+    """
+    Deux bases réelles (default / replica) : la « réplication » est simulée
+    en sauvant explicitement sur le réplica ce qui doit y être visible.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+        self.product = Product.objects.create(
+            pharmacy=self.pharmacy,
+            name="Paracétamol",
+            dosage="500 mg",
+            form="comprime",
+            unit_price=1000,
+        )
+        ProductBatch.objects.create(
+            product=self.product,
+            quantity=50,
+            purchase_price=600,
+            expiry_date=timezone.now().date() + timedelta(days=365),
+        )
+        PlatformDailySales.objects.create(date=timezone.localdate())
+
+        self.replicate(self.pharmacy, self.user, self.product)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def replicate(self, *objs):
+        for obj in objs:
+            obj.save(using="replica", force_insert=True)
+            obj._state.db = "default"  # l'objet reste celui du primaire
+
+    def sale(self, amount):
+        return Sale(
+            pharmacy=self.pharmacy,
+            product=self.product,
+            quantity=1,
+            unit_price=amount,
+            total_price=amount,
+        )
+
+    def dashboard_revenue(self):
+        response = self.client.get(reverse("finance-dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return response.data["current"]["revenue"]
+
+    def test_reporting_view_reads_from_replica(self):
+        self.sale(1000).save()                        # primaire seulement
+        self.replicate(self.sale(7000))               # réplica seulement
+
+        self.assertEqual(self.dashboard_revenue(), 7000)
+
+    def test_requester_reads_own_sales_after_writing(self):
+        response = self.client.post(
+            reverse("sale-create"),
+            {"product_id": str(self.product.id), "quantity": 2},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # Pas encore répliquée, mais l'auteur est épinglé au primaire
+        self.assertEqual(self.dashboard_revenue(), 2000)
+
+        cache.clear()  # fin de la fenêtre d'épinglage
+        self.assertEqual(self.dashboard_revenue(), 0)
+
+    @override_settings(REPLICA_DATABASE_ALIAS=None)
+    def test_without_replica_everything_stays_on_primary(self):
+        self.sale(1000).save()
+
+        self.assertEqual(self.dashboard_revenue(), 1000)
+
+    def test_writes_always_go_to_primary(self):
+        product = Product.objects.using("replica").get(pk=self.product.pk)
+
+        self.assertEqual(router.db_for_write(Product, instance=product), "default")
+
+    def test_decorator_scopes_reads_to_the_call(self):
+        seen = []
+
+        @replica_reads
+        def view(request):
+            seen.append(get_read_alias())
+
+        view(type("Request", (), {"method": "GET", "user": self.user})())
+        view(type("Request", (), {"method": "POST", "user": self.user})())
+
+        self.assertEqual(seen, ["replica", None])
+        self.assertIsNone(get_read_alias())
@@ -0,0 +1,141 @@
+import gzip
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.api.renderers import ORJSONRenderer
+from core.compression import choose_encoding
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    ProductBatch,
+    Sale,
+)
+
+
+class ResponseFormatTests(TestCase):
+
+    def setUp(self):
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        for i in range(30):
+            product = Product.objects.create(
+                pharmacy=self.pharmacy,
+                name=f"Produit {i}",
+                dosage="500 mg",
+                form="comprime",
+                unit_price=1000 + i,
+            )
+            ProductBatch.objects.create(
+                product=product,
+                quantity=10 + i,
+                purchase_price=600,
+                expiry_date=timezone.now().date() + timedelta(days=365),
+            )
+            Sale.objects.create(
+                pharmacy=self.pharmacy,
+                product=product,
+                quantity=1,
+                unit_price=product.unit_price,
+                total_price=product.unit_price,
+                cost_total=600,
+            )
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def test_orjson_output_matches_drf_renderer(self):
+        data = {
+            "price": Decimal("12.50"),
+            "at": timezone.now(),
+            "day": timezone.localdate(),
+            "name": "Paracétamol",
+            1: [None, True, 1.5],
+        }
+
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+        response = self.client.get(reverse("sale-history"))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(len(response.json()), 30)
+
+    def test_columnar_format(self):
+        rows = self.client.get(reverse("product-stock")).json()
+        response = self.client.get(reverse("product-stock"), {"format": "columnar"})
+
+        self.assertEqual(response["Content-Type"], "application/vnd.ngrpharma.columnar+json")
+
+        data = response.json()
+        self.assertEqual(data["columns"], list(rows[0]))
+        self.assertEqual([dict(zip(data["columns"], row)) for row in data["rows"]], rows)
+        self.assertLess(len(response.content), len(json.dumps(rows)))
+
+        # Paginé : seul "results" passe en colonnes
+        audit = self.client.get(reverse("sale-audit-log"), {"format": "columnar"}).json()
+        self.assertEqual(set(audit["results"]), {"columns", "rows"})
+
+        # Hors des listes : format inconnu
+        self.assertEqual(
+            self.client.get(reverse("finance-dashboard"), {"format": "columnar"}).status_code,
+            404,
+        )
+
+    def test_gzip_negotiated_by_accept_encoding(self):
+        plain = self.client.get(reverse("sale-history"))
+        compressed = self.client.get(reverse("sale-history"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertLess(len(compressed.content), len(plain.content))
+
+    def test_compressed_etag_still_answers_304(self):
+        first = self.client.get(reverse("product-stock"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertTrue(first["ETag"].startswith('W/"'))
+
+        again = self.client.get(
+            reverse("product-stock"),
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=first["ETag"],
+        )
+        self.assertEqual(again.status_code, 304)
+
+    @override_settings(COMPRESSION_MIN_BYTES=10 ** 9)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse("sale-history"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(choose_encoding("*"), choose_encoding("br, gzip"))
+        self.assertIsNone(choose_encoding("gzip;q=0, identity"))
+        self.assertIsNone(choose_encoding(""))
+        self.assertIsNone(choose_encoding(None))
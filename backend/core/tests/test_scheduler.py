@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.cron import CronSchedule
+from core.models import JobRun, Pharmacy, ScheduledJob
+from core.services.scheduler import claim, due_jobs, release, sync_jobs, tick
+
+
+JOBS = {
+    "expiry-risk": {"command": "compute_expiry_risk", "schedule": "15 3 * * *", "per_tenant": True},
+    "rollups": {"command": "rebuild_rollups", "arguments": ["--days", "1"], "schedule": "0 4 * * 1-5"},
+}
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CronScheduleTests(TestCase):
+
+    def test_next_after(self):
+        self.assertEqual(CronSchedule("15 3 * * *").next_after(local(2026, 1, 5, 3, 15)), local(2026, 1, 6, 3, 15))
+        # 2026-01-09 = vendredi -> lundi suivant
+        self.assertEqual(CronSchedule("0 4 * * 1-5").next_after(local(2026, 1, 9, 5, 0)), local(2026, 1, 12, 4, 0))
+        self.assertEqual(CronSchedule("*/20 * * * *").next_after(local(2026, 1, 5, 10, 41)), local(2026, 1, 5, 11, 0))
+        # Jour du mois OU jour de semaine (cron Vixie) : le 1er ou un dimanche
+        self.assertEqual(CronSchedule("0 0 1 * 0").next_after(local(2026, 1, 5, 0, 0)), local(2026, 1, 11, 0, 0))
+
+        for expression in ("* * *", "60 * * * *", "0 0 31 2 *"):
+            with self.assertRaises(ValueError):
+                CronSchedule(expression).next_after(local(2026, 1, 1))
+
+
+@override_settings(SCHEDULER_JOBS=JOBS)
+class SchedulerTests(TestCase):
+
+    def setUp(self):
+        self.now = local(2026, 1, 5, 3, 16)
+        self.pharmacies = [
+            Pharmacy.objects.create(name=f"Pharmacie {i}", type="pharmacie", subscription_status="active")
+            for i in range(3)
+        ]
+
+    def test_sync_keeps_existing_jobs(self):
+        self.assertEqual(sync_jobs(now=self.now), 2)
+        ScheduledJob.objects.filter(name="rollups").update(schedule="0 5 * * *", is_enabled=False)
+
+        self.assertEqual(sync_jobs(now=self.now), 0)
+        job = ScheduledJob.objects.get(name="rollups")
+        self.assertEqual((job.schedule, job.is_enabled), ("0 5 * * *", False))
+        self.assertEqual(ScheduledJob.objects.get(name="expiry-risk").next_run_at, local(2026, 1, 6, 3, 15))
+
+    def test_lock_is_held_by_one_node(self):
+        sync_jobs(now=self.now)
+        job = ScheduledJob.objects.get(name="rollups")
+
+        self.assertTrue(claim(job, "node-a", self.now))
+        self.assertFalse(claim(job, "node-b", self.now))
+        # Bail expiré : un nœud mort ne bloque pas la tâche
+        self.assertTrue(claim(job, "node-b", self.now + timedelta(hours=2)))
+
+        release(job, "node-a", self.now)
+        self.assertEqual(ScheduledJob.objects.get(pk=job.pk).locked_by, "node-b")
+        release(job, "node-b", self.now)
+        self.assertEqual(ScheduledJob.objects.get(pk=job.pk).locked_by, "")
+
+    def test_stale_read_does_not_rerun_an_occurrence(self):
+        sync_jobs(now=self.now)
+        due_at = local(2026, 1, 5, 4, 0)
+        # Nœud B a lu la tâche due, puis s'est attardé sur une autre
+        stale = ScheduledJob.objects.get(name="rollups")
+
+        job = ScheduledJob.objects.get(name="rollups")
+        self.assertTrue(claim(job, "node-a", due_at))
+        release(job, "node-a", due_at + timedelta(minutes=5))
+
+        self.assertFalse(claim(stale, "node-b", due_at + timedelta(minutes=6)))
+        self.assertEqual(ScheduledJob.objects.get(pk=job.pk).next_run_at, local(2026, 1, 6, 4, 0))
+
+    def test_run_longer_than_the_lease_is_not_rerun(self):
+        sync_jobs(now=self.now)
+        due_at = local(2026, 1, 5, 4, 0)
+        job = ScheduledJob.objects.get(name="rollups")
+
+        # Occurrence consommée à la prise du verrou
+        self.assertTrue(claim(job, "node-a", due_at))
+        self.assertEqual(ScheduledJob.objects.get(pk=job.pk).next_run_at, local(2026, 1, 6, 4, 0))
+
+        # Bail expiré, run de node-a toujours en cours
+        later = due_at + timedelta(seconds=settings.SCHEDULER_LOCK_SECONDS + 60)
+        self.assertEqual(due_jobs(later), [])
+        self.assertFalse(claim(job, "node-b", later))
+        self.assertEqual(ScheduledJob.objects.get(pk=job.pk).locked_by, "node-a")
+
+    def test_tick_fans_out_per_tenant_and_records_failures(self):
+        sync_jobs(now=self.now - timedelta(days=1))
+        ScheduledJob.objects.filter(name="rollups").update(next_run_at=self.now + timedelta(hours=1))
+        failing = self.pharmacies[1]
+
+        def refresh(pharmacy):
+            if pharmacy.pk == failing.pk:
+                raise RuntimeError("boom")
+            return 0
+
+        with mock.patch("core.management.commands.compute_expiry_risk.refresh_expiry_risk", side_effect=refresh), \
+                self.assertLogs("core.management.commands.compute_expiry_risk", "ERROR"):
+            runs = tick("node-a", self.now)
+
+        self.assertEqual([run.job.name for run in runs], ["expiry-risk"])
+        run = JobRun.objects.get()
+        self.assertEqual((run.status, run.tenants_total, run.tenants_failed), ("partial", 3, 1))
+        self.assertIn(str(failing.pk), run.error)
+
+        job = ScheduledJob.objects.get(name="expiry-risk")
+        self.assertEqual(job.locked_by, "")
+        self.assertGreater(job.next_run_at, timezone.now())
+
+        # Déjà replanifiée : rien à faire au passage suivant
+        self.assertEqual(tick("node-a", self.now), [])
+
+    def test_run_command(self):
+        out = StringIO()
+        call_command("run_scheduler", "--run", "rollups", stdout=out, stderr=StringIO())
+
+        self.assertIn("rollups | success", out.getvalue())
+        self.assertEqual(JobRun.objects.get().status, "success")
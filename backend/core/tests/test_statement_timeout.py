@@ -0,0 +1,59 @@
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.api.mixins import StatementTimeoutMixin
+from core.db.timeouts import QUERY_CANCELED, is_statement_timeout
+
+
+class FakePgError(Exception):
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+
+
+def db_error(sqlstate):
+    try:
+        raise OperationalError("canceling statement") from FakePgError(sqlstate)
+    except OperationalError as exc:
+        return exc
+
+
+class ReportView(StatementTimeoutMixin, APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    error = None
+
+    def get(self, request):
+        if self.error:
+            raise self.error
+        return Response({"ok": True})
+
+
+class StatementTimeoutTests(SimpleTestCase):
+
+    databases = {"default"}
+
+    def call(self, error=None):
+        view = ReportView.as_view(error=error)
+        return view(APIRequestFactory().get("/report/"))
+
+    def test_query_canceled_is_detected(self):
+        self.assertTrue(is_statement_timeout(db_error(QUERY_CANCELED)))
+        self.assertFalse(is_statement_timeout(db_error("08006")))
+        self.assertFalse(is_statement_timeout(ValueError()))
+
+    def test_timeout_becomes_503(self):
+        response = self.call(db_error(QUERY_CANCELED))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data["detail"].code, "statement_timeout")
+
+    def test_other_database_errors_are_not_masked(self):
+        with self.assertRaises(OperationalError):
+            self.call(db_error("08006"))
+
+    def test_noop_outside_postgresql(self):
+        self.assertEqual(self.call().status_code, 200)
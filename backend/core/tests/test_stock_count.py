@@ -0,0 +1,164 @@
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    StockAdjustment,
+    StockCount,
+    StockMovement,
+)
+from core.services.ledger import ledger_drift, record_movements
+from core.services.stock_count import open_count
+
+
+class StockCountTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        self.product = Product.objects.create(pharmacy=self.pharmacy, name="Paracétamol", unit_price=1000)
+        self.first = self.batch(10, days=100, price=600)
+        self.second = self.batch(5, days=200, price=400)
+        self.uncounted = self.batch(8, days=300, price=500)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def batch(self, quantity, days, price):
+        batch = ProductBatch.objects.create(
+            product=self.product,
+            quantity=quantity,
+            purchase_price=price,
+            expiry_date=self.today + timedelta(days=days),
+        )
+        record_movements(self.pharmacy.id, "opening", [(self.product.id, batch.id, quantity, price)])
+        return batch
+
+    def open(self, **payload):
+        response = self.client.post(reverse("stock-count-create"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def upload(self, count_id, *lines):
+        return self.client.post(
+            reverse("stock-count-lines", kwargs={"pk": count_id}),
+            {"lines": [{"batch_id": str(batch_id), "quantity": quantity} for batch_id, quantity in lines]},
+            format="json",
+        )
+
+    def quantities(self):
+        return dict(ProductBatch.objects.values_list("id", "quantity"))
+
+    def test_chunked_count_and_post(self):
+        count_id = self.open(note="Inventaire annuel")
+        self.assertEqual(self.client.post(reverse("stock-count-create"), {}, format="json").status_code, 400)
+
+        unknown = uuid.uuid4()
+        response = self.upload(count_id, (self.first.id, 7), (unknown, 3))
+        self.assertEqual(response.json(), {"received": 1, "unknown": [str(unknown)]})
+        # Re-scan : la ligne est remplacée
+        response = self.upload(count_id, (self.second.id, 6), (self.first.id, 8))
+        self.assertEqual(response.json()["received"], 2)
+
+        # Vente après le scan (lot le plus proche de l'expiration)
+        response = self.client.post(
+            reverse("sale-create"), {"product_id": str(self.product.id), "quantity": 2}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        report = self.client.get(reverse("stock-count-detail", kwargs={"pk": count_id})).json()
+        self.assertEqual(
+            report["totals"], {"lines": 2, "counted": 14, "units_gained": 1, "units_lost": 2, "value": -800}
+        )
+        self.assertEqual(report["uncounted"], {"batches": 1, "units": 8, "value": 4000})
+        self.assertEqual(
+            [(row["batch_id"], row["variance"]) for row in report["variances"]],
+            [(str(self.first.id), -2), (str(self.second.id), 1)],
+        )
+
+        version = PharmacyDataVersion.current(self.pharmacy.id)[0]
+        response = self.client.post(reverse("stock-count-post", kwargs={"pk": count_id}))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            response.json(), {"batches": 2, "units_gained": 1, "units_lost": 2, "value": "-800.00"}
+        )
+
+        # Écart appliqué au stock courant : 8 comptés, 2 vendus depuis
+        self.assertEqual(self.quantities(), {self.first.id: 6, self.second.id: 6, self.uncounted.id: 8})
+        self.assertEqual(
+            set(StockAdjustment.objects.values_list("batch_id", "reason", "quantity", "value", "note")),
+            {
+                (self.first.id, "count", -2, Decimal("-1200.00"), "Inventaire annuel"),
+                (self.second.id, "count", 1, Decimal("400.00"), "Inventaire annuel"),
+            },
+        )
+        self.assertEqual(StockMovement.objects.filter(kind="adjustment").count(), 2)
+        self.assertEqual(ledger_drift(self.pharmacy), [])
+        self.assertGreater(PharmacyDataVersion.current(self.pharmacy.id)[0], version)
+
+        # Session close
+        self.assertEqual(self.upload(count_id, (self.first.id, 1)).status_code, 400)
+        self.assertEqual(self.client.post(reverse("stock-count-post", kwargs={"pk": count_id})).status_code, 400)
+
+        counts = self.client.get(reverse("stock-count-list")).json()
+        self.assertEqual([(c["status"], c["lines"]) for c in counts], [("posted", 2)])
+
+    def test_concurrent_open_is_rejected_by_the_constraint(self):
+        open_count(self.pharmacy, self.user)
+
+        # Les deux requêtes ont lu "aucune session ouverte"
+        with mock.patch("django.db.models.query.QuerySet.exists", return_value=False):
+            with self.assertRaises(ValidationError) as raised:
+                open_count(self.pharmacy, self.user)
+
+        self.assertEqual(raised.exception.detail, {"detail": "Un inventaire est déjà en cours"})
+        self.assertEqual(StockCount.objects.filter(status="open").count(), 1)
+
+    def test_full_count_zeroes_uncounted_batches(self):
+        count_id = self.open(full=True)
+        self.upload(count_id, (self.first.id, 10), (self.second.id, 4))
+
+        # Le stock est descendu sous le compté : plancher à 0
+        ProductBatch.objects.filter(id=self.second.id).update(quantity=0)
+        record_movements(self.pharmacy.id, "sale", [(self.product.id, self.second.id, -5, 400)])
+
+        response = self.client.post(reverse("stock-count-post", kwargs={"pk": count_id}))
+        self.assertEqual(response.json()["units_lost"], 8)
+
+        self.assertEqual(self.quantities(), {self.first.id: 10, self.second.id: 0, self.uncounted.id: 0})
+        self.assertEqual(list(StockAdjustment.objects.values_list("batch_id", "quantity")), [(self.uncounted.id, -8)])
+        self.assertEqual(ledger_drift(self.pharmacy), [])
+
+        # Nouvelle session possible une fois la précédente close
+        self.open()
+        self.assertEqual(StockCount.objects.filter(status="open").count(), 1)
@@ -0,0 +1,67 @@
+from django.db.models import F, Sum
+from django.test import TestCase
+
+from core.models import (
+    Pharmacy,
+    Product,
+    ProductBatch,
+    Sale,
+    SaleBatchConsumption,
+    StockEntry,
+    StockEntryItem,
+)
+from core.services.synthetic import (
+    BulkWriter,
+    DatasetSpec,
+    SyntheticDataGenerator,
+)
+
+
+class SyntheticDataGeneratorTests(TestCase):
+
+    def generate(self, **kwargs):
+        spec = DatasetSpec(**{
+            "pharmacies": 2,
+            "products": 20,
+            "batches_per_product": 2,
+            "months": 2,
+            "sales_per_day": 10,
+            "stock_entries_per_month": 2,
+            "seed": 42,
+            **kwargs,
+        })
+        # Petit chunk : plusieurs flush au milieu d'un tenant
+        return SyntheticDataGenerator(spec, writer=BulkWriter(chunk_size=500)).run()
+
+    def test_counts_match_spec_and_writer_report(self):
+        result = self.generate()
+        rows = result["rows"]
+
+        self.assertEqual(Pharmacy.objects.count(), 2)
+        self.assertEqual(Product.objects.count(), 40)
+        self.assertEqual(rows["Sale"], Sale.objects.count())
+        self.assertEqual(rows["SaleBatchConsumption"], Sale.objects.count())
+        self.assertEqual(StockEntry.objects.count(), 2 * 3 * 2)
+        self.assertGreater(Sale.objects.count(), 0)
+
+    def test_rows_are_consistent_across_tenants(self):
+        self.generate()
+
+        # Lots / ventes rattachés à la pharmacie de leur produit
+        self.assertFalse(ProductBatch.objects.exclude(pharmacy=F("product__pharmacy")).exists())
+        self.assertFalse(Sale.objects.exclude(pharmacy=F("product__pharmacy")).exists())
+        self.assertFalse(
+            SaleBatchConsumption.objects.exclude(batch__product=F("sale__product")).exists()
+        )
+
+        # Totaux des bons = somme des lignes
+        for entry in StockEntry.objects.annotate(lines=Sum("items__line_total")):
+            self.assertEqual(entry.total_amount, entry.lines)
+
+        self.assertTrue(StockEntryItem.objects.exists())
+
+    def test_same_seed_gives_same_volume(self):
+        first = self.generate()["rows"]
+        second = self.generate()["rows"]
+
+        self.assertEqual(first, second)
@@ -0,0 +1,27 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import CustomUser
+
+
+class TenantScopeTests(TestCase):
+
+    def setUp(self):
+        self.saas_admin = CustomUser.objects.create_superuser(
+            email="root@example.com",
+            name="Root",
+            password="secret123",
+        )
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.saas_admin, is_saas_admin=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def test_saas_admin_without_pharmacy_is_denied_tenant_views(self):
+        # IsSubscriptionActive laisse passer le SaaS Admin : le scope tenant doit refuser
+        for route in ("sale-audit-log", "sale-history", "finance-dashboard-async"):
+            with self.subTest(route=route):
+                response = self.client.get(reverse(route))
+                self.assertEqual(response.status_code, 403, response.content)
@@ -0,0 +1,159 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    Product,
+    ProductBatch,
+    StockMovement,
+    StockTransfer,
+)
+from core.services.ledger import ledger_drift, record_movements
+
+
+class StockTransferTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.depot = self.pharmacy("Dépôt central", type="depot")
+        self.branch = self.pharmacy("Succursale", parent=self.depot)
+        self.outsider = self.pharmacy("Autre réseau")
+
+        self.depot_client = self.client_for(self.depot, "depot@example.com")
+        self.branch_client = self.client_for(self.branch, "branch@example.com")
+
+        self.paracetamol = self.product(self.depot, "Paracétamol")
+        self.amoxicillin = self.product(self.depot, "Amoxicilline", min_stock_level=5)
+        self.near = self.batch(self.paracetamol, 10, days=100, price=600)
+        self.far = self.batch(self.paracetamol, 20, days=300, price=650)
+        self.expired = self.batch(self.paracetamol, 5, days=-1, price=600)
+        self.amox = self.batch(self.amoxicillin, 10, days=200, price=300)
+
+        self.branch_paracetamol = self.product(self.branch, "Paracétamol")
+        self.batch(self.branch_paracetamol, 2, days=150, price=600)
+
+    def pharmacy(self, name, **fields):
+        return Pharmacy.objects.create(
+            name=name,
+            type=fields.pop("type", "pharmacie"),
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+            **fields,
+        )
+
+    def client_for(self, pharmacy, email):
+        user = CustomUser.objects.create_user(email=email, name="Admin", pharmacy=pharmacy, role="admin", pin="1234")
+        client = APIClient()
+        tokens = generate_tokens_for_user(user, pharmacy=pharmacy)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client
+
+    def product(self, pharmacy, name, min_stock_level=10):
+        return Product.objects.create(
+            pharmacy=pharmacy, name=name, dosage="500 mg", form="comprime",
+            unit_price=1000, min_stock_level=min_stock_level,
+        )
+
+    def batch(self, product, quantity, days, price):
+        batch = ProductBatch.objects.create(
+            product=product, quantity=quantity, purchase_price=price, expiry_date=self.today + timedelta(days=days)
+        )
+        record_movements(product.pharmacy_id, "opening", [(product.id, batch.id, quantity, price)])
+        return batch
+
+    def transfer(self, destination, *lines):
+        return self.depot_client.post(
+            reverse("stock-transfer-create"),
+            {
+                "destination": str(destination.id),
+                "lines": [{"batch_id": str(batch.id), "quantity": quantity} for batch, quantity in lines],
+            },
+            format="json",
+        )
+
+    def branch_stock(self):
+        return dict(
+            ProductBatch.objects.filter(pharmacy=self.branch)
+            .values_list("product__name")
+            .annotate(total=Sum("quantity"))
+        )
+
+    def test_manual_transfer_keeps_cost_and_expiry(self):
+        self.assertEqual(self.transfer(self.outsider, (self.near, 1)).status_code, 400)
+        # Stock insuffisant / lot expiré : rien n'est transféré
+        self.assertEqual(self.transfer(self.branch, (self.near, 4), (self.far, 50)).status_code, 400)
+        self.assertEqual(self.transfer(self.branch, (self.expired, 1)).status_code, 400)
+        self.assertFalse(StockTransfer.objects.exists())
+
+        response = self.transfer(self.branch, (self.near, 4), (self.near, 2), (self.amox, 3))
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()
+        self.assertEqual((data["lines_count"], data["quantity"], data["value"]), (2, 9, "4500.00"))
+
+        self.assertEqual(ProductBatch.objects.get(pk=self.near.pk).quantity, 4)
+        self.assertEqual(ProductBatch.objects.get(pk=self.amox.pk).quantity, 7)
+
+        received = ProductBatch.objects.filter(pharmacy=self.branch, id__in=[line["destination_batch"] for line in data["lines"]])
+        self.assertEqual(
+            set(received.values_list("product__name", "quantity", "purchase_price", "expiry_date")),
+            {
+                ("Paracétamol", 6, Decimal("600.00"), self.near.expiry_date),
+                ("Amoxicilline", 3, Decimal("300.00"), self.amox.expiry_date),
+            },
+        )
+        # Paracétamol apparié, Amoxicilline créée dans la succursale
+        self.assertEqual(received.get(product__name="Paracétamol").product_id, self.branch_paracetamol.id)
+        self.assertEqual(Product.objects.filter(pharmacy=self.branch).count(), 2)
+
+        self.assertEqual(
+            set(StockMovement.objects.filter(kind="transfer").values_list("pharmacy_id", "quantity")),
+            {(self.depot.id, -6), (self.depot.id, -3), (self.branch.id, 6), (self.branch.id, 3)},
+        )
+        self.assertEqual(ledger_drift(self.depot), [])
+        self.assertEqual(ledger_drift(self.branch), [])
+
+        # Visible des deux côtés
+        transfers = self.branch_client.get(reverse("stock-transfer-list")).json()
+        self.assertEqual([(t["source_name"], t["quantity"]) for t in transfers], [("Dépôt central", 9)])
+        detail = self.branch_client.get(reverse("stock-transfer-detail", kwargs={"pk": data["id"]}))
+        self.assertEqual(detail.status_code, 200)
+
+    def test_replenishment_from_depot_to_branch(self):
+        self.transfer(self.branch, (self.amox, 3))
+
+        # Succursale -> dépôt : hors mode réappro
+        response = self.branch_client.post(
+            reverse("stock-transfer-replenish"), {"destination": str(self.depot.id)}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.depot_client.post(
+            reverse("stock-transfer-replenish"), {"destination": str(self.branch.id)}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["mode"], "replenishment")
+
+        # Paracétamol : 2 -> 2 × 10, lot le plus proche de l'expiration d'abord ;
+        # Amoxicilline : 3 -> 2 × 5, limitée au stock du dépôt (7)
+        self.assertEqual(
+            {(line["source_batch"], line["quantity"]) for line in response.json()["lines"]},
+            {(str(self.near.id), 10), (str(self.far.id), 8), (str(self.amox.id), 7)},
+        )
+        self.assertEqual(self.branch_stock(), {"Paracétamol": 20, "Amoxicilline": 10})
+
+        # Plus rien en stock bas
+        response = self.depot_client.post(
+            reverse("stock-transfer-replenish"), {"destination": str(self.branch.id)}, format="json"
+        )
+        self.assertEqual(response.status_code, 204)
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.views import generate_tokens_for_user
+from core.models import (
+    Pharmacy,
+    CustomUser,
+    BatchExpiryRisk,
+    PharmacyDataVersion,
+    Product,
+    ProductBatch,
+    StockAdjustment,
+)
+from core.services.expiry_risk import refresh_expiry_risk
+
+
+class WriteOffTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        self.pharmacy = Pharmacy.objects.create(
+            name="Pharmacie Test",
+            type="pharmacie",
+            subscription_status="active",
+            current_period_end=timezone.now() + timedelta(days=30),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="admin@example.com",
+            name="Admin",
+            pharmacy=self.pharmacy,
+            role="admin",
+            pin="1234",
+        )
+
+        self.product = Product.objects.create(pharmacy=self.pharmacy, name="Paracétamol", unit_price=1000)
+        self.expired = self.batch(10, days=-3, price=600)
+        self.old = self.batch(4, days=-40, price=500)
+        self.live = self.batch(20, days=200, price=650)
+        self.sold_out = self.batch(0, days=-10, price=600)
+
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user, pharmacy=self.pharmacy)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def batch(self, quantity, days, price):
+        return ProductBatch.objects.create(
+            product=self.product,
+            quantity=quantity,
+            purchase_price=price,
+            expiry_date=self.today + timedelta(days=days),
+        )
+
+    def quantities(self):
+        return dict(ProductBatch.objects.values_list("id", "quantity"))
+
+    def test_stock_value_counts_live_batches_only(self):
+        data = self.client.get(reverse("finance-dashboard")).json()
+
+        self.assertEqual(data["stock_value"], 20 * 650)
+
+    def test_write_off_all_expired(self):
+        refresh_expiry_risk(self.pharmacy)
+        version = PharmacyDataVersion.current(self.pharmacy.id)[0]
+
+        response = self.client.post(reverse("stock-write-off-expired"), {}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {"batches": 2, "units": 14, "value": "8000.00"})
+
+        self.assertEqual(self.quantities(), {
+            self.expired.id: 0, self.old.id: 0, self.live.id: 20, self.sold_out.id: 0,
+        })
+        self.assertEqual(
+            set(StockAdjustment.objects.values_list("batch_id", "reason", "quantity", "value", "user_id")),
+            {
+                (self.expired.id, "expired", -10, Decimal("-6000.00"), self.user.id),
+                (self.old.id, "expired", -4, Decimal("-2000.00"), self.user.id),
+            },
+        )
+        self.assertFalse(BatchExpiryRisk.objects.filter(batch__in=[self.expired, self.old]).exists())
+        self.assertGreater(PharmacyDataVersion.current(self.pharmacy.id)[0], version)
+
+        # Rien de plus à solder
+        response = self.client.post(reverse("stock-write-off-expired"), {}, format="json")
+        self.assertEqual(response.json()["batches"], 0)
+
+        # Lot vidé supprimé : la trace de la perte reste
+        self.expired.delete()
+        adjustment = StockAdjustment.objects.get(quantity=-10)
+        self.assertIsNone(adjustment.batch_id)
+        self.assertEqual((adjustment.product_id, adjustment.expiry_date), (self.expired.product_id, self.expired.expiry_date))
+
+    def test_write_off_selected_batches(self):
+        response = self.client.post(
+            reverse("stock-write-off-expired"),
+            {"batch_ids": [str(self.expired.id), str(self.live.id)]},
+            format="json",
+        )
+        self.assertEqual(response.json()["batches"], 1)
+        # Lot vivant ignoré même s'il est listé
+        self.assertEqual(self.quantities()[self.live.id], 20)
+        self.assertEqual(self.quantities()[self.old.id], 4)
+
+    def test_nightly_command_and_report(self):
+        call_command("write_off_expired", stdout=StringIO())
+        StockAdjustment.objects.create(
+            pharmacy=self.pharmacy,
+            product=self.product,
+            batch=self.live,
+            reason="damaged",
+            quantity=-2,
+            unit_cost=650,
+            value=-1300,
+            expiry_date=self.live.expiry_date,
+        )
+
+        report = self.client.get(reverse("stock-write-offs")).json()
+
+        self.assertEqual(report["total"], {"units": 16, "value": 9300, "adjustments": 3})
+        self.assertEqual(
+            [(row["reason"], row["units"]) for row in report["by_reason"]],
+            [("damaged", 2), ("expired", 14)],
+        )
+        self.assertEqual(report["products"][0]["product_name"], "Paracétamol")
+        self.assertIsNone(StockAdjustment.objects.filter(reason="expired").values_list("user", flat=True).first())
+
+        # Période hors des pertes
+        report = self.client.get(
+            reverse("stock-write-offs"), {"date_to": str(self.today - timedelta(days=1))}
+        ).json()
+        self.assertEqual(report["total"]["adjustments"], 0)
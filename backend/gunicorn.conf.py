@@ -0,0 +1,40 @@
+"""
+Serveur ASGI de production :
+
+    gunicorn -c gunicorn.conf.py project.asgi:application
+
+gunicorn supervise les process (redémarrage, rechargement gracieux),
+chaque worker uvicorn fait tourner une boucle d'événements : les vues
+async (core.api.async_views) servent de nombreux clients de tableau de
+bord par process, les vues sync passent par le pool de threads de Django.
+
+Dimensionnement des connexions PostgreSQL par process :
+    ASYNC_DB_THREADS (agrégats async) + threads des vues sync en cours.
+"""
+
+import multiprocessing
+import os
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Boucle d'événements par worker : un process par cœur suffit
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Une requête bloquée au-delà est tuée avec son worker (statement_timeout
+# des rapports : REPORTING_STATEMENT_TIMEOUT_MS, à garder en dessous)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recyclage périodique (fuites mémoire), décalé entre workers
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+# Derrière un reverse proxy (X-Forwarded-*)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
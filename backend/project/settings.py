@@ -6,6 +6,9 @@ from pathlib import Path
 from datetime import timedelta
 import os
 
+from dotenv import load_dotenv
+load_dotenv()
+
 # ======================================================
 # BASE DIR
 # ======================================================
@@ -51,6 +54,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # core.api.renderers : orjson par défaut ; listes en ?format=columnar
+    # sur les vues qui l'acceptent (ColumnarListMixin)
+    "DEFAULT_RENDERER_CLASSES": (
+        os.getenv("API_JSON_RENDERER", "core.api.renderers.ORJSONRenderer"),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
@@ -95,17 +104,67 @@ SPECTACULAR_SETTINGS = {
 # MIDDLEWARE
 # ======================================================
 MIDDLEWARE = [
+    'core.instrumentation.RequestMetricsMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db.replica.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',  
 ]
 
 
+# ======================================================
+# PERFORMANCE INSTRUMENTATION (core.instrumentation)
+# ======================================================
+# Requêtes au-delà de ce seuil : loggées (logger core.perf) avec leur SQL
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500"))
+
+# Nb de requêtes récentes gardées en mémoire (par process)
+REQUEST_METRICS_BUFFER_SIZE = int(os.getenv("REQUEST_METRICS_BUFFER_SIZE", "1000"))
+
+# Publication des métriques de chaque worker dans le cache partagé (agrégées
+# par /api/admin/metrics/) : intervalle, puis rétention après le dernier flush.
+# Agrégation multi-workers : REDIS_URL requis (LocMem = un registre par process)
+REQUEST_METRICS_FLUSH_SECONDS = int(os.getenv("REQUEST_METRICS_FLUSH_SECONDS", "10"))
+REQUEST_METRICS_TTL = int(os.getenv("REQUEST_METRICS_TTL", str(7 * 24 * 3600)))
+
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.perf": {
+            "handlers": ["console"],
+            "level": os.getenv("PERF_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
+
+# ======================================================
+# RESPONSE COMPRESSION (core.compression)
+# ======================================================
+# false si le reverse proxy compresse déjà
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+
+# En dessous : gain nul (en-têtes, trames TCP déjà pleines)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Réponses dynamiques : niveaux moyens (11 en brotli coûte plus que le transfert gagné)
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+
 # ======================================================
 # URL / WSGI
 # ======================================================
@@ -136,17 +195,203 @@ TEMPLATES = [
 # ======================================================
 # DATABASE — PostgreSQL
 # ======================================================
+# DB_POOL=true : pool psycopg 3 (core.db.backends.postgresql_pool,
+# `pip install "psycopg[pool]"`) ; sinon connexions persistantes.
+DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+
+# Garde-fou global par requête SQL (ms, 0 = illimité). Non supporté
+# derrière PgBouncer (paramètre de démarrage `options`).
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'ngrpharma',
-        'USER': 'postgres',
-        'PASSWORD': '@1234',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'ENGINE': (
+            'core.db.backends.postgresql_pool' if DB_POOL
+            else 'django.db.backends.postgresql'
+        ),
+        'NAME': os.getenv("DB_NAME", "ngrpharma"),
+        'USER': os.getenv("DB_USER", "postgres"),
+        'PASSWORD': os.getenv("DB_PASSWORD", "@1234"),
+        'HOST': os.getenv("DB_HOST", "localhost"),
+        'PORT': os.getenv("DB_PORT", "5432"),
+
+        # Connexion réutilisée entre requêtes (secondes) ; 0 avec le pool
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        # Vérifie une connexion persistante avant réutilisation (coupure réseau / redémarrage)
+        'CONN_HEALTH_CHECKS': os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        # PgBouncer en mode transaction : pas de curseurs serveur
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv("DB_DISABLE_SERVER_SIDE_CURSORS", "false").lower() == "true",
+
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            **(
+                {'options': f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+                if DB_STATEMENT_TIMEOUT_MS else {}
+            ),
+        },
+
+        # Utilisé seulement par core.db.backends.postgresql_pool
+        'POOL': {
+            'min_size': int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            'max_size': int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            'timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            'max_idle': float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+            'max_lifetime': float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        },
     }
 }
 
+# Réplica de lecture (streaming replication) : DB_REPLICA_HOST active l'alias
+# "replica" pour les vues de reporting (core.api.mixins.ReplicaReadMixin)
+DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST")
+
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': os.getenv("DB_REPLICA_PORT", DATABASES['default']['PORT']),
+        'USER': os.getenv("DB_REPLICA_USER", DATABASES['default']['USER']),
+        'PASSWORD': os.getenv("DB_REPLICA_PASSWORD", DATABASES['default']['PASSWORD']),
+        # Tests : même base que default
+        'TEST': {'MIRROR': 'default'},
+    }
+
+REPLICA_DATABASE_ALIAS = 'replica' if DB_REPLICA_HOST else None
+
+# Après une écriture, l'auteur lit sur le primaire pendant ce délai (s)
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+# Plafond SQL des vues de reporting (core.api.mixins.StatementTimeoutMixin, ms)
+REPORTING_STATEMENT_TIMEOUT_MS = int(os.getenv("REPORTING_STATEMENT_TIMEOUT_MS", "15000"))
+
+# Vues async (core.api.concurrency) : threads = connexions DB max par process
+# pour les agrégats lancés en parallèle ; 0 -> exécution en série
+ASYNC_DB_THREADS = int(os.getenv("ASYNC_DB_THREADS", "8"))
+
+
+# ======================================================
+# DEMAND FORECAST (core.services.forecast)
+# ======================================================
+# Jours complets d'historique par produit (>= 14 : initialisation saisonnière)
+FORECAST_HISTORY_DAYS = int(os.getenv("FORECAST_HISTORY_DAYS", "84"))
+
+# Jours prévus (intelligence : 7 ; réapprovisionnement : délai fournisseur + couverture)
+FORECAST_HORIZON_DAYS = int(os.getenv("FORECAST_HORIZON_DAYS", "28"))
+
+# Réapprovisionnement (core.services.reorder) : commande = demande prévue sur
+# délai fournisseur + couverture, + stock de sécurité, - stock utilisable
+REORDER_COVERAGE_DAYS = int(os.getenv("REORDER_COVERAGE_DAYS", "14"))
+REORDER_SAFETY_DAYS = int(os.getenv("REORDER_SAFETY_DAYS", "3"))
+# Produit jamais reçu via un bon fournisseur
+REORDER_DEFAULT_LEAD_TIME_DAYS = int(os.getenv("REORDER_DEFAULT_LEAD_TIME_DAYS", "7"))
+
+# Analyse produits (core.services.product_analytics, job nocturne) : fenêtre en
+# semaines complètes (bandes XYZ), seuils des produits sous-performants
+ANALYTICS_WINDOW_DAYS = int(os.getenv("ANALYTICS_WINDOW_DAYS", "84"))
+ANALYTICS_DEAD_STOCK_DAYS = int(os.getenv("ANALYTICS_DEAD_STOCK_DAYS", "60"))
+ANALYTICS_SLOW_MOVING_COVER_DAYS = int(os.getenv("ANALYTICS_SLOW_MOVING_COVER_DAYS", "180"))
+
+# Risque de péremption (core.services.expiry_risk) : lots projetés jusqu'à
+# cette échéance (au-delà, la prévision n'est plus qu'une extrapolation)
+EXPIRY_RISK_HORIZON_DAYS = int(os.getenv("EXPIRY_RISK_HORIZON_DAYS", "365"))
+
+# Snapshots de stock par produit (core.services.ledger) : quotidiens sur cette
+# fenêtre, puis clôtures mensuelles seules ; valorisation pharmacie conservée
+STOCK_SNAPSHOT_DAILY_RETENTION_DAYS = int(os.getenv("STOCK_SNAPSHOT_DAILY_RETENTION_DAYS", "92"))
+
+# Inventaire physique (core.services.stock_count) : lignes max par envoi des
+# scanners (un inventaire de 10k lots arrive en plusieurs envois)
+STOCK_COUNT_CHUNK_SIZE = int(os.getenv("STOCK_COUNT_CHUNK_SIZE", "2000"))
+
+# Transferts inter-pharmacies (core.services.transfer) : lignes max par
+# transfert ; réappro dépôt -> succursale jusqu'à FACTOR × seuil minimum
+TRANSFER_MAX_LINES = int(os.getenv("TRANSFER_MAX_LINES", "2000"))
+TRANSFER_REPLENISH_TARGET_FACTOR = int(os.getenv("TRANSFER_REPLENISH_TARGET_FACTOR", "2"))
+
+
+# ======================================================
+# SCHEDULER (manage.py run_scheduler, core.services.scheduler)
+# ======================================================
+# Processus du pool pour les tâches par pharmacie (0/1 : séquentiel)
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+
+# Bail du verrou d'une tâche : repris par un autre nœud au-delà
+SCHEDULER_LOCK_SECONDS = int(os.getenv("SCHEDULER_LOCK_SECONDS", "3600"))
+
+# Tâches créées au démarrage si absentes ; planning (cron, TIME_ZONE)
+# et activation ensuite gérés en base (ScheduledJob)
+SCHEDULER_JOBS = {
+    # Juste après minuit : les lots de la veille sortent du stock avant les calculs nocturnes
+    "write-off-expired": {
+        "command": "write_off_expired",
+        "schedule": "5 0 * * *",
+        "per_tenant": True,
+    },
+    "stock-snapshot": {
+        "command": "snapshot_stock",
+        "schedule": "20 0 * * *",
+        "per_tenant": True,
+    },
+    "reorder-drafts": {
+        "command": "generate_reorder_drafts",
+        "schedule": "30 2 * * *",
+        "per_tenant": True,
+    },
+    "product-analytics": {
+        "command": "compute_product_analytics",
+        "schedule": "0 3 * * *",
+        "per_tenant": True,
+    },
+    "expiry-risk": {
+        "command": "compute_expiry_risk",
+        "schedule": "15 3 * * *",
+        "per_tenant": True,
+    },
+    "rollups": {
+        "command": "rebuild_rollups",
+        "arguments": ["--days", "7"],
+        "schedule": "0 4 * * *",
+    },
+    "stock-alerts": {
+        "command": "send_stock_alerts",
+        "schedule": "0 7 * * *",
+        "per_tenant": True,
+    },
+    "subscriptions": {
+        "command": "reconcile_subscriptions",
+        "schedule": "0 * * * *",
+    },
+}
+
+
+# ======================================================
+# CACHE
+# ======================================================
+# Redis partagé en prod (REDIS_URL), mémoire locale sinon : requis dès
+# plusieurs workers (métriques de requêtes agrégées, cache de prévision)
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# TTL (secondes) du payload AdminOverviewView
+ADMIN_OVERVIEW_CACHE_TTL = int(os.getenv("ADMIN_OVERVIEW_CACHE_TTL", "60"))
+
 
 # ======================================================
 # PASSWORD VALIDATION
@@ -202,9 +447,6 @@ CORS_ALLOW_ALL_ORIGINS = True
 # ===============================
 # STRIPE CONFIG (SECURE)
 # ===============================
-from dotenv import load_dotenv
-load_dotenv()
-
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
 STRIPE_PUBLIC_KEY = os.getenv("STRIPE_PUBLIC_KEY")
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
@@ -217,4 +459,13 @@ STRIPE_SUCCESS_URL = os.getenv(
 STRIPE_CANCEL_URL = os.getenv(
     "STRIPE_CANCEL_URL",
     "http://localhost:3000/billing/cancel"
+)
+
+# Réconciliation (manage.py reconcile_subscriptions)
+# STRIPE_API_BASE permet de cibler un faux serveur Stripe local
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE")
+
+SUBSCRIPTION_CLIENT = os.getenv(
+    "SUBSCRIPTION_CLIENT",
+    "core.services.subscriptions.StripeSubscriptionClient"
 )
\ No newline at end of file
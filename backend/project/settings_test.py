@@ -0,0 +1,37 @@
+"""
+Settings de test : `python manage.py test --settings=project.settings_test`
+
+SQLite en mémoire par défaut ; TEST_DATABASE=postgres garde la base
+PostgreSQL de settings.py (Django crée alors test_<NAME>).
+"""
+
+from .settings import *  # noqa: F401,F403
+
+if os.getenv("TEST_DATABASE", "sqlite") == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        }
+    }
+
+# Second alias réel (pas de MIRROR) pour les tests de routage ; inactif
+# par défaut, activé via override_settings(REPLICA_DATABASE_ALIAS="replica")
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_replica"}
+    if "postgresql" in DATABASES["default"]["ENGINE"] else {},
+}
+REPLICA_DATABASE_ALIAS = None
+
+# Vues async : agrégats dans le thread du test (transaction de TestCase,
+# SQLite en mémoire propre à chaque connexion)
+ASYNC_DB_THREADS = 0
+
+# Tâches planifiées : tenants traités dans le processus du test
+SCHEDULER_WORKERS = 0
+
+# Hash rapide : les tests créent beaucoup d'utilisateurs
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"